@@ -0,0 +1,228 @@
+"""
+apply_confirm.py
+Find out what an Apply click actually did, as soon as the portal answers.
+
+Clicking Apply used to be followed by a fixed sleep and a scan of the whole
+page text (job_update) or by nothing at all (job_apply, which counted every
+click as applied). Here the click is watched instead:
+
+  - through the DevTools performance log (see job_network.enable_network_capture):
+    the portal's apply request is picked out by URL, and its status code and
+    JSON body decide the outcome the moment the response finishes loading;
+  - through one small page probe per tick, which catches a questionnaire /
+    chatbot opening before any request is sent, the portal's error banner,
+    and - for browsers started without the performance log - the success
+    message.
+
+Every outcome is an ApplyResult: success, already_applied,
+questionnaire_required or error. confirm_apply() also answers a
+questionnaire (apply_questionnaire.py) and keeps watching for the apply
+request it submits.
+"""
+
+import json
+import re
+import time
+
+from apply_questionnaire import EXTRACT_JS, QUESTIONNAIRE_CONTAINERS, handle_questionnaire
+from run_log import get_logger
+
+log = get_logger("apply_confirm")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+APPLY_CONFIRM_TIMEOUT = 15          # seconds to wait for the portal's answer
+APPLY_CONFIRM_POLL_SECONDS = 0.25
+
+# Request URLs of the apply call, per portal (verify against a capture from
+# job_network.py if confirmations start timing out)
+APPLY_URL_PATTERNS = {
+    "naukri": re.compile(r"/apply-workflow/|/workflow-services/.*apply|/jobapi/v\d+/apply"),
+}
+
+# One call per tick: is a questionnaire open (same extraction handle_questionnaire
+# uses), and what does the page say?
+PROBE_JS = """
+const fields = (function () {""" + EXTRACT_JS + """}).apply(null, arguments) || [];
+const text = (document.body ? document.body.innerText : "").toLowerCase();
+return {
+    questionnaire: fields.length > 0,
+    error: text.includes("error while processing") || text.includes("something went wrong"),
+    success: /successfully applied|applied successfully|you have applied/.test(text),
+};
+"""
+
+
+class ApplyResult:
+    SUCCESS = "success"
+    ALREADY_APPLIED = "already_applied"
+    QUESTIONNAIRE_REQUIRED = "questionnaire_required"
+    ERROR = "error"
+
+    def __init__(self, status, detail="", http_status=None, source="network", seconds=None):
+        self.status = status
+        self.detail = detail
+        self.http_status = http_status
+        self.source = source        # "network" or "page"
+        self.seconds = seconds      # click -> outcome
+
+    def __bool__(self):
+        return self.status == self.SUCCESS
+
+    def __repr__(self):
+        http = f" HTTP {self.http_status}" if self.http_status else ""
+        took = f" in {self.seconds:.2f}s" if self.seconds is not None else ""
+        return f"ApplyResult({self.status}{http} via {self.source}{took}: {self.detail})"
+
+
+def _walk(value):
+    """Yield (key, value) for every key of a nested JSON value."""
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield k, v
+            yield from _walk(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _walk(v)
+
+
+# keys whose string value is a status / message worth reading
+STATUS_KEYS = ("status", "statuscode", "code", "message", "msg", "reason", "result")
+
+
+def _letters(text):
+    return re.sub(r"[^a-z]", "", str(text).lower())
+
+
+def classify_apply_response(http_status, body):
+    """ApplyResult for one apply response (body: parsed JSON or raw text)."""
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            pass
+    if isinstance(body, str):
+        # not JSON: all there is to go on is the text
+        if "alreadyapplied" in _letters(body):
+            return ApplyResult(ApplyResult.ALREADY_APPLIED, "portal says already applied", http_status)
+        if http_status and http_status >= 400:
+            return ApplyResult(ApplyResult.ERROR, body[:200], http_status)
+        return ApplyResult(ApplyResult.SUCCESS, "apply request accepted", http_status)
+
+    pairs = list(_walk(body))
+    for key, value in pairs:
+        name = _letters(key)
+        status = _letters(value) if isinstance(value, str) and name in STATUS_KEYS else ""
+        if (name.endswith("alreadyapplied") and value is True) or "alreadyapplied" in status:
+            return ApplyResult(ApplyResult.ALREADY_APPLIED, f"portal says already applied ({key})", http_status)
+    for key, value in pairs:
+        name = _letters(key)
+        status = _letters(value) if isinstance(value, str) and name in STATUS_KEYS else ""
+        asks = re.search(r"questionnaire|chatbot|questions", name) and (
+            value is True or (isinstance(value, list) and value))
+        if asks or re.search(r"questionnaire|chatbot", status):
+            return ApplyResult(ApplyResult.QUESTIONNAIRE_REQUIRED, f"response carries {key!r}", http_status)
+    if http_status and http_status >= 400:
+        return ApplyResult(ApplyResult.ERROR, json.dumps(body)[:200], http_status)
+    for key, value in pairs:
+        # per-job status codes inside a 200 response
+        if key.lower() in ("status", "statuscode") and isinstance(value, int) and value >= 400:
+            return ApplyResult(ApplyResult.ERROR, f"{key}={value}", http_status)
+        if key.lower() in ("error", "errors") and value:
+            return ApplyResult(ApplyResult.ERROR, str(value)[:200], http_status)
+    return ApplyResult(ApplyResult.SUCCESS, "apply request accepted", http_status)
+
+
+class ApplyWatch:
+    """
+    Create before the click (it discards older log entries), then wait().
+    wait() can be called again after a questionnaire is submitted; apply
+    requests seen earlier stay tracked.
+    """
+
+    def __init__(self, driver, portal="naukri"):
+        self.driver = driver
+        self.pattern = APPLY_URL_PATTERNS.get(portal)
+        self.pending = {}   # requestId -> HTTP status (None until the response headers arrive)
+        self.network = self.pattern is not None and self._drain() is not None
+        self.started = time.time()
+
+    def _drain(self):
+        try:
+            return self.driver.get_log("performance")
+        except Exception:
+            return None   # browser started without the performance log
+
+    def _network_result(self):
+        for entry in self._drain() or []:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = msg.get("method"), msg.get("params", {})
+            rid = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                request = params.get("request", {})
+                if request.get("method") in ("POST", "PUT") and self.pattern.search(request.get("url", "")):
+                    self.pending[rid] = None
+            elif rid not in self.pending:
+                continue
+            elif method == "Network.responseReceived":
+                self.pending[rid] = params.get("response", {}).get("status")
+            elif method == "Network.loadingFailed":
+                del self.pending[rid]
+                return ApplyResult(ApplyResult.ERROR, params.get("errorText", "request failed"))
+            elif method == "Network.loadingFinished":
+                http_status = self.pending.pop(rid)
+                try:
+                    raw = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": rid})
+                    body = raw.get("body") or ""
+                    try:
+                        body = json.loads(body)
+                    except ValueError:
+                        pass
+                except Exception as e:
+                    log.debug(f"[APPLY] could not read apply response body: {e}")
+                    body = ""
+                return classify_apply_response(http_status, body)
+        return None
+
+    def wait(self, timeout=APPLY_CONFIRM_TIMEOUT, questionnaire=True):
+        """First outcome signalled by the network or the page; ERROR on timeout."""
+        deadline = time.time() + timeout
+        while True:
+            result = self._network_result() if self.network else None
+            if result is None:
+                probe = self.driver.execute_script(PROBE_JS, QUESTIONNAIRE_CONTAINERS)
+                if questionnaire and probe["questionnaire"]:
+                    result = ApplyResult(ApplyResult.QUESTIONNAIRE_REQUIRED, "questionnaire opened", source="page")
+                elif probe["error"]:
+                    result = ApplyResult(ApplyResult.ERROR, "error message on the page", source="page")
+                elif probe["success"] and not self.pending:
+                    result = ApplyResult(ApplyResult.SUCCESS, "success message on the page", source="page")
+            if result is None and time.time() >= deadline:
+                result = ApplyResult(ApplyResult.ERROR, f"no apply response within {timeout}s", source="page")
+            if result is not None:
+                result.seconds = time.time() - self.started
+                return result
+            time.sleep(APPLY_CONFIRM_POLL_SECONDS)
+
+
+def confirm_apply(driver, click, portal="naukri", timeout=APPLY_CONFIRM_TIMEOUT):
+    """Run `click()` and return the ApplyResult, answering a questionnaire on the way."""
+    watch = ApplyWatch(driver, portal)
+    click()
+    result = watch.wait(timeout)
+    if result.status == ApplyResult.QUESTIONNAIRE_REQUIRED:
+        answered = handle_questionnaire(driver)
+        if answered == "submitted":
+            result = watch.wait(timeout, questionnaire=False)
+        else:
+            result.detail = f"questionnaire {answered}"
+    log.info(
+        f"[APPLY] {result}",
+        extra={"apply_status": result.status, "apply_source": result.source,
+               "apply_seconds": round(result.seconds or 0, 2), "http_status": result.http_status},
+    )
+    return result
@@ -0,0 +1,415 @@
+"""
+apply_questionnaire.py
+Answer the recruiter questionnaire / chatbot that some applies open.
+
+The answers come from the profile in .env (TOTAL_EXPERIENCE_YEARS, the
+per-skill *_EXPERIENCE_YEARS, NOTICE_PERIOD_DAYS, CURRENT_LOCATION, and the
+yes/no settings in YES_NO_ANSWERS - those have no default, so a question about
+something the profile doesn't state is left for a human). Each
+question is fuzzy-matched against a small precompiled answer index first.
+Questions it can't answer are stored in QUESTIONNAIRE_CACHE_FILE with a null
+answer so they can be filled in by hand before the next run; only those
+hand-written answers are read back from the cache. An option list with no
+option close to the answer also leaves the question unanswered.
+
+Per round there are two script calls: one extracts every visible question
+(with its input kind and options) from the questionnaire container, one
+fills them all, fires the input/change events React forms listen to, and
+presses the container's submit button. Multi-question forms finish in one
+round; the chatbot asks one question per round.
+"""
+
+import difflib
+import json
+import os
+import re
+import time
+
+from run_log import get_logger
+
+log = get_logger("apply_questionnaire")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+QUESTIONNAIRE_CACHE_FILE = os.getenv("QUESTIONNAIRE_CACHE_FILE", "questionnaire_answers.json")
+QUESTIONNAIRE_MAX_ROUNDS = 12        # chatbot: at most this many questions per apply
+QUESTIONNAIRE_ROUND_WAIT = 1.0       # seconds for the next question/confirmation to render
+MATCH_THRESHOLD = 0.55               # minimum fuzzy score to accept an index answer
+OPTION_MATCH_CUTOFF = 0.6            # minimum similarity for picking a dropdown/radio option
+
+QUESTIONNAIRE_CONTAINERS = [
+    "[class*='chatbot_Drawer']",
+    "[class*='chatbot_MessageContainer']",
+    "[class*='questionnaire']",
+    "[class*='qusSection']",
+    "form[class*='apply']",
+]
+
+# skill name -> (.env key, extra spellings seen in questions)
+SKILL_ALIASES = {
+    "kubernetes": ("KUBERNETES_EXPERIENCE_YEARS", ["k8s", "eks", "aks", "gke", "openshift"]),
+    "aws": ("AWS_EXPERIENCE_YEARS", ["amazon web services", "ec2", "amazon cloud"]),
+    "shell": ("SHELL_EXPERIENCE_YEARS", ["bash", "shell scripting", "unix scripting"]),
+    "python": ("PYTHON_EXPERIENCE_YEARS", []),
+}
+
+# question phrasing -> .env key holding a yes/no answer (unset = not answered)
+YES_NO_ANSWERS = {
+    "serving notice period": "SERVING_NOTICE_PERIOD",
+    "willing to relocate": "WILLING_TO_RELOCATE",
+    "comfortable with hybrid work": "OK_WITH_HYBRID_WORK",
+    "work from office": "OK_WITH_WORK_FROM_OFFICE",
+    "valid passport": "HAS_VALID_PASSPORT",
+}
+
+_STOPWORDS = {
+    "a", "an", "the", "do", "you", "your", "have", "how", "many", "much", "of", "in",
+    "on", "is", "are", "what", "please", "mention", "enter", "with", "to", "for", "and",
+    "current", "total", "?",
+}
+# words that don't change what an experience question is about
+_GENERIC = {"years", "year", "yrs", "experience", "exp", "relevant", "overall", "hands",
+            "work", "working", "professional", "approx", "approximately"}
+
+
+# -----------------------------
+# Answer index
+# -----------------------------
+def normalize(text):
+    text = re.sub(r"[^a-z0-9+#./ ]+", " ", (text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _tokens(text):
+    return {t for t in normalize(text).split() if t not in _STOPWORDS}
+
+
+def _env_int(name, default=0):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_yes_no(name):
+    """'Yes' / 'No' for a true/false/yes/no .env value; '' when unset or unclear."""
+    value = os.getenv(name, "").strip().strip('"').lower()
+    if value in ("true", "yes", "y", "1"):
+        return "Yes"
+    if value in ("false", "no", "n", "0"):
+        return "No"
+    return ""
+
+
+def build_answer_index():
+    """
+    [(token set, phrasing, answer), ...] from the .env profile. Built lazily,
+    on the first questionnaire.
+    """
+    total = _env_int("TOTAL_EXPERIENCE_YEARS")
+    notice = _env_int("NOTICE_PERIOD_DAYS", 60)
+    location = os.getenv("CURRENT_LOCATION", "").strip('"')
+
+    entries = [
+        ("total years of experience", str(total)),
+        ("years of experience", str(total)),
+        ("overall experience", str(total)),
+        ("relevant experience", str(total)),
+        ("notice period", f"{notice} days"),
+        ("notice period in days", str(notice)),
+        ("how soon can you join", f"{notice} days"),
+        ("immediate joiner", "Yes" if notice <= 15 else "No"),
+        ("current location", location),
+        ("preferred location", location),
+        ("which city are you based in", location),
+    ]
+    entries += [(q, _env_yes_no(env_key)) for q, env_key in YES_NO_ANSWERS.items()]
+    for skill, (env_key, aliases) in SKILL_ALIASES.items():
+        years = str(_env_int(env_key))
+        for name in [skill] + aliases:
+            entries.append((f"years of experience in {name}", years))
+            entries.append((f"experience with {name}", years))
+            entries.append((f"{name} experience", years))
+
+    return [(_tokens(q), normalize(q), a) for q, a in entries if a != ""]
+
+
+_INDEX = None
+
+
+def answer_index():
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = build_answer_index()
+    return _INDEX
+
+
+def load_cache(path=QUESTIONNAIRE_CACHE_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=QUESTIONNAIRE_CACHE_FILE):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def match_question(question):
+    """(answer, score) for the best index entry, or (None, best score)."""
+    q_tokens = _tokens(question)
+    q_norm = normalize(question)
+    mentioned_skill = any(
+        name in q_norm for skill, (_, aliases) in SKILL_ALIASES.items() for name in [skill] + aliases
+    )
+    best, best_score = None, 0.0
+    for tokens, phrasing, answer in answer_index():
+        if not tokens:
+            continue
+        overlap = len(q_tokens & tokens) / len(tokens)
+        ratio = difflib.SequenceMatcher(None, q_norm, phrasing).ratio()
+        score = 0.7 * overlap + 0.3 * ratio
+        # a question naming a skill must not be answered with the total experience
+        if mentioned_skill and not any(t in q_norm for t in tokens - {"years", "experience"}):
+            score *= 0.5
+        # nor one about a skill the profile doesn't list ("years with terraform")
+        if {"years", "experience", "yrs"} & q_tokens and (q_tokens - tokens - _GENERIC):
+            score *= 0.5
+        if score > best_score:
+            best, best_score = answer, score
+    if best_score >= MATCH_THRESHOLD:
+        return best, best_score
+    return None, best_score
+
+
+def resolve_answer(question, cache):
+    """
+    The .env profile first, then answers filled in by hand in the cache.
+    Returns (answer, source). Profile answers are not cached, so a changed
+    .env takes effect on the next run.
+    """
+    key = normalize(question)
+    answer, score = match_question(question)
+    if answer is not None:
+        return answer, f"index:{score:.2f}"
+    if cache.get(key):
+        return cache[key], "cache"
+    cache.setdefault(key, None)  # left for a human to fill in
+    return None, f"unmatched:{score:.2f}"
+
+
+def _days(text):
+    """'2 Months' -> 60, '15 Days or less' -> 15, 'Immediate' -> 0; None if unknown."""
+    text = text.lower()
+    if "immediate" in text:
+        return 0
+    m = re.search(r"(\d+)\s*(day|week|month)", text)
+    if not m:
+        return None
+    n = int(m.group(1))
+    return n * {"day": 1, "week": 7, "month": 30}[m.group(2)]
+
+
+def choose_option(answer, options):
+    """Pick the option text that best represents `answer`; None if none is close enough."""
+    if not options:
+        return None
+    answer_norm = normalize(answer)
+    for opt in options:
+        if normalize(opt) == answer_norm:
+            return opt
+    # durations (notice period): closest number of days
+    want = _days(answer) if _days(answer) is not None else (
+        int(answer) if answer.isdigit() else None
+    )
+    with_days = [(opt, _days(opt)) for opt in options if _days(opt) is not None]
+    if want is not None and with_days:
+        return min(with_days, key=lambda od: abs(od[1] - want))[0]
+    # numeric ranges such as "5-7 years" / "8+"
+    if answer.isdigit():
+        n = int(answer)
+        for opt in options:
+            nums = [int(x) for x in re.findall(r"\d+", opt)]
+            if len(nums) >= 2 and nums[0] <= n <= nums[1]:
+                return opt
+            if len(nums) == 1 and "+" in opt and n >= nums[0]:
+                return opt
+    best = difflib.get_close_matches(answer, options, n=1, cutoff=OPTION_MATCH_CUTOFF)
+    return best[0] if best else None
+
+
+# -----------------------------
+# Browser side
+# -----------------------------
+
+# Tag every unanswered field in the first visible container and describe it.
+EXTRACT_JS = """
+const containers = arguments[0];
+let root = null;
+for (const sel of containers) {
+    for (const el of document.querySelectorAll(sel)) {
+        if (el.offsetParent !== null) { root = el; break; }
+    }
+    if (root) break;
+}
+if (!root) return null;
+
+function labelFor(el) {
+    if (el.id) {
+        const l = root.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+        if (l && l.innerText.trim()) return l.innerText.trim();
+    }
+    let node = el;
+    for (let depth = 0; node && depth < 6; depth++, node = node.parentElement) {
+        let prev = node.previousElementSibling;
+        while (prev) {
+            const t = prev.innerText ? prev.innerText.trim() : "";
+            if (t) return t.split("\\n").slice(-1)[0];
+            prev = prev.previousElementSibling;
+        }
+    }
+    // chatbot: the latest bot message is the question
+    const msgs = root.querySelectorAll("[class*='botMsg'], [class*='bot-msg'], [class*='chatbot_ListItem']");
+    return msgs.length ? msgs[msgs.length - 1].innerText.trim() : "";
+}
+
+const out = [];
+const groups = {};
+let n = 0;
+for (const el of root.querySelectorAll("input, textarea, select, [contenteditable='true']")) {
+    if (el.offsetParent === null || el.disabled) continue;
+    const type = (el.type || "").toLowerCase();
+    if (["hidden", "submit", "button", "file"].includes(type)) continue;
+    if (type === "radio" || type === "checkbox") {
+        const name = el.name || ("grp" + n);
+        const optLabel = (el.labels && el.labels[0] ? el.labels[0].innerText : el.value || "").trim();
+        if (!groups[name]) {
+            const key = "q" + (n++);
+            groups[name] = {key, kind: type, question: labelFor(el.closest("fieldset, [role='radiogroup'], ul, div") || el), options: []};
+            out.push(groups[name]);
+        }
+        el.setAttribute("data-qa-key", groups[name].key);
+        el.setAttribute("data-qa-option", optLabel);
+        groups[name].options.push(optLabel);
+        continue;
+    }
+    if (type !== "select-one" && (el.value || (el.isContentEditable && el.innerText.trim()))) continue;
+    const key = "q" + (n++);
+    el.setAttribute("data-qa-key", key);
+    const kind = el.tagName === "SELECT" ? "select" : (el.isContentEditable ? "chat" : "text");
+    const options = kind === "select" ? Array.from(el.options).map(o => o.text.trim()).filter(Boolean) : [];
+    out.push({key, kind, question: labelFor(el), options});
+}
+return out;
+"""
+
+# Fill every answered field, fire React-visible events, then submit.
+FILL_JS = """
+const answers = arguments[0], containers = arguments[1];
+function fire(el) {
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+}
+function setValue(el, value) {
+    const proto = el.tagName === "TEXTAREA" ? HTMLTextAreaElement.prototype
+        : el.tagName === "SELECT" ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+    fire(el);
+}
+let filled = 0;
+for (const [key, kind, value] of answers) {
+    const els = document.querySelectorAll(`[data-qa-key="${key}"]`);
+    if (!els.length) continue;
+    if (kind === "radio" || kind === "checkbox") {
+        for (const el of els) {
+            if (el.getAttribute("data-qa-option") === value && !el.checked) {
+                (el.labels && el.labels[0] ? el.labels[0] : el).click();
+                filled++;
+                break;
+            }
+        }
+    } else if (kind === "select") {
+        const el = els[0];
+        const opt = Array.from(el.options).find(o => o.text.trim() === value);
+        if (opt) { setValue(el, opt.value); filled++; }
+    } else if (kind === "chat") {
+        const el = els[0];
+        el.focus();
+        el.innerText = value;
+        fire(el);
+        filled++;
+    } else {
+        setValue(els[0], value);
+        filled++;
+    }
+}
+let root = null;
+for (const sel of containers) {
+    root = Array.from(document.querySelectorAll(sel)).find(el => el.offsetParent !== null);
+    if (root) break;
+}
+const submit = root && Array.from(root.querySelectorAll("button, [role='button'], div[class*='sendMsg']"))
+    .find(b => /^(save|submit|next|send|apply|continue)$/i.test((b.innerText || b.getAttribute("aria-label") || "").trim())
+               || (b.className || "").toString().includes("sendMsg"));
+if (submit) submit.click();
+return [filled, !!submit];
+"""
+
+
+def handle_questionnaire(driver, cache=None):
+    """
+    Answer whatever questionnaire is open after an Apply click.
+
+    Returns "none" (nothing opened), "submitted" (every question answered
+    and submitted) or "unanswered" (some question had no confident answer;
+    it was left in the cache file for a human).
+    """
+    own_cache = cache is None
+    cache = load_cache() if own_cache else cache
+    seen_any = False
+    result = "none"
+
+    for _ in range(QUESTIONNAIRE_MAX_ROUNDS):
+        fields = driver.execute_script(EXTRACT_JS, QUESTIONNAIRE_CONTAINERS)
+        if not fields:
+            break
+        seen_any = True
+
+        answers, missing = [], []
+        for field in fields:
+            answer, source = resolve_answer(field["question"], cache)
+            if answer is None:
+                missing.append(field["question"])
+                continue
+            value = choose_option(answer, field["options"]) if field["options"] else answer
+            if value is None:
+                missing.append(field["question"])
+                continue
+            log.info(f"[QUESTIONNAIRE] {field['question']!r} -> {value!r} ({source})")
+            answers.append([field["key"], field["kind"], value])
+
+        if missing:
+            log.warning(f"[QUESTIONNAIRE] no answer for: {missing}")
+            result = "unanswered"
+            break
+
+        filled, submitted = driver.execute_script(FILL_JS, answers, QUESTIONNAIRE_CONTAINERS)
+        if not submitted:
+            log.warning(f"[QUESTIONNAIRE] filled {filled} fields but found no submit button")
+            result = "unanswered"
+            break
+        result = "submitted"
+        time.sleep(QUESTIONNAIRE_ROUND_WAIT)
+
+    if own_cache and seen_any:
+        try:
+            save_cache(cache)
+        except OSError as e:
+            log.warning(f"[QUESTIONNAIRE] could not save answer cache: {e}")
+    return result
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+apply_quota.py
+Daily application quota shared by every script and process on this machine.
+
+    python apply_quota.py status          # today's budget per portal / window, used, left
+    python apply_quota.py reallocate      # recompute today's split from the latest yields
+
+MAX_APPLICATIONS_PER_DAY caps applies across job_update, job_apply,
+job_hirish, job_engine, job_watch and queue_worker together; the per-run
+limits (MAX_JOBS_PER_RUN, HIRIST_MAX_JOBS_PER_RUN) only ever counted one
+process. Every apply reserves a slot first:
+
+    slot = QUOTA.reserve("naukri")      # None: nothing left right now
+    ...click Apply...
+    QUOTA.finish(slot, applied)         # keep the slot, or hand it back
+
+Slots live in a SQLite ledger (QUOTA_DB_FILE); reserve() counts and inserts
+inside one BEGIN IMMEDIATE transaction, so two processes can never take the
+last slot together. A reservation whose process died is released after
+QUOTA_RESERVE_TTL seconds.
+
+The day's budget is split once per day over portals x time windows
+(QUOTA_WINDOWS, start hours) in proportion to each cell's observed yield -
+applies per job looked at, from job_store's verdicts of the last
+QUOTA_YIELD_DAYS days, smoothed towards the overall yield and weighted by
+window length. A portal may use its budget for the current and all earlier
+windows (unused slots carry forward); in the last window of the day portal
+budgets are lifted and whatever is left of the daily cap is shared.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from run_log import get_logger
+
+log = get_logger("apply_quota")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+MAX_APPLICATIONS_PER_DAY = int(os.getenv("MAX_APPLICATIONS_PER_DAY", "500"))
+QUOTA_DB_FILE = os.getenv("QUOTA_DB_FILE", "apply_quota.sqlite3")
+QUOTA_PORTALS = ("naukri", "hirist")
+QUOTA_WINDOWS_SPEC = os.getenv("QUOTA_WINDOWS", "0,9,13,18")  # start hours, see parse_windows()
+QUOTA_YIELD_DAYS = 14
+QUOTA_PRIOR_LOOKS = 20          # smoothing: a cell's yield counts as this many looks at the overall yield
+QUOTA_MIN_YIELD_FRACTION = 0.25  # no cell's yield is taken below this fraction of the overall yield
+QUOTA_RESERVE_TTL = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS allocations (
+    day     TEXT NOT NULL,
+    portal  TEXT NOT NULL,
+    period  INTEGER NOT NULL,          -- index into QUOTA_WINDOWS
+    budget  INTEGER NOT NULL,
+    yield   REAL,
+    PRIMARY KEY (day, portal, period)
+);
+CREATE TABLE IF NOT EXISTS slots (
+    id          INTEGER PRIMARY KEY,
+    day         TEXT NOT NULL,
+    portal      TEXT NOT NULL,
+    period      INTEGER NOT NULL,
+    state       TEXT NOT NULL,          -- reserved | used
+    reserved_at REAL NOT NULL,
+    owner       TEXT
+);
+CREATE INDEX IF NOT EXISTS slots_day ON slots(day, portal);
+"""
+
+
+def parse_windows(spec):
+    """
+    Sorted, distinct window start hours from a '0,9,13,18' spec. Budgets are
+    per calendar day, so the first window always starts at midnight: a spec
+    without 0 gets it added.
+    """
+    try:
+        hours = sorted({int(h) for h in spec.split(",") if h.strip()})
+    except ValueError:
+        raise ValueError(f"QUOTA_WINDOWS={spec!r}: expected comma-separated start hours like 0,9,13,18")
+    if not hours or hours[0] < 0 or hours[-1] > 23:
+        raise ValueError(f"QUOTA_WINDOWS={spec!r}: start hours must be between 0 and 23")
+    if hours[0] != 0:
+        log.warning(f"[QUOTA] QUOTA_WINDOWS={spec!r} doesn't start at 0; adding a window from midnight")
+        hours.insert(0, 0)
+    return hours
+
+
+QUOTA_WINDOWS = parse_windows(QUOTA_WINDOWS_SPEC)
+
+
+def today(now=None):
+    return time.strftime("%Y-%m-%d", time.localtime(now))
+
+
+def window_index(hour, windows=QUOTA_WINDOWS):
+    """Index of the window (list of start hours, first one 0) that `hour` falls in."""
+    return max((i for i, start in enumerate(windows) if start <= hour), default=0)
+
+
+def window_of(now=None, windows=QUOTA_WINDOWS):
+    """Index of the QUOTA_WINDOWS window `now` falls in."""
+    return window_index(time.localtime(now).tm_hour, windows)
+
+
+def window_hours(windows=QUOTA_WINDOWS):
+    ends = list(windows[1:]) + [24]
+    return [end - start for start, end in zip(windows, ends)]
+
+
+def observed_yield(portals=QUOTA_PORTALS, windows=QUOTA_WINDOWS, days=QUOTA_YIELD_DAYS):
+    """{(portal, window): (applied, looks)} from job_store's verdicts."""
+    from job_store import connect
+
+    cells = {(p, w): (0, 0) for p in portals for w in range(len(windows))}
+    conn = connect()
+    try:
+        rows = conn.execute(
+            "SELECT portal, CAST(strftime('%H', seen_at, 'unixepoch', 'localtime') AS INTEGER), "
+            "SUM(verdict = 'applied'), COUNT(*) FROM verdicts WHERE seen_at >= ? GROUP BY 1, 2",
+            (time.time() - days * 86400,),
+        ).fetchall()
+    finally:
+        conn.close()
+    for portal, hour, applied, looks in rows:
+        w = window_index(hour, windows)
+        if (portal, w) in cells:
+            a, n = cells[(portal, w)]
+            cells[(portal, w)] = (a + applied, n + looks)
+    return cells
+
+
+def allocate(daily, cells, windows=QUOTA_WINDOWS):
+    """
+    Split `daily` applies over the (portal, window) cells of observed_yield():
+    {(portal, window): (budget, yield)}. Budgets are integers summing to `daily`.
+    """
+    applied = sum(a for a, _ in cells.values())
+    looks = sum(n for _, n in cells.values())
+    overall = applied / looks if applied else 1.0
+    hours = window_hours(windows)
+    rates, weights = {}, {}
+    for (portal, w), (a, n) in cells.items():
+        rate = (a + QUOTA_PRIOR_LOOKS * overall) / (n + QUOTA_PRIOR_LOOKS)
+        rates[(portal, w)] = rate
+        weights[(portal, w)] = max(rate, QUOTA_MIN_YIELD_FRACTION * overall) * hours[w]
+    total = sum(weights.values())
+    exact = {cell: daily * wt / total for cell, wt in weights.items()}
+    budgets = {cell: int(x) for cell, x in exact.items()}
+    # largest remainder, so the cells add up to the daily cap exactly
+    short = daily - sum(budgets.values())
+    for cell in sorted(exact, key=lambda c: exact[c] - budgets[c], reverse=True)[:short]:
+        budgets[cell] += 1
+    return {cell: (budgets[cell], rates[cell]) for cell in cells}
+
+
+class ApplyQuota:
+    def __init__(self, path=QUOTA_DB_FILE, daily=MAX_APPLICATIONS_PER_DAY, portals=QUOTA_PORTALS):
+        self.path = path
+        self.daily = daily
+        self.portals = portals
+        self.owner = f"{os.getpid()}"
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _budgets(self, conn, day):
+        """{(portal, window): budget} for `day`, allocated on first use. Call inside a transaction."""
+        rows = conn.execute("SELECT portal, period, budget FROM allocations WHERE day = ?", (day,)).fetchall()
+        if not rows:
+            allocation = allocate(self.daily, observed_yield(self.portals))
+            conn.executemany(
+                "INSERT INTO allocations (day, portal, period, budget, yield) VALUES (?, ?, ?, ?, ?)",
+                [(day, p, w, budget, rate) for (p, w), (budget, rate) in allocation.items()],
+            )
+            log.info(
+                f"[QUOTA] {day}: {self.daily} applies split as "
+                + ", ".join(f"{p} {sum(b for (q, _), (b, _) in allocation.items() if q == p)}"
+                            for p in self.portals),
+                extra={"quota_allocation": {f"{p}:{w}": b for (p, w), (b, _) in allocation.items()}},
+            )
+            rows = [(p, w, budget) for (p, w), (budget, _) in allocation.items()]
+        return {(p, w): budget for p, w, budget in rows}
+
+    def _available(self, conn, portal, now):
+        """Slots `portal` may take right now. Call inside a transaction."""
+        day, window = today(now), window_of(now)
+        conn.execute("DELETE FROM slots WHERE state = 'reserved' AND reserved_at < ?",
+                     (now - QUOTA_RESERVE_TTL,))
+        budgets = self._budgets(conn, day)
+        taken = dict(conn.execute("SELECT portal, COUNT(*) FROM slots WHERE day = ? GROUP BY portal", (day,)))
+        left = self.daily - sum(taken.values())
+        if portal is None or window == len(QUOTA_WINDOWS) - 1:
+            return max(0, left)
+        so_far = sum(b for (p, w), b in budgets.items() if p == portal and w <= window)
+        return max(0, min(left, so_far - taken.get(portal, 0)))
+
+    def reserve(self, portal):
+        """Take one apply slot for `portal`; its id, or None when the quota is used up."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._available(conn, portal, now) <= 0:
+                    conn.execute("COMMIT")
+                    log.info(f"[QUOTA] no {portal} applies left for now", extra={"quota_portal": portal})
+                    return None
+                cur = conn.execute(
+                    "INSERT INTO slots (day, portal, period, state, reserved_at, owner) "
+                    "VALUES (?, ?, ?, 'reserved', ?, ?)",
+                    (today(now), portal, window_of(now), now, self.owner),
+                )
+                conn.execute("COMMIT")
+                return cur.lastrowid
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def finish(self, slot, applied):
+        """Keep the slot if the apply went through, hand it back otherwise."""
+        if slot is None:
+            return
+        conn = self._connect()
+        try:
+            if applied:
+                conn.execute("UPDATE slots SET state = 'used' WHERE id = ?", (slot,))
+            else:
+                conn.execute("DELETE FROM slots WHERE id = ?", (slot,))
+        finally:
+            conn.close()
+
+    def remaining(self, portal=None):
+        """Applies `portal` may still make now (None: left of today's cap for everyone)."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                left = self._available(conn, portal, time.time())
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return left
+        finally:
+            conn.close()
+
+    def seconds_to_next_window(self, now=None):
+        now = now or time.time()
+        window = window_of(now)
+        lt = time.localtime(now)
+        midnight = now - (lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec)
+        if window == len(QUOTA_WINDOWS) - 1:
+            return midnight + 86400 - now
+        return midnight + QUOTA_WINDOWS[window + 1] * 3600 - now
+
+    def status(self):
+        """Rows (portal, window start hour, budget, yield, used, reserved) for today."""
+        day = today()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._budgets(conn, day)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            counts = {}
+            for portal, w, state, n in conn.execute(
+                "SELECT portal, period, state, COUNT(*) FROM slots WHERE day = ? GROUP BY 1, 2, 3", (day,)
+            ):
+                counts[(portal, w, state)] = n
+            return [
+                (p, QUOTA_WINDOWS[w], budget, rate, counts.get((p, w, "used"), 0), counts.get((p, w, "reserved"), 0))
+                for p, w, budget, rate in conn.execute(
+                    "SELECT portal, period, budget, yield FROM allocations WHERE day = ? ORDER BY 1, 2", (day,)
+                )
+            ]
+        finally:
+            conn.close()
+
+    def reallocate(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM allocations WHERE day = ?", (today(),))
+        finally:
+            conn.close()
+        return self.status()
+
+    def log_status(self, portal=None):
+        left_today = self.remaining()
+        left = self.remaining(portal) if portal else left_today
+        log.info(
+            f"[QUOTA] {left_today}/{self.daily} applies left today"
+            + (f", {left} for {portal} until {QUOTA_WINDOWS[(window_of() + 1) % len(QUOTA_WINDOWS)]}:00"
+               if portal else ""),
+            extra={"quota_left_today": left_today, "quota_left_portal": left, "quota_portal": portal},
+        )
+
+
+QUOTA = ApplyQuota()
+
+
+def main(argv):
+    args = argv[1:]
+    if args[:1] not in (["status"], ["reallocate"]):
+        print("usage: python apply_quota.py status | reallocate")
+        return 2
+    rows = QUOTA.status() if args[0] == "status" else QUOTA.reallocate()
+    print(f"{today()}  daily cap {QUOTA.daily}, {QUOTA.remaining()} left")
+    print(f"{'portal':<8} {'from':>5} {'budget':>6} {'yield':>6} {'used':>5} {'held':>5}")
+    for portal, start, budget, rate, used, held in rows:
+        print(f"{portal:<8} {start:>3}:00 {budget:>6} {rate:>6.2f} {used:>5} {held:>5}")
+    for portal in QUOTA.portals:
+        print(f"{portal}: {QUOTA.remaining(portal)} applies available now")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
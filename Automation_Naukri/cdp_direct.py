@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+cdp_direct.py
+Hot-path browser commands over Chrome's DevTools websocket, bypassing chromedriver.
+
+    python cdp_direct.py bench                   # per-command latency, Selenium vs direct CDP
+    python cdp_direct.py bench --iterations 500
+
+Every Selenium command is Python -> HTTP -> chromedriver -> CDP -> Chrome and
+back. For the many small calls of a job loop (evaluate a script, load a
+page, read some nodes) that hop is most of the cost. With USE_DIRECT_CDP on,
+hot_path(driver) returns a DirectPage for the window Selenium is on: the same
+get() / execute_script() / execute_async_script() / set_script_timeout()
+the helpers call on a driver, sent as Page.navigate / Runtime.evaluate
+straight to the page's websocket (the debuggerAddress chromedriver reports).
+Anything else - element handles, clicks, window switching, logs - stays on
+Selenium, and so does any call the page can't serve (an argument that isn't
+JSON, e.g. a WebElement; no debuggerAddress; a closed websocket), so callers
+never need a second code path. USE_DIRECT_CDP=false (the default) makes
+hot_path() return the driver itself.
+
+Which window Selenium is on is tracked from the switchToWindow commands
+driver_batch.instrument() sees, so finding the page costs no round trip;
+drivers that aren't instrumented always get Selenium.
+The websocket client is the minimal RFC 6455 subset CDP needs (text frames,
+fragmentation, ping/pong), like work_queue's RESP client: no dependency.
+Direct calls are counted in ROUND_TRIPS as "cdp:<method>".
+"""
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import statistics
+import struct
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+from dotenv import load_dotenv
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from driver_batch import ROUND_TRIPS, current_step, ensure_script_timeout
+from run_log import get_logger
+
+log = get_logger("cdp_direct")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+USE_DIRECT_CDP = os.getenv("USE_DIRECT_CDP", "false").lower() == "true"
+CDP_CONNECT_TIMEOUT = 5
+CDP_COMMAND_TIMEOUT = 30
+CDP_PAGE_LOAD_TIMEOUT = 30
+CDP_MAX_BUFFERED_EVENTS = 500
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class CdpError(WebDriverException):
+    """A CDP command failed; a WebDriverException, so callers and retry_policy treat it like Selenium's."""
+
+
+class CdpTimeout(CdpError, TimeoutException):
+    """The browser didn't answer (or the page didn't load) in time, like Selenium's TimeoutException."""
+
+
+class WebSocket:
+    """Minimal websocket client: one socket, text messages in and out."""
+
+    def __init__(self, url, timeout=CDP_CONNECT_TIMEOUT):
+        parts = urlsplit(url)
+        self.sock = socket.create_connection((parts.hostname, parts.port or 80), timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        self.sock.sendall(
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+        )
+        self.file = self.sock.makefile("rb")
+        status = self.file.readline()
+        headers = {}
+        while True:
+            line = self.file.readline().strip()
+            if not line:
+                break
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        if b" 101 " not in status or headers.get("sec-websocket-accept") != accept:
+            self.sock.close()
+            raise CdpError(f"websocket handshake with {url} failed: {status.strip()!r}")
+
+    @staticmethod
+    def _mask(data, mask):
+        n = len(data)
+        key = (mask * (n // 4 + 1))[:n]
+        return (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+
+    def _send_frame(self, opcode, payload):
+        n = len(payload)
+        header = bytearray([0x80 | opcode])
+        if n < 126:
+            header.append(0x80 | n)
+        elif n < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack(">H", n)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack(">Q", n)
+        mask = os.urandom(4)
+        self.sock.sendall(bytes(header) + mask + self._mask(payload, mask))
+
+    def send(self, text):
+        self._send_frame(0x1, text.encode())
+
+    def _read_exact(self, n):
+        data = self.file.read(n)
+        if data is None or len(data) < n:
+            raise ConnectionError("websocket closed")
+        return data
+
+    def recv(self, timeout=None):
+        """Next complete text message (control frames are handled here)."""
+        self.sock.settimeout(timeout)
+        parts = []
+        while True:
+            b1, b2 = self._read_exact(2)
+            fin, opcode, n = b1 & 0x80, b1 & 0x0F, b2 & 0x7F
+            if n == 126:
+                n = struct.unpack(">H", self._read_exact(2))[0]
+            elif n == 127:
+                n = struct.unpack(">Q", self._read_exact(8))[0]
+            mask = self._read_exact(4) if b2 & 0x80 else None
+            payload = self._read_exact(n)
+            if mask:
+                payload = self._mask(payload, mask)
+            if opcode == 0x8:
+                raise ConnectionError("websocket closed by the browser")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            parts.append(payload)
+            if fin:
+                return b"".join(parts).decode()
+
+    def close(self):
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class CdpSession:
+    """Commands and events of one DevTools target."""
+
+    def __init__(self, ws_url, stats=ROUND_TRIPS, on_close=None):
+        self.ws = WebSocket(ws_url)
+        self.stats = stats
+        self.on_close = on_close   # called once the session is unusable
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.events = []
+
+    def _read(self, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise CdpTimeout("timed out waiting for the browser")
+        try:
+            return json.loads(self.ws.recv(remaining))
+        except socket.timeout:
+            # a half-read frame leaves the stream unusable: the next call goes through Selenium
+            self.close()
+            raise CdpTimeout("timed out waiting for the browser") from None
+
+    def _keep_event(self, msg):
+        self.events.append(msg)
+        del self.events[:-CDP_MAX_BUFFERED_EVENTS]
+
+    def send(self, method, params=None, timeout=CDP_COMMAND_TIMEOUT):
+        started = time.perf_counter()
+        with self.lock:
+            self.next_id += 1
+            mid = self.next_id
+            self.ws.send(json.dumps({"id": mid, "method": method, "params": params or {}}))
+            deadline = time.monotonic() + timeout
+            try:
+                while True:
+                    msg = self._read(deadline)
+                    if msg.get("id") == mid:
+                        if "error" in msg:
+                            raise CdpError(f"{method}: {msg['error'].get('message')}")
+                        return msg.get("result", {})
+                    if "method" in msg:
+                        self._keep_event(msg)
+                    # else: the late answer to a command that timed out
+            finally:
+                self.stats.record(current_step(), f"cdp:{method}", time.perf_counter() - started)
+
+    def wait_event(self, method, timeout=CDP_PAGE_LOAD_TIMEOUT):
+        """Params of the next `method` event (buffered ones first)."""
+        with self.lock:
+            for i, msg in enumerate(self.events):
+                if msg["method"] == method:
+                    del self.events[i]
+                    return msg.get("params", {})
+            deadline = time.monotonic() + timeout
+            while True:
+                msg = self._read(deadline)
+                if msg.get("method") == method:
+                    return msg.get("params", {})
+                if "method" in msg:
+                    self._keep_event(msg)
+
+    def drop_events(self, method):
+        with self.lock:
+            self.events = [m for m in self.events if m["method"] != method]
+
+    def close(self):
+        try:
+            self.ws.close()
+        except OSError:
+            pass
+        if self.on_close is not None:
+            on_close, self.on_close = self.on_close, None
+            on_close()
+
+
+def _json_args(args):
+    try:
+        return json.dumps(list(args))
+    except (TypeError, ValueError):
+        return None   # WebElement or other non-JSON argument
+
+
+class DirectPage:
+    """
+    The hot-path subset of a WebDriver, served over CDP for one window;
+    everything else is delegated to the driver.
+    """
+
+    def __init__(self, driver, handle, session):
+        self.driver = driver
+        self.handle = handle
+        self.session = session
+        session.on_close = self._evict
+        self.script_timeout = CDP_COMMAND_TIMEOUT
+        self._batch_script_timeout = 0   # ensure_script_timeout() cache, per page not per driver
+        self.page_enabled = False
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def _evict(self):
+        """Forget this page, so hot_path() serves its window through Selenium (or a new websocket)."""
+        pages = getattr(self.driver, "_cdp_pages", {})
+        if pages.get(self.handle) is self:
+            del pages[self.handle]
+
+    def _broken(self, e):
+        log.info(f"[CDP] websocket of {self.handle} unusable ({e}); back to Selenium for this window")
+        self.session.close()
+
+    def _evaluate(self, expression, timeout):
+        result = self.session.send("Runtime.evaluate", {
+            "expression": expression, "returnByValue": True, "awaitPromise": True, "userGesture": True,
+        }, timeout=timeout)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            message = (details.get("exception") or {}).get("description") or details.get("text")
+            raise CdpError(f"javascript error: {message}")
+        return result.get("result", {}).get("value")
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def execute_script(self, script, *args):
+        encoded = _json_args(args)
+        if encoded is None:
+            return self.driver.execute_script(script, *args)
+        try:
+            return self._evaluate(f"(function () {{\n{script}\n}}).apply(null, {encoded})", CDP_COMMAND_TIMEOUT)
+        except (ConnectionError, OSError) as e:
+            self._broken(e)
+            return self.driver.execute_script(script, *args)
+
+    def execute_async_script(self, script, *args):
+        encoded = _json_args(args)
+        if encoded is None:
+            ensure_script_timeout(self.driver, self.script_timeout)
+            return self.driver.execute_async_script(script, *args)
+        expression = (
+            f"new Promise(done => (function () {{\n{script}\n}}).apply(null, {encoded}.concat([done])))"
+        )
+        try:
+            return self._evaluate(expression, self.script_timeout)
+        except (ConnectionError, OSError) as e:
+            self._broken(e)
+            ensure_script_timeout(self.driver, self.script_timeout)
+            return self.driver.execute_async_script(script, *args)
+
+    def get(self, url, timeout=CDP_PAGE_LOAD_TIMEOUT):
+        """
+        Navigate and wait for the load event, like driver.get(). A failed
+        navigation is handed to Selenium, which shows / reports it the usual
+        way; a page that doesn't load in time raises CdpTimeout, a
+        TimeoutException like Selenium's page-load timeout.
+        """
+        try:
+            if not self.page_enabled:
+                self.session.send("Page.enable")
+                self.page_enabled = True
+            self.session.drop_events("Page.loadEventFired")
+            result = self.session.send("Page.navigate", {"url": url})
+            if result.get("errorText"):
+                log.debug(f"[CDP] navigation to {url} failed ({result['errorText']}); retrying through Selenium")
+                self.driver.get(url)
+                return
+            self.session.wait_event("Page.loadEventFired", timeout)
+        except (ConnectionError, OSError) as e:
+            self._broken(e)
+            self.driver.get(url)
+
+
+def _page_for(driver):
+    handle = getattr(driver, "_window_handle", None)
+    if handle is None:
+        handle = driver._window_handle = driver.current_window_handle
+    pages = driver.__dict__.setdefault("_cdp_pages", {})
+    if handle in pages:
+        return pages[handle]
+    address = (driver.capabilities.get("goog:chromeOptions") or {}).get("debuggerAddress")
+    if not address:
+        return None
+    with urlopen(f"http://{address}/json/list", timeout=CDP_CONNECT_TIMEOUT) as response:
+        targets = json.load(response)
+    target_id = handle.replace("CDwindow-", "").upper()
+    for target in targets:
+        if target.get("type") == "page" and target.get("id", "").upper() == target_id:
+            page = pages[handle] = DirectPage(driver, handle, CdpSession(target["webSocketDebuggerUrl"]))
+            return page
+    return None
+
+
+def hot_path(driver):
+    """DirectPage for the driver's current window when USE_DIRECT_CDP is on and reachable, else the driver."""
+    if not USE_DIRECT_CDP or driver is None or isinstance(driver, DirectPage):
+        return driver
+    if getattr(driver, "_cdp_unavailable", False) or not getattr(driver, "_round_trips_instrumented", False):
+        return driver
+    try:
+        page = _page_for(driver)
+    except Exception as e:
+        log.info(f"[CDP] direct connection unavailable ({e}); using Selenium")
+        driver._cdp_unavailable = True
+        return driver
+    return page or driver
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+BENCH_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages", "naukri_job_open.html")
+
+BENCH_OPS = {
+    # name -> (callable(backend), iterations divisor)
+    "evaluate": (lambda b: b.execute_script("return 1 + 1;"), 1),
+    "query_dom": (lambda b: b.execute_script(
+        "return Array.from(document.querySelectorAll(arguments[0]), e => e.innerText.slice(0, 80));", "a, button"), 1),
+    "async_wait": (lambda b: b.execute_async_script(
+        "const done = arguments[arguments.length - 1];"
+        "(function poll() { document.readyState === 'complete' ? done(true) : setTimeout(poll, 10); })();"), 1),
+    "navigate_load": (lambda b: b.get("file://" + BENCH_PAGE), 10),
+}
+
+
+def _percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def bench(iterations=200):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    for arg in ("--headless=new", "--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage"):
+        options.add_argument(arg)
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.set_script_timeout(30)
+        driver.get("file://" + BENCH_PAGE)
+        page = _page_for(driver)
+        if page is None:
+            print("no DevTools target for the current window (is debuggerAddress reported?)")
+            return 1
+        page.set_script_timeout(30)
+        rows = []
+        for name, (op, divisor) in BENCH_OPS.items():
+            n = max(5, iterations // divisor)
+            timings = {}
+            for label, backend in (("selenium", driver), ("cdp", page)):
+                op(backend)  # warm up
+                samples = []
+                for _ in range(n):
+                    started = time.perf_counter()
+                    op(backend)
+                    samples.append((time.perf_counter() - started) * 1000)
+                timings[label] = samples
+            rows.append((name, n, timings))
+        print(f"{'command':<14} {'n':>5} {'selenium p50':>13} {'p95':>8} {'cdp p50':>9} {'p95':>8} {'speedup':>8}")
+        for name, n, t in rows:
+            s50, c50 = statistics.median(t["selenium"]), statistics.median(t["cdp"])
+            print(f"{name:<14} {n:>5} {s50:>10.2f} ms {_percentile(t['selenium'], 95):>5.2f} ms "
+                  f"{c50:>6.2f} ms {_percentile(t['cdp'], 95):>5.2f} ms {s50 / c50 if c50 else 0:>7.1f}x")
+        page.session.close()
+        return 0
+    finally:
+        driver.quit()
+
+
+def main(argv):
+    args = argv[1:]
+    if args[:1] != ["bench"]:
+        print("usage: python cdp_direct.py bench [--iterations N]")
+        return 2
+    iterations = int(args[args.index("--iterations") + 1]) if "--iterations" in args else 200
+    return bench(iterations)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
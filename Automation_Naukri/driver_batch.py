@@ -0,0 +1,214 @@
+"""
+driver_batch.py
+WebDriver round-trip accounting and composite (batched) operations.
+
+Every Selenium command - find_element, execute_script, window_handles,
+switch_to.window, .text, close... - is one HTTP round trip to chromedriver,
+and all of them go through driver.execute(). instrument() wraps that method
+on a driver instance to count calls and latency per logical step (see
+step()), so per-job round trips can be compared before/after a change. It
+also remembers which window Selenium is on (driver._window_handle, from the
+switchToWindow commands it sees), for cdp_direct.hot_path().
+
+The composite helpers fold common multi-command sequences into one
+execute_async_script call:
+    scroll_click_wait()    scrollIntoView + click + wait for a selector
+    open_extract_close()   open a same-origin URL in a hidden window, read
+                           it once loaded, close it - no tab switching
+"""
+
+import contextlib
+import threading
+import time
+from collections import defaultdict
+
+from run_log import get_logger
+
+log = get_logger("driver_batch")
+
+# -----------------------------
+# Round-trip accounting
+# -----------------------------
+_local = threading.local()
+
+
+class RoundTripStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = defaultdict(int)        # step -> round trips
+        self.seconds = defaultdict(float)    # step -> total latency
+        self.commands = defaultdict(int)     # (step, command) -> round trips
+        self.step_runs = defaultdict(int)    # step -> times the step was entered
+
+    def record(self, step, command, seconds):
+        with self.lock:
+            self.calls[step] += 1
+            self.seconds[step] += seconds
+            self.commands[(step, command)] += 1
+
+    def per_run(self, step):
+        runs = self.step_runs.get(step) or 1
+        return self.calls.get(step, 0) / runs
+
+    def report(self):
+        rows = []
+        for step in sorted(self.calls, key=lambda s: -self.calls[s]):
+            calls = self.calls[step]
+            rows.append({
+                "step": step,
+                "runs": self.step_runs.get(step, 0),
+                "round_trips": calls,
+                "per_run": round(self.per_run(step), 1),
+                "avg_ms": round(1000 * self.seconds[step] / calls, 1),
+                "top_commands": sorted(
+                    ((cmd, n) for (s, cmd), n in self.commands.items() if s == step),
+                    key=lambda cn: -cn[1],
+                )[:5],
+            })
+        return rows
+
+    def log_report(self):
+        for row in self.report():
+            log.info(
+                f"[ROUNDTRIPS] {row['step']}: {row['round_trips']} calls over {row['runs']} runs "
+                f"({row['per_run']}/run, avg {row['avg_ms']} ms) top={row['top_commands']}",
+                extra={"round_trips": row},
+            )
+
+
+ROUND_TRIPS = RoundTripStats()
+
+
+def current_step():
+    stack = getattr(_local, "steps", None)
+    return stack[-1] if stack else "other"
+
+
+@contextlib.contextmanager
+def step(name):
+    """Attribute every WebDriver call made inside the block to `name`."""
+    stack = getattr(_local, "steps", None)
+    if stack is None:
+        stack = _local.steps = []
+    stack.append(name)
+    with ROUND_TRIPS.lock:
+        ROUND_TRIPS.step_runs[name] += 1
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def instrument(driver, stats=ROUND_TRIPS):
+    """Wrap driver.execute so every round trip is counted. Returns the driver."""
+    if getattr(driver, "_round_trips_instrumented", False):
+        return driver
+    original = driver.execute
+
+    def counted_execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            response = original(driver_command, params)
+        finally:
+            stats.record(current_step(), driver_command, time.perf_counter() - started)
+        if driver_command == "switchToWindow":
+            driver._window_handle = (params or {}).get("handle") or (params or {}).get("name")
+        elif driver_command == "close":
+            driver._window_handle = None
+        return response
+
+    driver.execute = counted_execute
+    driver._round_trips_instrumented = True
+    return driver
+
+
+# -----------------------------
+# Composite operations
+# -----------------------------
+SCROLL_CLICK_WAIT_JS = """
+const target = arguments[0], waitFor = arguments[1], timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const el = typeof target === "string"
+    ? document.evaluate(target, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : target;
+if (!el) { done({clicked: false, found: false}); return; }
+el.scrollIntoView({block: "center"});
+el.click();
+if (!waitFor) { done({clicked: true, found: true}); return; }
+const started = Date.now();
+(function poll() {
+    if (document.querySelector(waitFor)) { done({clicked: true, found: true}); return; }
+    if (Date.now() - started > timeoutMs) { done({clicked: true, found: false}); return; }
+    setTimeout(poll, 100);
+})();
+"""
+
+# __READ__ is replaced by a JS function (doc, maxChars) -> value, or null while
+# the page isn't ready yet; the default reads the whole body text.
+READ_BODY_JS = "(doc, maxChars) => doc.body ? doc.body.innerText.slice(0, maxChars) : ''"
+
+OPEN_EXTRACT_CLOSE_JS = """
+const url = arguments[0], timeoutMs = arguments[1], maxChars = arguments[2];
+const done = arguments[arguments.length - 1];
+const read = __READ__;
+const w = window.open(url, "_blank", "noopener=no,width=10,height=10");
+if (!w) { done({ok: false, error: "popup blocked"}); return; }
+const started = Date.now();
+(function poll() {
+    let value = null;
+    try {
+        if (w.document && w.document.readyState === "complete" && w.location.href !== "about:blank") {
+            value = read(w.document, maxChars);
+        }
+    } catch (e) {
+        w.close();
+        done({ok: false, error: "cross-origin: " + e.message});
+        return;
+    }
+    if (value !== null) {
+        const finalUrl = w.location.href;
+        w.close();
+        done({ok: true, value: value, url: finalUrl});
+        return;
+    }
+    if (Date.now() - started > timeoutMs) {
+        w.close();
+        done({ok: false, error: "timeout"});
+        return;
+    }
+    setTimeout(poll, 150);
+})();
+"""
+
+
+def ensure_script_timeout(driver, seconds):
+    if getattr(driver, "_batch_script_timeout", 0) < seconds:
+        driver.set_script_timeout(seconds)
+        driver._batch_script_timeout = seconds
+
+
+def scroll_click_wait(driver, target, wait_for_css=None, timeout=10):
+    """
+    Scroll `target` (XPath or WebElement) into view, click it and optionally
+    wait for `wait_for_css` to appear - one round trip. Returns
+    {"clicked": bool, "found": bool}.
+    """
+    ensure_script_timeout(driver, timeout + 5)
+    return driver.execute_async_script(SCROLL_CLICK_WAIT_JS, target, wait_for_css, int(timeout * 1000))
+
+
+def open_extract_close(driver, url, timeout=20, max_chars=200_000, read_js=READ_BODY_JS):
+    """
+    Load a same-origin `url` in a throwaway window, read it and close it -
+    one round trip instead of open/switch/find/text/close/switch. `read_js`
+    decides what is read (default: the body text; see job_detail.py for a
+    targeted reader). Returns what it read, or None if the page couldn't be
+    read (caller falls back to the tab-based path).
+    """
+    ensure_script_timeout(driver, timeout + 5)
+    script = OPEN_EXTRACT_CLOSE_JS.replace("__READ__", read_js)
+    result = driver.execute_async_script(script, url, int(timeout * 1000), max_chars)
+    if not result.get("ok"):
+        log.debug(f"[BATCH] open_extract_close fell back for {url}: {result.get('error')}")
+        return None
+    return result["value"]
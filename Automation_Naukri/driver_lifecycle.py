@@ -0,0 +1,187 @@
+"""
+driver_lifecycle.py
+Keep long runs memory-bounded by recycling Chrome.
+
+Opening and closing hundreds of job tabs makes one Chrome instance grow until
+the run slows down or crashes. DriverLifecycle samples the RSS of chromedriver
+and every browser process under it (from /proc), recycles the browser after a
+number of jobs or above a memory threshold, and carries the session cookies
+and the current listing page over to the fresh instance. Samples are written
+to a CSV so memory over time can be plotted after the run.
+"""
+
+import csv
+import os
+import time
+
+from run_log import get_logger
+
+log = get_logger("driver_lifecycle")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+RECYCLE_AFTER_JOBS = int(os.getenv("RECYCLE_AFTER_JOBS", "75"))
+RECYCLE_RSS_MB = int(os.getenv("RECYCLE_RSS_MB", "1500"))
+MEMORY_REPORT_FILE = os.getenv("MEMORY_REPORT_FILE", "memory_report.csv")
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# -----------------------------
+# /proc helpers
+# -----------------------------
+def _children_map():
+    """pid -> [child pids] for every process visible in /proc."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm may contain spaces; ppid is the 2nd field after the closing paren
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree(root_pid):
+    """root_pid plus all of its descendants."""
+    children = _children_map()
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def driver_rss_mb(driver):
+    """Resident memory of chromedriver + Chrome, in MB (0 if /proc is unavailable)."""
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return 0.0
+    if not os.path.isdir("/proc"):
+        return 0.0
+    return sum(rss_bytes(pid) for pid in process_tree(root)) / (1024 * 1024)
+
+
+# -----------------------------
+# Lifecycle policy
+# -----------------------------
+class DriverLifecycle:
+    """
+    Owns the WebDriver for a run. Call after_job() once per processed job;
+    it returns the driver to keep using, which is a new one after a recycle.
+    """
+
+    def __init__(self, start_driver, after_restart=None,
+                 max_jobs=RECYCLE_AFTER_JOBS, max_rss_mb=RECYCLE_RSS_MB,
+                 report_file=MEMORY_REPORT_FILE):
+        self.start_driver = start_driver
+        self.after_restart = after_restart  # optional hook(driver), e.g. re-login
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.report_file = report_file
+        self.driver = None
+        self.jobs_total = 0
+        self.jobs_since_start = 0
+        self.recycles = 0
+        self.samples = []  # (unix_ts, jobs_total, rss_mb, open_pages, recycled)
+
+    def start(self):
+        self.driver = self.start_driver()
+        self.jobs_since_start = 0
+        return self.driver
+
+    def sample(self, recycled=False):
+        try:
+            pages = len(self.driver.window_handles)
+        except Exception:
+            pages = 0
+        rss = driver_rss_mb(self.driver)
+        self.samples.append((time.time(), self.jobs_total, round(rss, 1), pages, int(recycled)))
+        return rss
+
+    def after_job(self):
+        self.jobs_total += 1
+        self.jobs_since_start += 1
+        rss = self.sample()
+        if self.jobs_since_start >= self.max_jobs:
+            log.info(f"[LIFECYCLE] {self.jobs_since_start} jobs on this browser, recycling.")
+            return self.recycle()
+        if self.max_rss_mb and rss >= self.max_rss_mb:
+            log.info(f"[LIFECYCLE] browser RSS {rss:.0f} MB >= {self.max_rss_mb} MB, recycling.")
+            return self.recycle()
+        return self.driver
+
+    def recycle(self):
+        """Restart Chrome, keeping cookies and the main window's URL."""
+        old = self.driver
+        resume_url, cookies = None, []
+        try:
+            old.switch_to.window(old.window_handles[0])
+            resume_url = old.current_url
+            cookies = old.get_cookies()
+        except Exception as e:
+            log.warning(f"[LIFECYCLE] could not snapshot session: {e}")
+        try:
+            old.quit()
+        except Exception:
+            pass
+
+        driver = self.start()
+        self.recycles += 1
+
+        if resume_url and resume_url.startswith("http"):
+            # cookies can only be set for the domain currently loaded
+            driver.get(resume_url)
+            for cookie in cookies:
+                cookie.pop("sameSite", None)
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    continue
+            driver.get(resume_url)
+        if self.after_restart:
+            self.after_restart(driver)
+
+        self.sample(recycled=True)
+        log.info(f"[LIFECYCLE] recycled browser (#{self.recycles}), resumed at {resume_url}")
+        return driver
+
+    def quit(self):
+        if self.driver is not None:
+            self.sample()
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+        self.write_report()
+
+    def write_report(self):
+        if not self.samples:
+            return
+        with open(self.report_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["unix_ts", "jobs_total", "rss_mb", "open_pages", "recycled"])
+            writer.writerows(self.samples)
+        peak = max(s[2] for s in self.samples)
+        log.info(
+            f"[LIFECYCLE] memory report -> {self.report_file} "
+            f"({len(self.samples)} samples, peak {peak:.0f} MB, {self.recycles} recycles)"
+        )
@@ -0,0 +1,65 @@
+"""
+form_writer.py
+Read and write profile form fields in a single injected script each.
+
+Typing into React-style forms with click/clear/send_keys costs several
+WebDriver round trips per field. Here a target is either an XPath string or
+a WebElement; read_fields() returns the current value of every target in one
+call, and write_fields() diffs each target against the wanted value and only
+touches the ones that differ - through the native value setter followed by
+input/change events, so the page's framework state sees the edit.
+"""
+
+# Shared helpers for both scripts: resolve a target and read its value.
+_PRELUDE = """
+function resolve(t) {
+    if (typeof t !== "string") return t;
+    return document.evaluate(t, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function current(el) {
+    return el.isContentEditable ? el.innerText : (el.value ?? "");
+}
+"""
+
+READ_JS = _PRELUDE + """
+return arguments[0].map(t => { const el = resolve(t); return el ? current(el) : null; });
+"""
+
+WRITE_JS = _PRELUDE + """
+function setValue(el, value) {
+    if (el.isContentEditable) {
+        el.focus();
+        el.innerText = value;
+    } else {
+        const proto = el.tagName === "TEXTAREA" ? HTMLTextAreaElement.prototype
+            : el.tagName === "SELECT" ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+    }
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    el.dispatchEvent(new Event("blur", {bubbles: true}));
+}
+return arguments[0].map(([t, value]) => {
+    const el = resolve(t);
+    if (!el) return [null, false];
+    const before = current(el);
+    if (before === value) return [before, false];
+    setValue(el, value);
+    return [before, true];
+});
+"""
+
+
+def read_fields(driver, targets):
+    """Current values for each target (None where a target isn't found)."""
+    return driver.execute_script(READ_JS, list(targets))
+
+
+def write_fields(driver, changes):
+    """
+    Apply [(target, value), ...]; values are written as strings. Returns
+    [(previous value, changed?), ...] in the same order - previous value is
+    None when the target wasn't found.
+    """
+    payload = [[target, str(value)] for target, value in changes]
+    return [tuple(r) for r in driver.execute_script(WRITE_JS, payload)]
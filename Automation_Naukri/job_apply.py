@@ -7,13 +7,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 
-# =========================
-# Load .env configuration
-# =========================
+# .env first: the project imports and CONFIG below read os.getenv at import time
 load_dotenv()
 
+from job_harvest import harvest_cards, NAUKRI_CARD_SELECTOR, NAUKRI_LINK_SELECTOR
+from job_network import enable_network_capture
+from driver_lifecycle import DriverLifecycle
+from form_writer import read_fields, write_fields
+from portal_selectors import find
+from page_weight import apply_blocklist
+from job_store import JOB_STORE
+from freshness_queue import FreshnessQueue, posted_at_from_text, record_apply_latency
+from run_log import get_logger, job_context, finish_run, RUN_METRICS
+from retry_policy import RETRY, CircuitOpenError
+from apply_confirm import ApplyResult, confirm_apply
+from apply_quota import QUOTA
+
+log = get_logger("job_apply")
+
 EMAIL = os.getenv("NAUKRI_EMAIL")
 PASSWORD = os.getenv("NAUKRI_PASSWORD")
 
@@ -53,10 +66,11 @@ def start_driver():
     chrome_options.add_argument("--disable-infobars")
     chrome_options.add_argument("--disable-extensions")
     # chrome_options.add_argument("--headless=new")  # uncomment for headless
+    enable_network_capture(chrome_options)  # apply confirmation reads the performance log
 
     driver = webdriver.Chrome(options=chrome_options)
     driver.implicitly_wait(10)
-    return driver
+    return apply_blocklist(driver, "naukri")
 
 
 # =========================
@@ -64,23 +78,23 @@ def start_driver():
 # =========================
 
 def login(driver):
-    print("[INFO] Opening Naukri login page...")
+    log.info("Opening Naukri login page...")
     driver.get("https://www.naukri.com/mnjuser/login")
     time.sleep(3)
 
     # If not actually on login page, assume already logged in
     if "login" not in driver.current_url:
-        print(f"[INFO] Already logged in (URL: {driver.current_url}). Skipping login.")
+        log.info(f"Already logged in (URL: {driver.current_url}). Skipping login.")
         return
 
     try:
         email_input = driver.find_element(By.ID, "usernameField")
         pwd_input = driver.find_element(By.ID, "passwordField")
     except Exception as e:
-        print(f"[WARN] Login fields not found (maybe already logged in): {e}")
+        log.warning(f"Login fields not found (maybe already logged in): {e}")
         return
 
-    print("[INFO] Filling login form...")
+    log.info("Filling login form...")
     email_input.clear()
     email_input.send_keys(EMAIL)
     pwd_input.clear()
@@ -91,9 +105,9 @@ def login(driver):
         "//button[contains(., 'Login') or contains(., 'LOG IN') or contains(., 'log in')]"
     )
     login_btn.click()
-    print("[INFO] Submitted login form...")
+    log.info("Submitted login form...")
     time.sleep(5)
-    print(f"[DEBUG] After login URL: https://www.naukri.com/mnjuser/login -> {driver.current_url}")
+    log.debug(f"After login URL: https://www.naukri.com/mnjuser/login -> {driver.current_url}")
 
 
 # =========================
@@ -101,7 +115,7 @@ def login(driver):
 # =========================
 
 def update_salary_plus_one(driver):
-    print("[INFO] Opening profile page to update salary...")
+    log.info("Opening profile page to update salary...")
     driver.get("https://www.naukri.com/mnjuser/profile")
     wait = WebDriverWait(driver, 20)
 
@@ -109,7 +123,7 @@ def update_salary_plus_one(driver):
 
     # 1) Click the Employment quick-link (left label "Employment" row)
     try:
-        print("[DEBUG] Trying to open Employment section from Quick links...")
+        log.debug("Trying to open Employment section from Quick links...")
 
         # Find the row that has the word "Employment"
         employment_row = driver.find_element(
@@ -126,7 +140,7 @@ def update_salary_plus_one(driver):
         driver.execute_script("arguments[0].click();", employment_link)
         time.sleep(3)
     except Exception as e:
-        print(f"[WARN] Could not click Employment quick link: {e}")
+        log.warning(f"Could not click Employment quick link: {e}")
 
     # 2) Now wait for salary fields to appear
     try:
@@ -135,29 +149,31 @@ def update_salary_plus_one(driver):
                 (By.XPATH, "//label[contains(normalize-space(.), 'Current salary')]")
             )
         )
-        print("[INFO] Salary form visible, updating values...")
+        log.info("Salary form visible, updating values...")
     except TimeoutException:
-        print("[ERROR] Current salary field not found. Cannot update salary.")
+        log.error("Current salary field not found. Cannot update salary.")
         return
 
-    def get_input_by_label_text(text):
-        xpath = f"//label[contains(normalize-space(.),'{text}')]/following::input[1]"
-        return driver.find_element(By.XPATH, xpath)
+    def input_by_label_text(text):
+        return f"//label[contains(normalize-space(.),'{text}')]/following::input[1]"
 
-    try:
-        current_input = get_input_by_label_text("Current salary")
-        fixed_input = get_input_by_label_text("Fixed salary")
-        variable_input = get_input_by_label_text("Variable salary")
-    except Exception as e:
-        print(f"[ERROR] Could not locate salary inputs: {e}")
+    targets = {
+        "current": input_by_label_text("Current salary"),
+        "fixed": input_by_label_text("Fixed salary"),
+        "variable": input_by_label_text("Variable salary"),
+    }
+
+    # --- parse existing values (one script call for all three inputs) ---
+    raw = dict(zip(targets, read_fields(driver, targets.values())))
+    if any(v is None for v in raw.values()):
+        missing = [k for k, v in raw.items() if v is None]
+        log.error(f"Could not locate salary inputs: {missing}")
         return
 
-    # --- parse existing values ---
-    current = parse_salary(current_input.get_attribute("value"))
-    fixed = parse_salary(fixed_input.get_attribute("value"))
-    variable = parse_salary(variable_input.get_attribute("value"))
+    before = {k: parse_salary(v) for k, v in raw.items()}
+    current, fixed, variable = before["current"], before["fixed"], before["variable"]
 
-    print(f"[DEBUG] Before update: current={current}, fixed={fixed}, variable={variable}")
+    log.debug(f"Before update: current={current}, fixed={fixed}, variable={variable}")
 
     if fixed == 0 and current > 0 and variable == 0:
         # Only current filled; treat current as fixed
@@ -167,19 +183,15 @@ def update_salary_plus_one(driver):
         fixed += 1
         current = fixed + variable
 
-    print(f"[DEBUG] After update (+₹1): current={current}, fixed={fixed}, variable={variable}")
-
-    def set_salary_field(elem, value: int):
-        elem.click()
-        elem.clear()
-        elem.send_keys(str(value))
+    log.debug(f"After update (+₹1): current={current}, fixed={fixed}, variable={variable}")
 
+    # --- write only the values that changed, in one script call ---
+    after = {"current": current, "fixed": fixed, "variable": variable}
+    changes = [(targets[k], after[k]) for k in targets if after[k] != before[k]]
     try:
-        set_salary_field(current_input, current)
-        set_salary_field(fixed_input, fixed)
-        set_salary_field(variable_input, variable)
+        write_fields(driver, changes)
     except Exception as e:
-        print(f"[ERROR] Failed setting salary fields: {e}")
+        log.error(f"Failed setting salary fields: {e}")
         return
 
     # Save
@@ -188,140 +200,139 @@ def update_salary_plus_one(driver):
             By.XPATH, "//button[contains(., 'Save') or contains(., 'SAVE') or contains(., 'save')]"
         )
         driver.execute_script("arguments[0].click();", save_btn)
-        print("[INFO] Clicked Save on salary form.")
+        log.info("Clicked Save on salary form.")
     except Exception as e:
-        print(f"[WARN] Could not find/save salary form: {e}")
+        log.warning(f"Could not find/save salary form: {e}")
         return
 
     time.sleep(3)
-    print("[INFO] Salary updated by ₹1 successfully (best effort).")
+    log.info("Salary updated by ₹1 successfully (best effort).")
 
 
 # =========================
 # Apply to jobs
 # =========================
 
-def apply_jobs(driver, max_jobs: int = 5):
-    print("[INFO] Opening Recommended Jobs page...")
-    driver.get("https://www.naukri.com/mnjuser/recommendedjobs")
-    wait = WebDriverWait(driver, 20)
-
-    # Wait for any job card
+JOB_CARD_XPATH = (
+    "//article[contains(@class,'jobTuple')]"
+    " | //div[contains(@class,'cust-job-tuple')]"
+    " | //div[contains(@class,'jobTuple')]"
+)
+
+APPLY_OUTCOMES = {
+    ApplyResult.SUCCESS: "applied",
+    ApplyResult.ALREADY_APPLIED: "already_applied",
+    ApplyResult.QUESTIONNAIRE_REQUIRED: "questionnaire_unanswered",
+    ApplyResult.ERROR: "failed",
+}
+
+def apply_one(driver, href):
+    """
+    Open one job page and apply. Returns "applied", "no_apply_button",
+    "already_applied", "questionnaire_unanswered", "failed" (the portal
+    answered the apply with an error, or not at all) or "quota" (daily
+    apply quota used up); anything else raises for the retry policy.
+    """
+    driver.get(href)
+
+    # Now we are on the job page (detail)
     try:
-        wait.until(
-            EC.presence_of_element_located(
+        apply_btn = WebDriverWait(driver, 15).until(
+            EC.element_to_be_clickable(
                 (
                     By.XPATH,
-                    "//article[contains(@class,'jobTuple')]"
-                    " | //div[contains(@class,'cust-job-tuple')]"
-                    " | //div[contains(@class,'jobTuple')]"
+                    "//button[contains(., 'Apply') or contains(., 'APPLY')]"
+                    " | //a[contains(., 'Apply') or contains(., 'APPLY')]"
                 )
             )
         )
     except TimeoutException:
-        print("[ERROR] No job cards found on Recommended Jobs page.")
-        return
+        log.info("No Apply button found on this job page, skipping.")
+        return "no_apply_button"
+
+    # Check if already applied
+    if find(driver, "naukri", "already_applied"):
+        log.info("This job looks already applied, skipping.")
+        return "already_applied"
+
+    slot = QUOTA.reserve("naukri")
+    if slot is None:
+        return "quota"
+    result = None
+    try:
+        result = confirm_apply(driver, lambda: driver.execute_script("arguments[0].click();", apply_btn))
+    finally:
+        QUOTA.finish(slot, bool(result))
+    return APPLY_OUTCOMES[result.status]
 
-    applied = 0
-    main_window = driver.current_window_handle
-    idx = 0
 
-    while applied < max_jobs:
-        job_cards = driver.find_elements(
-            By.XPATH,
-            "//article[contains(@class,'jobTuple')]"
-            " | //div[contains(@class,'cust-job-tuple')]"
-            " | //div[contains(@class,'jobTuple')]"
-        )
+def apply_jobs(driver, max_jobs: int = 5, lifecycle=None):
+    log.info("Opening Recommended Jobs page...")
+    driver.get("https://www.naukri.com/mnjuser/recommendedjobs")
+    wait = WebDriverWait(driver, 20)
 
-        if idx >= len(job_cards):
-            print("[INFO] No more job cards to process.")
-            break
+    # Wait for any job card
+    try:
+        wait.until(EC.presence_of_element_located((By.XPATH, JOB_CARD_XPATH)))
+    except TimeoutException:
+        log.error("No job cards found on Recommended Jobs page.")
+        return
 
-        card = job_cards[idx]
+    # Scroll the feed once to collect every lazy-loaded card, then work off
+    # that snapshot; later navigation can't re-render it under us. Cards are
+    # applied to freshest first ("Just now" before "3 Days Ago"), until
+    # max_jobs applies went through.
+    cards = harvest_cards(
+        driver, NAUKRI_CARD_SELECTOR, NAUKRI_LINK_SELECTOR, text_selector=NAUKRI_CARD_SELECTOR,
+    )
+    log.info(f"Snapshot of {len(cards)} job cards taken.")
+    jobs_queue = FreshnessQueue()
+    for job_id, href, card_text in cards:
+        posted_at = posted_at_from_text(card_text)
+        jobs_queue.push((job_id, href, posted_at), posted_at)
+
+    idx = 0
+    while jobs_queue:
+        job_id, href, posted_at = jobs_queue.pop()
         idx += 1
+        if RUN_METRICS.applied >= max_jobs:
+            break
 
-        try:
-            driver.execute_script(
-                "arguments[0].scrollIntoView({block:'center'});", card
-            )
-            time.sleep(0.5)
-
-            print(f"[INFO] Opening job card #{idx}...")
-            driver.execute_script("arguments[0].click();", card)
-            time.sleep(2)
-
-            # If a new tab opened, switch to it; else we navigated in same tab
-            handles = driver.window_handles
-            if len(handles) > 1:
-                driver.switch_to.window(handles[-1])
-            else:
-                # same tab, wait for job listing URL
-                try:
-                    wait.until(
-                        EC.url_contains("/job-listings-")
-                    )
-                except TimeoutException:
-                    print("[INFO] Job page did not load as expected, going back.")
-                    driver.back()
-                    time.sleep(2)
-                    driver.switch_to.window(main_window)
-                    continue
-
-            # Now we are on the job page (detail)
+        RUN_METRICS.checked += 1
+        with job_context(job_id):
+            log.info(f"Opening job #{idx} ({job_id})...", extra={"job": href})
             try:
-                apply_btn = WebDriverWait(driver, 15).until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.XPATH,
-                            "//button[contains(., 'Apply') or contains(., 'APPLY')]"
-                            " | //a[contains(., 'Apply') or contains(., 'APPLY')]"
-                        )
-                    )
-                )
-            except TimeoutException:
-                print("[INFO] No Apply button found on this job page, closing.")
-                if len(driver.window_handles) > 1:
-                    driver.close()
-                    driver.switch_to.window(main_window)
-                else:
-                    driver.back()
-                time.sleep(2)
-                continue
-
-            # Check if already applied
-            already_applied = driver.find_elements(
-                By.XPATH,
-                "//*[contains(translate(., 'APPLIED', 'applied'),'applied')]"
+                outcome = RETRY.call(apply_one, driver, href, portal="naukri")
+            except CircuitOpenError as e:
+                log.error(f"Stopping: {e}")
+                break
+            except Exception as e:
+                RUN_METRICS.failed += 1
+                log.warning(f"Unexpected error while processing job {href}: {e}")
+                outcome = "error"
+            if outcome == "quota":
+                log.info("Daily apply quota used up, stopping.")
+                break
+            latency = None
+            if outcome == "applied":
+                RUN_METRICS.applied += 1
+                latency = record_apply_latency(href, posted_at)
+            elif outcome == "failed":
+                RUN_METRICS.failed += 1
+            elif outcome != "error":
+                RUN_METRICS.skip(outcome)
+            JOB_STORE.record(
+                {"portal": "naukri", "job_id": job_id, "url": href, "posted_at": posted_at},
+                outcome, script="job_apply", latency=latency,
             )
-            if already_applied:
-                print("[INFO] This job looks already applied, closing.")
-            else:
-                try:
-                    driver.execute_script("arguments[0].click();", apply_btn)
-                    print("[INFO] Clicked Apply on this job.")
-                    applied += 1
-                except Exception as e:
-                    print(f"[WARN] Could not click Apply: {e}")
-
-            time.sleep(3)
-
-            # Close job page and go back to Recommended Jobs
-            if len(driver.window_handles) > 1:
-                driver.close()
-                driver.switch_to.window(main_window)
-            else:
-                driver.back()
-            time.sleep(2)
-
-        except Exception as e:
-            print(f"[WARN] Unexpected error while processing a job card: {e}")
-            try:
-                driver.switch_to.window(main_window)
-            except Exception:
-                pass
 
-    print(f"[INFO] Finished applying. Total jobs applied this run: {applied}")
+            # long runs: the lifecycle may swap in a fresh browser between jobs
+            if lifecycle is not None:
+                driver = lifecycle.after_job()
+    else:
+        log.info("No more job cards to process.")
+
+    log.info(f"Finished applying. Total jobs applied this run: {RUN_METRICS.applied}")
 
 
 # =========================
@@ -329,22 +340,25 @@ def apply_jobs(driver, max_jobs: int = 5):
 # =========================
 
 def main():
-    print("[DEBUG] job_agent.py main() starting...")
-    driver = start_driver()
+    log.debug("job_apply.py main() starting...")
+    lifecycle = DriverLifecycle(start_driver, after_restart=login)
+    driver = lifecycle.start()
     try:
         login(driver)
         if ENABLE_SALARY_UPDATE:
             update_salary_plus_one(driver)
         else:
-            print("[INFO] Salary update disabled by config.")
-        apply_jobs(driver, max_jobs=MAX_JOBS_PER_RUN)
-        print("[INFO] Completed run.")
+            log.info("Salary update disabled by config.")
+        QUOTA.log_status("naukri")
+        apply_jobs(driver, max_jobs=MAX_JOBS_PER_RUN, lifecycle=lifecycle)
+        log.info("Completed run.")
     finally:
-        driver.quit()
-        print("[INFO] Browser closed.")
+        lifecycle.quit()
+        log.info("Browser closed.")
+        finish_run("job_apply", log)
 
 
 if __name__ == "__main__":
-    print("[DEBUG] __main__ block reached, calling main()")
+    log.debug("__main__ block reached, calling main()")
     main()
 
@@ -0,0 +1,180 @@
+"""
+job_detail.py
+Targeted job-detail extraction: only the parts of a job page the filters read.
+
+Reading find_element(By.TAG_NAME, "body").text serializes the whole rendered
+page - site header, footer, "similar jobs" widgets - over the WebDriver wire
+for every job, and those extra blocks cause false keyword matches (a
+"Kubernetes" in a similar-job card, "Applied" on a neighbour's badge).
+
+extract_detail() reads, in one execute_script call, just the job header
+(title, company, experience, salary, location, posted/applicants stats), the
+key-details block and the JD container into named fields, capped at
+DETAIL_MAX_CHARS in total. read_job_detail() does the same through
+driver_batch.open_extract_close(), without opening a tab. Portals without a
+field spec, or pages whose markup no longer matches it, fall back to the
+<main> text (same cap). The readers that poll a page until its fields render
+stop waiting DETAIL_READY_GRACE_MS after the load event, so an expired job or
+a changed layout costs a moment instead of the whole read timeout.
+
+Every extraction also measures, in the page, how big body.text would have
+been, so DETAIL_BYTES can report bytes per job before/after.
+"""
+
+import json
+import threading
+
+from cdp_direct import hot_path
+from driver_batch import open_extract_close
+from run_log import get_logger
+
+log = get_logger("job_detail")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+DETAIL_MAX_CHARS = 20_000
+# once the page has loaded, how long to wait for the field spec to match
+# before settling for the <main> text
+DETAIL_READY_GRACE_MS = 1500
+
+# field -> CSS selectors; every match of every selector contributes (nested
+# matches are read once). Order is the order of JobDetail.text.
+DETAIL_FIELDS = {
+    "naukri": {
+        "title": ["[class*='jd-header-title']"],
+        "company": ["[class*='jd-header-comp-name']"],
+        "experience": ["[class*='jhc__exp']"],
+        "salary": ["[class*='jhc__salary']"],
+        "location": ["[class*='jhc__location']"],
+        "stats": ["[class*='jhc__stat']"],
+        "key_details": ["[class*='other-details']", "[class*='key-skill']"],
+        "description": ["[class*='dang-inner-html']"],
+    },
+}
+
+# function (doc, spec, maxChars, waitReady, graceMs) -> {fields, fallback, ready, page_bytes},
+# or null when waitReady, the spec matched nothing yet and the page loaded
+# less than graceMs ago (SPA still rendering)
+DETAIL_FN = """
+function (doc, spec, maxChars, waitReady, graceMs) {
+    const fields = {}, used = [];
+    let chars = 0, matched = 0;
+    for (const [field, selectors] of Object.entries(spec)) {
+        const parts = [];
+        for (const css of selectors) {
+            for (const el of doc.querySelectorAll(css)) {
+                if (used.some(u => u.contains(el) || el.contains(u))) continue;
+                used.push(el);
+                const text = (el.innerText || el.textContent || "").trim();
+                if (text) parts.push(text);
+            }
+        }
+        const text = parts.join(" | ").slice(0, Math.max(0, maxChars - chars));
+        chars += text.length;
+        if (text) { fields[field] = text; matched++; }
+    }
+    const ready = matched > 0 && (!spec.description || !!fields.description);
+    if (!ready && waitReady && Object.keys(spec).length) {
+        const perf = doc.defaultView && doc.defaultView.performance;
+        const nav = perf && perf.getEntriesByType ? perf.getEntriesByType("navigation")[0] : null;
+        const settled = doc.readyState === "complete"
+            && (!nav || (nav.loadEventEnd > 0 && perf.now() - nav.loadEventEnd >= graceMs));
+        if (!settled) return null;
+    }
+    const body = doc.body ? doc.body.innerText : "";
+    const result = {fields: fields, ready: ready, page_bytes: new TextEncoder().encode(body).length};
+    if (!ready) {
+        const main = doc.querySelector("main, [role=main]") || doc.body;
+        result.fallback = main ? main.innerText.slice(0, maxChars) : "";
+    }
+    return result;
+}
+"""
+
+
+class DetailBytes:
+    """What job-detail reads cost on the wire: extracted vs. full body text."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.jobs = 0
+        self.sent_bytes = 0
+        self.page_bytes = 0
+        self.fallbacks = 0
+
+    def record(self, detail):
+        with self.lock:
+            self.jobs += 1
+            self.sent_bytes += detail.sent_bytes
+            self.page_bytes += detail.page_bytes
+            self.fallbacks += detail.fallback is not None
+
+    def log_report(self):
+        if not self.jobs:
+            return
+        before, after = self.page_bytes / self.jobs, self.sent_bytes / self.jobs
+        saved = 100 * (1 - after / before) if before else 0
+        log.info(
+            f"[DETAIL] {self.jobs} job pages: {after / 1024:.1f} KB/job extracted vs "
+            f"{before / 1024:.1f} KB/job as body text (-{saved:.0f}%), {self.fallbacks} fell back to <main>",
+            extra={"detail_jobs": self.jobs, "detail_bytes_per_job": round(after),
+                   "body_bytes_per_job": round(before), "detail_fallbacks": self.fallbacks},
+        )
+
+
+DETAIL_BYTES = DetailBytes()
+
+
+class JobDetail:
+    """Structured fields of one job page; .text is what the filters read."""
+
+    def __init__(self, result, sent_bytes=0):
+        self.fields = result.get("fields") or {}
+        self.fallback = result.get("fallback")
+        self.page_bytes = result.get("page_bytes") or 0
+        self.sent_bytes = sent_bytes
+
+    def get(self, field, default=None):
+        return self.fields.get(field, default)
+
+    @property
+    def text(self):
+        parts = list(self.fields.values())
+        if self.fallback is not None:
+            parts.append(self.fallback)
+        return "\n".join(parts)
+
+    def __repr__(self):
+        return f"JobDetail({', '.join(self.fields)}{', fallback' if self.fallback is not None else ''})"
+
+
+def detail_from_result(result):
+    """JobDetail of one DETAIL_FN result, counted in DETAIL_BYTES."""
+    detail = JobDetail(result, sent_bytes=len(json.dumps(result).encode()))
+    DETAIL_BYTES.record(detail)
+    if detail.fallback is not None:
+        log.debug(f"[DETAIL] field spec matched nothing, using <main> text ({len(detail.fallback)} chars)")
+    return detail
+
+
+def extract_detail(driver, portal="naukri", max_chars=DETAIL_MAX_CHARS):
+    """Fields of the job page open in the current tab - one round trip."""
+    spec = DETAIL_FIELDS.get(portal, {})
+    result = hot_path(driver).execute_script(
+        f"return ({DETAIL_FN})(document, arguments[0], arguments[1], false, 0);", spec, max_chars,
+    )
+    return detail_from_result(result)
+
+
+def detail_read_js(portal="naukri"):
+    """JS function (doc, maxChars) -> DETAIL_FN result, or null while the page isn't ready."""
+    spec = DETAIL_FIELDS.get(portal, {})
+    return f"(doc, maxChars) => ({DETAIL_FN})(doc, {json.dumps(spec)}, maxChars, true, {DETAIL_READY_GRACE_MS})"
+
+
+def read_job_detail(driver, url, portal="naukri", timeout=20, max_chars=DETAIL_MAX_CHARS):
+    """Fields of `url` read in a hidden window (open_extract_close); None if unreadable."""
+    result = open_extract_close(hot_path(driver), url, timeout=timeout, max_chars=max_chars,
+                                read_js=detail_read_js(portal))
+    return None if result is None else detail_from_result(result)
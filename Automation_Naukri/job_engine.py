@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+job_engine.py
+One execution engine for every portal adapter in portals.py.
+
+    python job_engine.py                 # Naukri + Hirist side by side
+    python job_engine.py hirist          # just one portal
+    python job_engine.py --dry-run       # filter only, never click Apply
+
+Each portal runs in its own threads inside this process: `concurrency`
+workers, each with its own browser (WebDriver sessions are not thread-safe),
+sharing that portal's job queue, apply quota and rate limit. The first worker
+of a portal logs in and discovers the jobs; the rest log in and start
+consuming as soon as discovery is done. Retries, circuit breaking, browser
+recycling and metrics are the shared helpers the single-portal scripts use.
+"""
+
+import queue
+import sys
+import threading
+import time
+
+from dotenv import load_dotenv
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from driver_batch import ROUND_TRIPS, step
+from driver_lifecycle import DriverLifecycle
+from freshness_queue import FreshnessQueue, record_apply_latency
+from job_detail import DETAIL_BYTES
+from job_store import JOB_STORE
+from apply_quota import QUOTA
+from portals import ADAPTERS
+from retry_policy import RETRY, CircuitOpenError
+from run_log import get_logger, job_context, finish_run, RUN_METRICS
+
+log = get_logger("job_engine")
+
+
+class RateLimiter:
+    """At most one call per `min_interval` seconds, across threads."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = max(0.0, self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.min_interval
+        if delay:
+            time.sleep(delay)
+
+
+class PortalRun:
+    """Shared state of one portal: job queue, quota and rate limit."""
+
+    def __init__(self, adapter, dry_run=False):
+        self.adapter = adapter
+        self.dry_run = dry_run
+        self.jobs = queue.Queue()
+        self.discovered = threading.Event()
+        self.stopped = threading.Event()
+        self.limiter = RateLimiter(adapter.min_apply_interval)
+        self.lock = threading.Lock()
+        self.applied = 0
+        self.reserved = 0
+
+    def reserve_apply(self):
+        """Claim one apply from the portal's quota; False once it is used up."""
+        with self.lock:
+            if self.applied + self.reserved >= self.adapter.max_jobs:
+                self.stopped.set()
+                return False
+            self.reserved += 1
+            return True
+
+    def finish_apply(self, ok):
+        with self.lock:
+            self.reserved -= 1
+            if ok:
+                self.applied += 1
+
+    def process(self, driver, job):
+        """extract -> applied? -> relevant? -> apply. Returns an outcome string."""
+        adapter = self.adapter
+        detail = adapter.extract(driver, job)
+        if adapter.is_applied(driver, job):
+            return "already_applied"
+        if not adapter.is_relevant(job, detail):
+            return "skipped"
+        if self.dry_run:
+            return "matched"
+        if not self.reserve_apply():
+            return "quota"
+        slot = QUOTA.reserve(adapter.name)
+        if slot is None:
+            # the daily quota (all scripts, all processes) is used up
+            self.finish_apply(False)
+            self.stopped.set()
+            return "quota"
+        self.limiter.wait()
+        ok = False
+        try:
+            ok = adapter.apply(driver, job)
+        finally:
+            self.finish_apply(ok)
+            QUOTA.finish(slot, ok)
+        return "applied" if ok else "failed"
+
+
+def run_worker(run, index):
+    adapter = run.adapter
+    name = f"{adapter.name}-{index}"
+    lifecycle = DriverLifecycle(
+        adapter.start_driver,
+        after_restart=adapter.login,
+        report_file=f"memory_report_{name}.csv",
+    )
+    try:
+        driver = lifecycle.start()
+        if not adapter.login(driver):
+            log.error(f"[{name}] login failed, worker stopping")
+            return
+
+        if index == 0:
+            try:
+                fresh = FreshnessQueue()
+                for job in adapter.discover(driver):
+                    fresh.push(job, job.get("posted_at"), job.get("relevance", 0))
+                while fresh:
+                    run.jobs.put(fresh.pop())  # freshest first
+            finally:
+                run.discovered.set()
+            log.info(f"[{name}] discovered {run.jobs.qsize()} jobs")
+        else:
+            run.discovered.wait()
+
+        while not run.stopped.is_set():
+            try:
+                job = run.jobs.get_nowait()
+            except queue.Empty:
+                break
+            RUN_METRICS.add("checked")
+            with job_context(job["url"]), step(f"{adapter.name}_job"):
+                try:
+                    outcome = RETRY.call(run.process, driver, job, portal=adapter.name)
+                except CircuitOpenError as e:
+                    log.error(f"[{name}] stopping: {e}")
+                    run.stopped.set()
+                    break
+                except Exception as e:
+                    RUN_METRICS.add("failed")
+                    log.error(f"[{name}] [ERROR job] {job['url']} -> {e}")
+                    outcome = "error"
+                log.info(f"[{name}] {outcome.upper()} {job['url']}", extra={"outcome": outcome})
+                latency = None
+                if outcome == "applied":
+                    RUN_METRICS.add("applied")
+                    latency = record_apply_latency(job["url"], job.get("posted_at"))
+                elif outcome == "failed":
+                    RUN_METRICS.add("failed")
+                elif outcome not in ("error", "skipped"):
+                    # filter rejections were already counted by reason
+                    RUN_METRICS.skip(outcome)
+                JOB_STORE.record(
+                    {"portal": adapter.name, "url": job["url"], "posted_at": job.get("posted_at")},
+                    outcome, script="job_engine", latency=latency,
+                )
+            driver = lifecycle.after_job()
+    except Exception as e:
+        log.error(f"[{name}] worker crashed: {e}")
+    finally:
+        run.discovered.set()  # never leave sibling workers waiting
+        lifecycle.quit()
+
+
+def run_portals(names, dry_run=False):
+    runs = [PortalRun(ADAPTERS[name](), dry_run=dry_run) for name in names]
+    for name in names:
+        QUOTA.log_status(name)
+    threads = []
+    for run in runs:
+        RETRY.breaker(run.adapter.name)  # create breakers before threads race for them
+        for index in range(max(1, run.adapter.concurrency)):
+            t = threading.Thread(
+                target=run_worker, args=(run, index),
+                name=f"{run.adapter.name}-{index}", daemon=True,
+            )
+            t.start()
+            threads.append(t)
+    for t in threads:
+        t.join()
+    for run in runs:
+        log.info(f"{run.adapter.name}: applied {run.applied}/{run.adapter.max_jobs}")
+
+
+def main(argv):
+    dry_run = "--dry-run" in argv
+    names = [a for a in argv[1:] if not a.startswith("--")] or list(ADAPTERS)
+    unknown = [n for n in names if n not in ADAPTERS]
+    if unknown:
+        print(f"unknown portal(s): {unknown}; choose from {list(ADAPTERS)}")
+        return 2
+    try:
+        run_portals(names, dry_run=dry_run)
+    finally:
+        ROUND_TRIPS.log_report()
+        DETAIL_BYTES.log_report()
+        finish_run("job_engine", log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,189 @@
+"""
+job_harvest.py
+Incremental harvesting of lazy-loaded job cards (Naukri / Hirist listings).
+
+snapshot_job_cards() reads every card rendered right now in one call. When
+that is not enough, a MutationObserver plus a small scroll driver are
+injected into the page: newly rendered cards are de-duplicated in the
+browser and drained back to Python in batches, until a target count or the
+end of the feed is reached. Paginated result pages pass a short idle_ticks,
+since there is little or nothing left to lazy-load once the page is up.
+With a text_selector, each card also carries the text of its enclosing
+tuple (title, company, "3 Days Ago"...), so callers can rank cards before
+opening any of them.
+"""
+
+import time
+
+from run_log import get_logger
+
+log = get_logger("job_harvest")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+HARVEST_SCROLL_INTERVAL_MS = 700   # how often the page is scrolled to the bottom
+HARVEST_IDLE_TICKS = 6             # scroll ticks without growth => end of feed
+HARVEST_PAGE_IDLE_TICKS = 2        # same, on paginated result pages
+HARVEST_POLL_SECONDS = 0.35        # how often Python drains the queue
+HARVEST_TIMEOUT_SECONDS = 90
+
+NAUKRI_CARD_SELECTOR = (
+    "article[class*='jobTuple'], div[class*='cust-job-tuple'], div[class*='jobTuple']"
+)
+NAUKRI_LINK_SELECTOR = "a[href*='/job-listings-']"
+
+HIRIST_CARD_SELECTOR = "a[href*='/j/'], a[href*='/job-'], a[href*='/jobs/']"
+HIRIST_LINK_SELECTOR = HIRIST_CARD_SELECTOR
+
+# function (card, linkSel, textSel) -> [id, href(, text)] or null; shared by
+# the one-shot snapshot and the harvester so both key cards the same way
+READ_CARD_JS = """
+function (card, linkSel, textSel) {
+    const link = card.matches(linkSel) ? card : card.querySelector(linkSel);
+    if (!link || !link.href) return null;
+    const id = card.getAttribute("data-job-id") || link.href.split("?")[0];
+    if (!textSel) return [id, link.href];
+    const box = link.closest(textSel) || card;
+    return [id, link.href, (box.innerText || "").slice(0, 600)];
+}
+"""
+
+# One round trip: every card rendered right now, de-duplicated.
+SNAPSHOT_JS = """
+const readCard = """ + READ_CARD_JS + """;
+const cardSel = arguments[0], linkSel = arguments[1], textSel = arguments[2];
+const seen = new Set(), out = [];
+for (const card of document.querySelectorAll(cardSel)) {
+    const row = readCard(card, linkSel, textSel);
+    if (!row || seen.has(row[0])) continue;
+    seen.add(row[0]);
+    out.push(row);
+}
+return out;
+"""
+
+# Installs window.__jobHarvest once; re-running it while active just returns.
+# Cards whose id is in seenIds (already snapshotted) are not queued again.
+INSTALL_JS = """
+const readCard = """ + READ_CARD_JS + """;
+const cardSel = arguments[0], linkSel = arguments[1];
+const tickMs = arguments[2], idleTicks = arguments[3], textSel = arguments[4];
+const seenIds = arguments[5] || [], target = arguments[6];
+if (window.__jobHarvest) return;
+
+const h = window.__jobHarvest = {queue: [], seen: new Set(seenIds), done: false, idle: 0};
+
+function finish() {
+    h.done = true;
+    clearInterval(h.timer);
+    h.observer.disconnect();
+}
+
+function read(card) {
+    if (h.done) return;
+    const row = readCard(card, linkSel, textSel);
+    if (!row || h.seen.has(row[0])) return;
+    h.seen.add(row[0]);
+    h.queue.push(row);
+    if (target && h.seen.size >= target) finish();
+}
+
+function scan(root) {
+    if (root.nodeType !== 1) return;
+    if (root.matches(cardSel)) read(root);
+    root.querySelectorAll(cardSel).forEach(read);
+}
+
+h.observer = new MutationObserver(muts => {
+    for (const m of muts) m.addedNodes.forEach(scan);
+});
+h.observer.observe(document.body, {childList: true, subtree: true});
+
+let lastHeight = 0;
+h.timer = setInterval(() => {
+    const height = document.documentElement.scrollHeight;
+    if (height === lastHeight) {
+        h.idle += 1;
+        if (h.idle >= idleTicks) finish();
+    } else {
+        h.idle = 0;
+        lastHeight = height;
+    }
+    window.scrollTo(0, height);
+}, tickMs);
+scan(document.body);
+"""
+
+# Hand back everything queued since the last drain, plus the end-of-feed flag.
+DRAIN_JS = """
+const h = window.__jobHarvest;
+if (!h) return [[], true];
+const batch = h.queue.splice(0, h.queue.length);
+return [batch, h.done];
+"""
+
+STOP_JS = """
+const h = window.__jobHarvest;
+if (h) { clearInterval(h.timer); h.observer.disconnect(); }
+delete window.__jobHarvest;
+"""
+
+
+def snapshot_job_cards(driver, card_selector=NAUKRI_CARD_SELECTOR, link_selector=NAUKRI_LINK_SELECTOR,
+                       text_selector=None):
+    """Return [(job_id, href), ...] - or (job_id, href, card_text) - for the cards rendered right now."""
+    rows = driver.execute_script(SNAPSHOT_JS, card_selector, link_selector, text_selector) or []
+    return [tuple(row) for row in rows]
+
+
+def iter_card_batches(driver, card_selector, link_selector, target=None,
+                      timeout=HARVEST_TIMEOUT_SECONDS, text_selector=None,
+                      idle_ticks=HARVEST_IDLE_TICKS, skip_ids=()):
+    """
+    Yield lists of (job_id, href) - or (job_id, href, card_text) when
+    `text_selector` is given - as new cards render on the current page.
+    Stops once `target` cards were seen (`skip_ids` included), the feed
+    stops growing for `idle_ticks` scroll ticks, or `timeout`.
+    """
+    driver.execute_script(
+        INSTALL_JS, card_selector, link_selector,
+        HARVEST_SCROLL_INTERVAL_MS, idle_ticks, text_selector, list(skip_ids), target,
+    )
+    seen = len(skip_ids)
+    deadline = time.time() + timeout
+    try:
+        while True:
+            batch, done = driver.execute_script(DRAIN_JS)
+            if batch:
+                batch = [tuple(pair) for pair in batch]
+                seen += len(batch)
+                log.debug(f"[HARVEST] +{len(batch)} cards (total {seen})")
+                yield batch
+            if done:
+                log.info("[HARVEST] end of feed reached.")
+                return
+            if target is not None and seen >= target:
+                return
+            if time.time() > deadline:
+                log.warning(f"[HARVEST] timeout after {timeout}s with {seen} cards.")
+                return
+            time.sleep(HARVEST_POLL_SECONDS)
+    finally:
+        driver.execute_script(STOP_JS)
+
+
+def harvest_cards(driver, card_selector, link_selector, target=None,
+                  timeout=HARVEST_TIMEOUT_SECONDS, text_selector=None, idle_ticks=HARVEST_IDLE_TICKS):
+    """
+    snapshot_job_cards(), topped up through iter_card_batches() unless the
+    snapshot already holds `target` cards; one de-duplicated list.
+    """
+    jobs = snapshot_job_cards(driver, card_selector, link_selector, text_selector)
+    if target is not None and len(jobs) >= target:
+        return jobs[:target]
+    for batch in iter_card_batches(driver, card_selector, link_selector, target, timeout, text_selector,
+                                   idle_ticks, skip_ids=[job[0] for job in jobs]):
+        jobs.extend(batch)
+    return jobs[:target] if target is not None else jobs
@@ -14,10 +14,22 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-# ---- Load config ----
+# .env first: the project imports and CONFIG below read os.getenv at import time
 load_dotenv()
+
+from job_harvest import harvest_cards, HIRIST_CARD_SELECTOR, HIRIST_LINK_SELECTOR
+from portal_selectors import find
+from page_weight import apply_blocklist
+from job_store import JOB_STORE
+from apply_quota import QUOTA
+from run_log import get_logger, job_context, finish_run, RUN_METRICS
+from retry_policy import RETRY, CircuitOpenError, classify, TRANSIENT
+
+log = get_logger("job_hirish")
+
+# ---- Load config ----
 HIRIST_EMAIL = os.getenv("HIRIST_EMAIL")
 HIRIST_PASSWORD = os.getenv("HIRIST_PASSWORD")
 HIRIST_SEARCH_URL = os.getenv("HIRIST_SEARCH_URL", "https://www.hirist.tech/")
@@ -34,13 +46,13 @@ def debug_dump(driver, prefix="hirist_debug"):
     try:
         driver.save_screenshot(png)
     except Exception as e:
-        print(f"[DEBUG] save_screenshot failed: {e}")
+        log.debug(f"save_screenshot failed: {e}")
     try:
         with open(html, "w", encoding="utf-8") as f:
             f.write(driver.page_source)
     except Exception as e:
-        print(f"[DEBUG] write page_source failed: {e}")
-    print(f"[DEBUG] Wrote debug files: {png}, {html}")
+        log.debug(f"write page_source failed: {e}")
+    log.debug(f"Wrote debug files: {png}, {html}")
 
 def start_driver():
     chrome_options = Options()
@@ -54,22 +66,20 @@ def start_driver():
     # chrome_options.add_argument("--user-data-dir=/home/manoj/.chrome-hirist-profile")
     driver = webdriver.Chrome(options=chrome_options)
     driver.implicitly_wait(8)
-    return driver
+    return apply_blocklist(driver, "hirist")
 
 def click_jobseeker_login(driver):
     try:
-        # Try common selectors for the Jobseeker Login button
-        btn = WebDriverWait(driver, 8).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(.,'Jobseeker Login') or contains(.,'Jobseeker') or //a[contains(.,'Jobseeker Login')]]"))
-        )
+        # Jobseeker Login control in the page header (see portal_selectors.REGISTRY)
+        btn = WebDriverWait(driver, 8).until(lambda d: find(d, "hirist", "jobseeker_login"))
         driver.execute_script("arguments[0].click();", btn)
-        print("[INFO] Clicked Jobseeker Login.")
+        log.info("Clicked Jobseeker Login.")
         time.sleep(2)
         return True
     except TimeoutException:
-        print("[WARN] Jobseeker Login button not found via XPATH; trying alternate selectors.")
+        log.warning("Jobseeker Login button not found in the header; trying alternate selectors.")
     except Exception as e:
-        print(f"[WARN] clicking Jobseeker Login raised: {e}")
+        log.warning(f"clicking Jobseeker Login raised: {e}")
     # fallback: try header button or link by text
     try:
         for txt in ("Jobseeker Login", "Login", "Sign in"):
@@ -77,13 +87,13 @@ def click_jobseeker_login(driver):
             for el in elems:
                 try:
                     driver.execute_script("arguments[0].click();", el)
-                    print(f"[INFO] Clicked login element with text '{txt}'.")
+                    log.info(f"Clicked login element with text '{txt}'.")
                     time.sleep(2)
                     return True
                 except Exception:
                     continue
     except Exception as e:
-        print(f"[WARN] fallback click attempt failed: {e}")
+        log.warning(f"fallback click attempt failed: {e}")
     return False
 
 def locate_login_fields_and_submit(driver):
@@ -101,7 +111,7 @@ def locate_login_fields_and_submit(driver):
             pwd = driver.find_element(By.XPATH, "//input[contains(@type,'password') or contains(@placeholder,'Password') or contains(@name,'password')]")
         except NoSuchElementException:
             # OTP-only or stepwise login
-            print("[WARN] Password field not found - Hirist might be using OTP-only login or different flow.")
+            log.warning("Password field not found - Hirist might be using OTP-only login or different flow.")
             debug_dump(driver, prefix="hirist_login_otp_detected")
             return False
 
@@ -112,7 +122,7 @@ def locate_login_fields_and_submit(driver):
         # Click a button named Login, Log In, SUBMIT etc
         btn_candidates = driver.find_elements(By.XPATH, "//button[contains(.,'Login') or contains(.,'LOG IN') or contains(.,'Sign in') or contains(.,'Submit')]")
         if not btn_candidates:
-            print("[WARN] Login button not found after filling credentials.")
+            log.warning("Login button not found after filling credentials.")
             debug_dump(driver, prefix="hirist_no_login_btn")
             return False
 
@@ -121,50 +131,45 @@ def locate_login_fields_and_submit(driver):
             try:
                 driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
                 driver.execute_script("arguments[0].click();", btn)
-                print("[INFO] Clicked login submit.")
+                log.info("Clicked login submit.")
                 time.sleep(4)
                 return True
             except Exception:
                 continue
 
-        print("[WARN] Could not click any login button candidates.")
+        log.warning("Could not click any login button candidates.")
         debug_dump(driver, prefix="hirist_login_btn_click_fail")
         return False
 
     except TimeoutException:
-        print("[ERROR] Login fields never appeared. Dumping debug info.")
+        log.error("Login fields never appeared. Dumping debug info.")
         debug_dump(driver, prefix="hirist_login_fields_missing")
         return False
     except Exception as e:
-        print(f"[ERROR] Unexpected error locating login fields: {e}")
+        log.error(f"Unexpected error locating login fields: {e}")
         debug_dump(driver, prefix="hirist_login_unexpected")
         return False
 
 def collect_job_links(driver):
-    print(f"[INFO] Opening search/listing: {HIRIST_SEARCH_URL}")
+    log.info(f"Opening search/listing: {HIRIST_SEARCH_URL}")
     driver.get(HIRIST_SEARCH_URL)
     time.sleep(4)
     debug_dump(driver, prefix="hirist_listing_before_collect")
     try:
-        # Job cards can be anchor tags; collect candidates
-        anchors = driver.find_elements(By.XPATH, "//a[contains(@href,'/j/') or contains(@href,'/job-') or contains(@href,'/jobs/')]")
+        # Job cards are anchor tags; scroll the listing so lazy-loaded ones render too
         hrefs = []
-        for a in anchors:
-            href = a.get_attribute("href")
-            if href and "hirist.tech" in href and "login" not in href and href not in hrefs:
+        for _, href in harvest_cards(driver, HIRIST_CARD_SELECTOR, HIRIST_LINK_SELECTOR):
+            if "hirist.tech" in href and "login" not in href and href not in hrefs:
                 hrefs.append(href)
-        print(f"[INFO] Collected {len(hrefs)} job links (filtered).")
+        log.info(f"Collected {len(hrefs)} job links (filtered).")
         return hrefs
     except Exception as e:
-        print(f"[ERROR] collecting job links failed: {e}")
+        log.error(f"collecting job links failed: {e}")
         debug_dump(driver, prefix="hirist_collect_links_err")
         return []
 
-def apply_on_job_page(driver, url):
-    print(f"[INFO] Opening job: {url}")
-    driver.get(url)
-    time.sleep(3)
-    debug_dump(driver, prefix="hirist_job_open")
+def click_apply_button(driver):
+    """Click the first Apply control on the open job page; True if one was clicked."""
     # Try multiple apply patterns
     xpaths = [
         "//button[contains(.,'Apply') or contains(.,'APPLY')]",
@@ -177,61 +182,96 @@ def apply_on_job_page(driver, url):
             driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
             time.sleep(0.6)
             driver.execute_script("arguments[0].click();", el)
-            print("[INFO] Clicked apply button.")
+            log.info("Clicked apply button.")
             time.sleep(3)
-            debug_dump(driver, prefix="hirist_applied")
             return True
         except NoSuchElementException:
             continue
         except Exception as e:
-            print(f"[WARN] clicking xpath {xp} failed: {e}")
-    print("[INFO] No Apply button found on this job page.")
+            if classify(e) == TRANSIENT:
+                raise  # let the retry policy reopen the page
+            log.warning(f"clicking xpath {xp} failed: {e}")
+    log.info("No Apply button found on this job page.")
+    return False
+
+def apply_on_job_page(driver, url):
+    log.info(f"Opening job: {url}")
+    driver.get(url)
+    time.sleep(3)
+    debug_dump(driver, prefix="hirist_job_open")
+    if click_apply_button(driver):
+        debug_dump(driver, prefix="hirist_applied")
+        return True
     return False
 
 def auto_apply_hirist(driver):
     links = collect_job_links(driver)
     if not links:
-        print("[ERROR] No job links found, exiting.")
+        log.error("No job links found, exiting.")
         return
-    applied = 0
     for link in links:
-        if applied >= HIRIST_MAX_JOBS_PER_RUN:
+        if RUN_METRICS.applied >= HIRIST_MAX_JOBS_PER_RUN:
             break
-        try:
-            ok = apply_on_job_page(driver, link)
-            if ok:
-                applied += 1
-        except Exception as e:
-            print(f"[WARN] error processing {link}: {e}")
-    print(f"[INFO] Completed auto-apply. Applied: {applied}")
+        slot = QUOTA.reserve("hirist")
+        if slot is None:
+            log.info("Daily apply quota used up, stopping.")
+            break
+        RUN_METRICS.checked += 1
+        ok = False
+        with job_context(link):
+            try:
+                ok = RETRY.call(apply_on_job_page, driver, link, portal="hirist")
+                if ok:
+                    RUN_METRICS.applied += 1
+                else:
+                    RUN_METRICS.skip("no_apply_button")
+                outcome = "applied" if ok else "no_apply_button"
+            except CircuitOpenError as e:
+                log.error(f"Stopping: {e}")
+                break
+            except Exception as e:
+                RUN_METRICS.failed += 1
+                log.warning(f"error processing {link}: {e}")
+                outcome = "error"
+            finally:
+                QUOTA.finish(slot, ok)
+            JOB_STORE.record({"portal": "hirist", "url": link}, outcome, script="job_hirish")
+    log.info(f"Completed auto-apply. Applied: {RUN_METRICS.applied}")
+
+def login(driver):
+    """Log in through the Jobseeker popup; False if manual login is needed."""
+    driver.get("https://www.hirist.tech/")
+    time.sleep(2)
+    if not click_jobseeker_login(driver):
+        log.warning("Could not click Jobseeker login - maybe already on login or logged in.")
+        return True
+    # try to fill normal email/password login
+    ok = locate_login_fields_and_submit(driver)
+    if not ok:
+        log.info("Manual login may be required (OTP flows or different popup). Exiting early to allow manual login.")
+        # dump debug and exit rather than trying to auto-apply while logged out
+        debug_dump(driver, prefix="hirist_after_failed_login")
+    return ok
 
 def main():
-    print("[DEBUG] hirist_apply.py main starting...")
+    log.debug("job_hirish.py main starting...")
     driver = start_driver()
     try:
-        driver.get("https://www.hirist.tech/")
-        time.sleep(2)
-        if not click_jobseeker_login(driver):
-            print("[WARN] Could not click Jobseeker login - maybe already on login or logged in.")
-        else:
-            # try to fill normal email/password login
-            ok = locate_login_fields_and_submit(driver)
-            if not ok:
-                print("[INFO] Manual login may be required (OTP flows or different popup). Exiting early to allow manual login.")
-                # dump debug and exit rather than trying to auto-apply while logged out
-                debug_dump(driver, prefix="hirist_after_failed_login")
-                return
+        if not login(driver):
+            return
 
         # small wait after login
         time.sleep(4)
-        print(f"[DEBUG] After login URL: {driver.current_url}")
+        log.debug(f"After login URL: {driver.current_url}")
+        QUOTA.log_status("hirist")
         auto_apply_hirist(driver)
     finally:
-        print("[INFO] quitting driver.")
+        log.info("quitting driver.")
         try:
             driver.quit()
         except Exception:
             pass
+        finish_run("job_hirish", log)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,161 @@
+"""
+job_lookahead.py
+Speculative loading of the next job detail pages while the current one is handled.
+
+Reading a job page (job_detail.read_job_detail) opens a hidden window and
+waits for the page to load, so every job pays its full page-load latency
+before it can even be filtered. With lookahead on, the next LOOKAHEAD_TABS
+jobs in the queue are already loading in background windows while the
+current job is filtered or applied; when their turn comes, read() usually
+finds the page rendered and returns its fields at once.
+
+The windows are a fixed set of named windows ("jobbot-lookahead-0".."K-1")
+opened from the results tab; window.open() with an existing name navigates
+that same window, so tabs are reused rather than created per job - no extra
+browser processes, and nothing is orphaned if the results tab navigates.
+Windows closed underneath us (back_to_results(), a recycled browser) are
+simply reopened on the next fill(). LOOKAHEAD_TABS=0 turns lookahead off.
+"""
+
+import os
+import threading
+
+from cdp_direct import hot_path
+from driver_batch import ensure_script_timeout
+from job_detail import DETAIL_MAX_CHARS, detail_from_result, detail_read_js
+from run_log import get_logger
+
+log = get_logger("job_lookahead")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+LOOKAHEAD_TABS = int(os.getenv("LOOKAHEAD_TABS", "2"))
+LOOKAHEAD_READ_TIMEOUT = 20
+
+FILL_JS = """
+const urls = arguments[0], k = arguments[1];
+const pool = window.__jobbotLookahead = window.__jobbotLookahead || {};
+const names = Array.from({length: k}, (_, i) => "jobbot-lookahead-" + i);
+const wanted = urls.slice(0, k);
+const held = new Set();
+for (const name of names) {
+    const slot = pool[name];
+    if (slot && slot.url && slot.win && !slot.win.closed && wanted.includes(slot.url)) held.add(slot.url);
+}
+const free = names.filter(name => {
+    const slot = pool[name];
+    return !(slot && slot.url && slot.win && !slot.win.closed && held.has(slot.url));
+});
+let started = 0;
+for (const url of wanted) {
+    if (held.has(url) || !free.length) continue;
+    const name = free.shift();
+    const win = window.open(url, name, "noopener=no,width=10,height=10");
+    if (!win) break;
+    pool[name] = {win: win, url: url, started: Date.now()};
+    started++;
+}
+return started;
+"""
+
+READ_JS = """
+const url = arguments[0], timeoutMs = arguments[1], maxChars = arguments[2];
+const done = arguments[arguments.length - 1];
+const read = __READ__;
+const pool = window.__jobbotLookahead || {};
+const name = Object.keys(pool).find(n => pool[n].url === url && pool[n].win && !pool[n].win.closed);
+if (!name) { done({ok: false, error: "not loaded ahead"}); return; }
+const slot = pool[name], started = Date.now(), alreadyMs = started - slot.started;
+(function poll() {
+    let value = null;
+    try {
+        const doc = slot.win.document;
+        if (doc && doc.readyState === "complete" && slot.win.location.href !== "about:blank") {
+            value = read(doc, maxChars);
+        }
+    } catch (e) {
+        slot.url = null;
+        done({ok: false, error: "cross-origin: " + e.message});
+        return;
+    }
+    if (value !== null) {
+        slot.url = null;   // window stays open for the next job
+        done({ok: true, value: value, waited_ms: Date.now() - started, loading_ms: alreadyMs});
+        return;
+    }
+    if (Date.now() - started > timeoutMs) {
+        slot.url = null;
+        done({ok: false, error: "timeout"});
+        return;
+    }
+    setTimeout(poll, 100);
+})();
+"""
+
+CLOSE_JS = """
+const pool = window.__jobbotLookahead || {};
+for (const name of Object.keys(pool)) {
+    if (pool[name].win && !pool[name].win.closed) pool[name].win.close();
+}
+window.__jobbotLookahead = {};
+"""
+
+
+class Lookahead:
+    def __init__(self, tabs=LOOKAHEAD_TABS, portal="naukri"):
+        self.tabs = tabs
+        self.read_js = READ_JS.replace("__READ__", detail_read_js(portal))
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.waited_ms = 0
+
+    def fill(self, driver, urls):
+        """Keep the first `tabs` of `urls` loading in the lookahead windows."""
+        if self.tabs <= 0 or not urls:
+            return 0
+        try:
+            return hot_path(driver).execute_script(FILL_JS, list(urls), self.tabs)
+        except Exception as e:
+            log.debug(f"[LOOKAHEAD] fill failed: {e}")
+            return 0
+
+    def read(self, driver, url, timeout=LOOKAHEAD_READ_TIMEOUT):
+        """JobDetail of `url` from its lookahead window, or None if it wasn't loaded ahead."""
+        if self.tabs <= 0:
+            return None
+        driver = hot_path(driver)
+        ensure_script_timeout(driver, timeout + 5)
+        try:
+            result = driver.execute_async_script(self.read_js, url, int(timeout * 1000), DETAIL_MAX_CHARS)
+        except Exception as e:
+            log.debug(f"[LOOKAHEAD] read of {url} failed: {e}")
+            result = {"ok": False}
+        with self.lock:
+            if not result.get("ok"):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.waited_ms += result["waited_ms"]
+        return detail_from_result(result["value"])
+
+    def close(self, driver):
+        if self.tabs <= 0:
+            return
+        try:
+            hot_path(driver).execute_script(CLOSE_JS)
+        except Exception as e:
+            log.debug(f"[LOOKAHEAD] close failed: {e}")
+
+    def log_report(self):
+        reads = self.hits + self.misses
+        if self.tabs <= 0 or not reads:
+            return
+        avg_wait = self.waited_ms / self.hits if self.hits else 0
+        log.info(
+            f"[LOOKAHEAD] K={self.tabs}: {self.hits}/{reads} job pages read from lookahead windows, "
+            f"avg remaining wait {avg_wait:.0f} ms",
+            extra={"lookahead_tabs": self.tabs, "lookahead_hits": self.hits,
+                   "lookahead_misses": self.misses, "lookahead_avg_wait_ms": round(avg_wait)},
+        )
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+job_network.py
+Read job listings straight from the portals' JSON search APIs via CDP.
+
+Naukri and Hirist render their listing pages from XHR responses. With
+Chrome's performance log enabled we can see those responses, pull their
+bodies through the DevTools protocol and parse structured job records
+(id, experience band, locations, posting time, applied flag) without
+walking the DOM at all.
+
+Run directly against a recorded payload to check the parsers:
+    python job_network.py fixtures/naukri_search_api.json
+
+or serve the recorded payloads with standin_server.py and point the browser
+at it to exercise the capture path end to end.
+"""
+
+import json
+import re
+import sys
+import time
+from urllib.parse import urlencode
+
+from run_log import get_logger
+
+log = get_logger("job_network")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+# Response URL paths that carry listing data, per portal (path-only so the
+# stand-in server in standin_server.py matches too)
+API_URL_PATTERNS = {
+    "naukri": re.compile(r"/jobapi/v\d+/search"),
+    "hirist": re.compile(r"/jobfeed/|/api/.*search"),
+}
+
+# What the Naukri results page's own XHR sends (verify against a capture if
+# the API starts answering 4xx)
+NAUKRI_SEARCH_API = "https://www.naukri.com/jobapi/v3/search"
+NAUKRI_API_HEADERS = {"appid": "109", "systemid": "Naukri"}
+
+
+# -----------------------------
+# Browser wiring
+# -----------------------------
+def enable_network_capture(chrome_options):
+    """Ask chromedriver to keep the performance (DevTools) log for this session."""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def start_network_capture(driver):
+    driver.execute_cdp_cmd("Network.enable", {})
+    # drop whatever was logged before we started listening
+    driver.get_log("performance")
+
+
+def drain_api_payloads(driver, portal):
+    """
+    Return the parsed JSON bodies of every listing-API response logged since
+    the last call. Non-matching traffic is discarded.
+    """
+    pattern = API_URL_PATTERNS[portal]
+    payloads = []
+    for entry in driver.get_log("performance"):
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if msg.get("method") != "Network.responseReceived":
+            continue
+        params = msg.get("params", {})
+        response = params.get("response", {})
+        if not pattern.search(response.get("url", "")):
+            continue
+        if "json" not in response.get("mimeType", ""):
+            continue
+        try:
+            body = driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": params["requestId"]}
+            )
+            payloads.append(json.loads(body.get("body") or "null"))
+        except Exception as e:
+            log.warning(f"[NETWORK] could not read body for {response.get('url')}: {e}")
+    return payloads
+
+
+def collect_api_jobs(driver, portal, timeout=10, settle=1.0):
+    """
+    Wait up to `timeout` seconds for listing-API responses on the current
+    page and return their job records (see parse_* below).
+    """
+    deadline = time.time() + timeout
+    jobs = []
+    while time.time() < deadline:
+        payloads = drain_api_payloads(driver, portal)
+        for payload in payloads:
+            jobs.extend(PARSERS[portal](payload))
+        if jobs and not payloads:
+            break  # got data and nothing new arrived during the last settle period
+        time.sleep(settle)
+    log.info(f"[NETWORK] {portal}: {len(jobs)} job records from API responses")
+    return jobs
+
+
+def naukri_search_api_url(query, location, page=1):
+    """Search API URL of result page `page` - what the results page itself fetches."""
+    return NAUKRI_SEARCH_API + "?" + urlencode({
+        "noOfResults": 20, "urlType": "search_by_key_loc", "searchType": "adv",
+        "keyword": query, "location": location, "pageNo": page,
+        "k": query, "l": location, "src": "jobsearchDesk",
+        "seoKey": f"{query.replace(' ', '-')}-jobs-in-{location.replace(' ', '-')}",
+    })
+
+
+# -----------------------------
+# Payload parsers
+# -----------------------------
+def parse_experience(text):
+    """'8-12 Yrs' -> (8, 12); '5+ Yrs' -> (5, None); otherwise (None, None)."""
+    text = (text or "").lower()
+    m = re.search(r"(\d+)\s*[-–]\s*(\d+)", text)
+    if m:
+        return int(m.group(1)), int(m.group(2))
+    m = re.search(r"(\d+)\s*\+", text)
+    if m:
+        return int(m.group(1)), None
+    return None, None
+
+
+def _split_locations(text):
+    return [loc.strip() for loc in re.split(r"[,/]", text or "") if loc.strip()]
+
+
+def _epoch_seconds(value):
+    """Portals send ms since epoch (sometimes as a string)."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value / 1000.0 if value > 1e11 else value
+
+
+def parse_naukri_search(payload):
+    """Records from a Naukri /jobapi/v3/search response."""
+    jobs = []
+    for item in (payload or {}).get("jobDetails") or []:
+        placeholders = {p.get("type"): p.get("label") for p in item.get("placeholders") or []}
+        min_exp, max_exp = parse_experience(placeholders.get("experience") or item.get("experienceText"))
+        url = item.get("jdURL") or ""
+        if url.startswith("/"):
+            url = "https://www.naukri.com" + url
+        jobs.append({
+            "portal": "naukri",
+            "job_id": str(item.get("jobId") or ""),
+            "url": url,
+            "title": item.get("title") or "",
+            "company": item.get("companyName") or "",
+            "skills": item.get("tagsAndSkills") or "",
+            "description": item.get("jobDescription") or "",
+            "min_exp": min_exp,
+            "max_exp": max_exp,
+            "locations": _split_locations(placeholders.get("location")),
+            "salary": placeholders.get("salary") or "",
+            "posted_at": _epoch_seconds(item.get("createdDate")),
+            "applied": bool(item.get("applied") or item.get("isApplied")),
+        })
+    return jobs
+
+
+def parse_hirist_search(payload):
+    """Records from a Hirist job-feed/search response."""
+    payload = payload or {}
+    items = payload.get("data") or payload.get("jobs") or []
+    if isinstance(items, dict):
+        items = items.get("jobs") or items.get("jobList") or []
+    jobs = []
+    for item in items:
+        locations = item.get("locations") or item.get("location") or []
+        if isinstance(locations, str):
+            locations = _split_locations(locations)
+        else:
+            locations = [loc.get("name", "") if isinstance(loc, dict) else str(loc) for loc in locations]
+        url = item.get("jobDetailUrl") or item.get("url") or ""
+        if url.startswith("/"):
+            url = "https://www.hirist.tech" + url
+        jobs.append({
+            "portal": "hirist",
+            "job_id": str(item.get("id") or item.get("jobId") or ""),
+            "url": url,
+            "title": item.get("title") or "",
+            "company": (item.get("companyData") or {}).get("companyName") or item.get("companyName") or "",
+            "skills": ", ".join(t.get("name", "") for t in item.get("tags") or [] if isinstance(t, dict)),
+            "description": item.get("description") or "",
+            "min_exp": item.get("min"),
+            "max_exp": item.get("max"),
+            "locations": locations,
+            "salary": "",
+            "posted_at": _epoch_seconds(item.get("createdTimeMs") or item.get("createdAt")),
+            "applied": bool(item.get("applied") or item.get("isApplied")),
+        })
+    return jobs
+
+
+PARSERS = {
+    "naukri": parse_naukri_search,
+    "hirist": parse_hirist_search,
+}
+
+
+# -----------------------------
+# Offline check against a recorded payload
+# -----------------------------
+def main(argv):
+    if len(argv) < 2:
+        print("usage: python job_network.py <recorded_payload.json> [naukri|hirist]")
+        return 2
+    path = argv[1]
+    portal = argv[2] if len(argv) > 2 else ("hirist" if "hirist" in path else "naukri")
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    for job in PARSERS[portal](payload):
+        print(json.dumps(job, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+job_store.py
+Local warehouse of every job posting the crawlers look at.
+
+    python job_store.py stats                          # postings, verdicts, top companies
+    python job_store.py export [out_dir] [parquet|arrow]
+
+Postings (title, company, experience, locations, salary, posted date...) and
+the filter verdict of every look at them go into a SQLite database in WAL
+mode. JOB_STORE.record() only puts the row on a queue; a background thread
+writes rows in batches (one transaction per batch), so the browser loop never
+waits on disk. Pending rows are flushed at exit.
+
+Tables:
+    postings  one row per (portal, job_id), latest fields + last verdict,
+              indexed on company and posted_at
+    verdicts  one row per look: when, which script, verdict, filter reason,
+              posting-to-apply latency for applies
+
+`export` dumps both tables to Parquet (or Arrow IPC) files for analysis;
+run it from cron for a periodic snapshot. It needs pyarrow, which is not a
+dependency of the crawlers themselves.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from dotenv import load_dotenv
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from run_log import get_logger
+from seen_filter import job_id_from_url
+
+log = get_logger("job_store")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+JOB_STORE_FILE = os.getenv("JOB_STORE_FILE", "job_store.sqlite3")
+BATCH_SIZE = 200          # rows per write transaction
+FLUSH_SECONDS = 2.0       # max time a row waits on the queue
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    portal      TEXT NOT NULL,
+    job_id      TEXT NOT NULL,
+    url         TEXT,
+    title       TEXT,
+    company     TEXT,
+    min_exp     INTEGER,
+    max_exp     INTEGER,
+    locations   TEXT,
+    salary      TEXT,
+    skills      TEXT,
+    posted_at   REAL,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    verdict     TEXT,
+    reason      TEXT,
+    PRIMARY KEY (portal, job_id)
+);
+CREATE INDEX IF NOT EXISTS postings_company ON postings(company);
+CREATE INDEX IF NOT EXISTS postings_posted_at ON postings(posted_at);
+
+CREATE TABLE IF NOT EXISTS verdicts (
+    portal   TEXT NOT NULL,
+    job_id   TEXT NOT NULL,
+    seen_at  REAL NOT NULL,
+    script   TEXT,
+    verdict  TEXT,
+    reason   TEXT,
+    apply_latency_s REAL
+);
+CREATE INDEX IF NOT EXISTS verdicts_job ON verdicts(portal, job_id);
+CREATE INDEX IF NOT EXISTS verdicts_seen_at ON verdicts(seen_at);
+"""
+
+UPSERT_SQL = """
+INSERT INTO postings (portal, job_id, url, title, company, min_exp, max_exp, locations,
+                      salary, skills, posted_at, first_seen, last_seen, verdict, reason)
+VALUES (:portal, :job_id, :url, :title, :company, :min_exp, :max_exp, :locations,
+        :salary, :skills, :posted_at, :seen_at, :seen_at, :verdict, :reason)
+ON CONFLICT (portal, job_id) DO UPDATE SET
+    url       = COALESCE(excluded.url, url),
+    title     = COALESCE(excluded.title, title),
+    company   = COALESCE(excluded.company, company),
+    min_exp   = COALESCE(excluded.min_exp, min_exp),
+    max_exp   = COALESCE(excluded.max_exp, max_exp),
+    locations = COALESCE(excluded.locations, locations),
+    salary    = COALESCE(excluded.salary, salary),
+    skills    = COALESCE(excluded.skills, skills),
+    posted_at = COALESCE(excluded.posted_at, posted_at),
+    last_seen = excluded.last_seen,
+    verdict   = COALESCE(excluded.verdict, verdict),
+    reason    = CASE WHEN excluded.verdict IS NULL THEN reason ELSE excluded.reason END
+"""
+
+VERDICT_SQL = """
+INSERT INTO verdicts (portal, job_id, seen_at, script, verdict, reason, apply_latency_s)
+VALUES (:portal, :job_id, :seen_at, :script, :verdict, :reason, :latency)
+"""
+
+_POSTING_FIELDS = ("url", "title", "company", "min_exp", "max_exp", "salary", "posted_at")
+
+
+def connect(path=JOB_STORE_FILE):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(verdicts)")}
+    if "apply_latency_s" not in columns:  # stores created before latency tracking
+        conn.execute("ALTER TABLE verdicts ADD COLUMN apply_latency_s REAL")
+    return conn
+
+
+class JobStore:
+    def __init__(self, path=JOB_STORE_FILE):
+        self.path = path
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def _ensure_writer(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._writer, name="job-store", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+
+    def record(self, posting, verdict=None, reason=None, script=None, latency=None):
+        """
+        Queue one look at a posting. `posting` is a job_network record or any
+        dict with at least portal and url/job_id; missing fields stay as
+        previously stored. `latency` is the posting-to-apply time of an apply.
+        """
+        row = {f: posting.get(f) for f in _POSTING_FIELDS}
+        row["portal"] = posting.get("portal") or "naukri"
+        row["job_id"] = str(posting.get("job_id") or job_id_from_url(posting.get("url")))
+        locations = posting.get("locations")
+        row["locations"] = ", ".join(locations) if isinstance(locations, list) else locations
+        skills = posting.get("skills")
+        row["skills"] = ", ".join(skills) if isinstance(skills, list) else skills
+        row.update(seen_at=time.time(), verdict=verdict, reason=reason, script=script, latency=latency)
+        self._ensure_writer()
+        self.queue.put(row)
+
+    def _writer(self):
+        conn = connect(self.path)
+        closing = False
+        while not closing:
+            batch = []
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while len(batch) < BATCH_SIZE:
+                try:
+                    row = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if row is None:
+                    closing = True
+                    break
+                batch.append(row)
+            if not batch:
+                continue
+            try:
+                with conn:
+                    conn.executemany(UPSERT_SQL, batch)
+                    conn.executemany(VERDICT_SQL, [r for r in batch if r["verdict"]])
+            except sqlite3.Error as e:
+                log.warning(f"[STORE] dropped {len(batch)} rows: {e}")
+        conn.close()
+
+    def close(self):
+        """Flush queued rows and stop the writer (safe to call twice)."""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join(timeout=30)
+
+
+JOB_STORE = JobStore()
+
+
+# -----------------------------
+# Reporting / export
+# -----------------------------
+def stats(path=JOB_STORE_FILE, days=30):
+    conn = connect(path)
+    since = time.time() - days * 86400
+    try:
+        return {
+            "postings": conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            "verdicts": dict(conn.execute(
+                "SELECT COALESCE(verdict, '-') || ':' || COALESCE(reason, '-'), COUNT(*) "
+                "FROM verdicts WHERE seen_at >= ? GROUP BY 1 ORDER BY 2 DESC", (since,),
+            ).fetchall()),
+            "top_companies": conn.execute(
+                "SELECT company, COUNT(*) FROM postings WHERE company IS NOT NULL AND last_seen >= ? "
+                "GROUP BY company ORDER BY 2 DESC LIMIT 15", (since,),
+            ).fetchall(),
+        }
+    finally:
+        conn.close()
+
+
+def export(out_dir=".", fmt="parquet", path=JOB_STORE_FILE):
+    """Write postings/verdicts to <out_dir>/<table>.<parquet|arrow>; returns the paths."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.feather as feather
+    except ImportError:
+        raise RuntimeError("export needs pyarrow: pip install pyarrow")
+
+    os.makedirs(out_dir, exist_ok=True)
+    conn = connect(path)
+    written = []
+    try:
+        for table in ("postings", "verdicts"):
+            cur = conn.execute(f"SELECT * FROM {table}")
+            columns = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+            arrow_table = pa.table({c: [r[i] for r in rows] for i, c in enumerate(columns)})
+            target = os.path.join(out_dir, f"{table}.{'parquet' if fmt == 'parquet' else 'arrow'}")
+            if fmt == "parquet":
+                pq.write_table(arrow_table, target)
+            else:
+                feather.write_feather(arrow_table, target)
+            written.append(target)
+    finally:
+        conn.close()
+    return written
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else "stats"
+    if command == "stats":
+        for key, value in stats().items():
+            print(f"{key}: {value}")
+        return 0
+    if command == "export":
+        out_dir = argv[2] if len(argv) > 2 else "."
+        fmt = argv[3] if len(argv) > 3 else "parquet"
+        for target in export(out_dir, fmt):
+            print(f"wrote {target}")
+        return 0
+    print("usage: python job_store.py stats | export [out_dir] [parquet|arrow]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,3 +1,4 @@
+import contextvars
 import os
 import time
 import re
@@ -7,19 +8,44 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    ElementClickInterceptedException,
-)
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from job_harvest import HARVEST_PAGE_IDLE_TICKS, harvest_cards
+from job_network import enable_network_capture, start_network_capture, collect_api_jobs, parse_experience
+from page_prefetch import PagePrefetcher, results_page_url
+from job_lookahead import Lookahead
+from job_store import JOB_STORE
+from seen_filter import SEEN_FILTER, VisitedJobs
+from freshness_queue import FreshnessQueue, posted_at_from_text, record_apply_latency
+from driver_lifecycle import DriverLifecycle
+from search_planner import load_history, save_history, plan_crawl, record_run
+from retry_policy import RETRY, CircuitOpenError
+from apply_confirm import ApplyResult, confirm_apply
+from apply_quota import QUOTA
+from driver_batch import ROUND_TRIPS, instrument, step
+from cdp_direct import hot_path
+from job_detail import DETAIL_BYTES, extract_detail, read_job_detail
+from portal_selectors import find
+from page_weight import apply_blocklist
+from run_log import get_logger, job_context, finish_run, RUN_METRICS
+
+log = get_logger("job_update")
+
 # -----------------------------
 # CONFIG – edit if needed
 # -----------------------------
 
 DRY_RUN = False  # set True → checks only, no apply click
 
+# True → read listings from the search API responses (CDP) and filter on the
+# structured records; only matching jobs are opened. False → scrape anchors.
+USE_NETWORK_CAPTURE = False
+
 INCLUDE_KEYWORDS = [
     "devops",
     "dev ops",
@@ -73,17 +99,45 @@ ALLOWED_LOCATIONS = [
 MIN_EXPERIENCE_YEARS = 8
 MAX_EXPERIENCE_YEARS = 12
 
-SEARCH_QUERY = "devops engineer"
-SEARCH_LOCATION = "bengaluru"
+# Every query is searched in every location; results are de-duplicated
+SEARCH_QUERIES = [
+    "devops engineer",
+    "sre",
+    "platform engineer",
+    "cloud engineer",
+]
+SEARCH_LOCATIONS = [
+    "bengaluru",
+    "remote",
+]
+
+# Result pages to load per run, shared across all searches by search_planner
+CRAWL_BUDGET_PAGES = 12
+MAX_PAGES_PER_SEARCH = 5
 
-SEARCH_URL = (
-    f"https://www.naukri.com/{SEARCH_QUERY.replace(' ', '-')}"
-    f"-jobs-in-{SEARCH_LOCATION.replace(' ', '-')}"
-)
+
+def search_url(query: str, location: str, page: int = 1) -> str:
+    return results_page_url(query, location, page)
+
+# Job title anchors on a search results page, and the tuple around each one
+# (its text carries company, skills and "3 Days Ago")
+SEARCH_CARD_SELECTOR = "a[href*='/job-listings-'][title]"
+SEARCH_TUPLE_SELECTOR = "div[class*='srp-jobtuple'], div[class*='cust-job-tuple'], article[class*='jobTuple']"
 
 # -----------------------------
 # FILTER LOGIC
 # -----------------------------
+# Reason of the last filter rejection in this thread/job, for the job store
+_skip_reason = contextvars.ContextVar("skip_reason", default=None)
+
+
+def _skip(reason: str, detail: str) -> bool:
+    """Record a filter rejection (logged + counted per reason); returns False."""
+    RUN_METRICS.skip(reason)
+    _skip_reason.set(reason)
+    log.info(f"[FILTER] skip: {detail}", extra={"reason": reason})
+    return False
+
 def is_relevant_job(page_text: str) -> bool:
     text = page_text.lower()
 
@@ -92,23 +146,19 @@ def is_relevant_job(page_text: str) -> bool:
     if age_match:
         days = int(age_match.group(1))
         if days > 30:
-            print(f"[FILTER] skip: too old ({days} days)")
-            return False
+            return _skip("too_old", f"too old ({days} days)")
 
     # 1) Include keyword check
     if not any(kw in text for kw in INCLUDE_KEYWORDS):
-        print("[FILTER] skip: no INCLUDE_KEYWORDS matched")
-        return False
+        return _skip("no_include_keyword", "no INCLUDE_KEYWORDS matched")
 
     # 2) Exclude keyword check
     if any(bad in text for bad in EXCLUDE_KEYWORDS):
-        print("[FILTER] skip: contains EXCLUDE_KEYWORDS")
-        return False
+        return _skip("exclude_keyword", "contains EXCLUDE_KEYWORDS")
 
     # 3) Location check
     if not any(loc in text for loc in ALLOWED_LOCATIONS):
-        print("[FILTER] skip: location not in ALLOWED_LOCATIONS")
-        return False
+        return _skip("location", "location not in ALLOWED_LOCATIONS")
 
     # 4) Experience parsing
     years = []
@@ -123,170 +173,448 @@ def is_relevant_job(page_text: str) -> bool:
     if years:
         min_exp, max_exp = min(years), max(years)
         if max_exp < MIN_EXPERIENCE_YEARS or min_exp > MAX_EXPERIENCE_YEARS:
-            print(f"[FILTER] skip: experience {min_exp}-{max_exp} outside {MIN_EXPERIENCE_YEARS}-{MAX_EXPERIENCE_YEARS}")
-            return False
+            return _skip("experience", f"experience {min_exp}-{max_exp} outside {MIN_EXPERIENCE_YEARS}-{MAX_EXPERIENCE_YEARS}")
+
+    return True
+
+def is_relevant_record(job: dict) -> bool:
+    """Same rules as is_relevant_job, applied to a parsed API record."""
+    if job.get("applied"):
+        return _skip("already_applied", "already applied")
+
+    # 0) Skip old jobs
+    if job.get("posted_at"):
+        days = int((time.time() - job["posted_at"]) // 86400)
+        if days > 30:
+            return _skip("too_old", f"too old ({days} days)")
+
+    text = " ".join([job.get("title", ""), job.get("skills", ""), job.get("description", "")]).lower()
+
+    # 1) Include keyword check
+    if not any(kw in text for kw in INCLUDE_KEYWORDS):
+        return _skip("no_include_keyword", "no INCLUDE_KEYWORDS matched")
+
+    # 2) Exclude keyword check
+    if any(bad in text for bad in EXCLUDE_KEYWORDS):
+        return _skip("exclude_keyword", "contains EXCLUDE_KEYWORDS")
+
+    # 3) Location check
+    locations = " ".join(job.get("locations") or []).lower()
+    if locations and not any(loc in locations for loc in ALLOWED_LOCATIONS):
+        return _skip("location", "location not in ALLOWED_LOCATIONS")
+
+    # 4) Experience band
+    min_exp, max_exp = job.get("min_exp"), job.get("max_exp")
+    if max_exp is not None and max_exp < MIN_EXPERIENCE_YEARS:
+        return _skip("experience", f"experience {min_exp}-{max_exp} outside {MIN_EXPERIENCE_YEARS}-{MAX_EXPERIENCE_YEARS}")
+    if min_exp is not None and min_exp > MAX_EXPERIENCE_YEARS:
+        return _skip("experience", f"experience {min_exp}-{max_exp} outside {MIN_EXPERIENCE_YEARS}-{MAX_EXPERIENCE_YEARS}")
 
     return True
 
 # -----------------------------
 # MAIN SCRIPT
 # -----------------------------
+def start_driver():
+    chrome_options = Options()
+    chrome_options.add_argument("--start-maximized")
+    enable_network_capture(chrome_options)  # apply confirmation reads the performance log
+    return apply_blocklist(instrument(webdriver.Chrome(options=chrome_options)), "naukri")
+
+
+def on_driver_restart(driver):
+    if USE_NETWORK_CAPTURE:
+        start_network_capture(driver)
+
+
+def login(driver, email, password):
+    driver.get("https://www.naukri.com/")
+    time.sleep(5)
+
+    try:
+        login_btn = driver.find_element(By.LINK_TEXT, "Login")
+        login_btn.click()
+        time.sleep(3)
+
+        email_input = driver.find_element(
+            By.XPATH,
+            "//input[contains(@placeholder,'Email') or contains(@placeholder,'Username')]",
+        )
+        pass_input = driver.find_element(
+            By.XPATH,
+            "//input[@type='password' or contains(@placeholder,'password')]",
+        )
+
+        email_input.send_keys(email)
+        pass_input.send_keys(password)
+        pass_input.send_keys(Keys.ENTER)
+        time.sleep(6)
+
+    except NoSuchElementException:
+        pass  # already logged in
+
+
+def relevance_score(text: str) -> int:
+    """How many distinct INCLUDE_KEYWORDS the text mentions (freshness-queue tiebreak)."""
+    text = (text or "").lower()
+    return sum(1 for kw in INCLUDE_KEYWORDS if kw in text)
+
+
+def jobs_from_api(records, visited):
+    """
+    New jobs among a results page's API records, as dicts {"url",
+    "prefiltered", "posted_at", "relevance"}, plus how many records there
+    were. Records are filtered here, before any tab is opened. `visited` is
+    a seen_filter.VisitedJobs; skipped records are marked done in it.
+    """
+    jobs = []
+    for job in records:
+        href = job["url"]
+        if not href or href in visited:
+            continue
+        visited.add(href)
+        if is_relevant_record(job):
+            JOB_STORE.record(job)  # verdict follows from process_job
+            jobs.append({
+                "url": href, "prefiltered": True, "posted_at": job.get("posted_at"),
+                "relevance": relevance_score(f"{job.get('title', '')} {job.get('skills', '')}"),
+            })
+        else:
+            RUN_METRICS.checked += 1
+            JOB_STORE.record(job, "skipped", _skip_reason.get(), script="job_update")
+            visited.mark_done(href, "skipped")
+            log.info(f"[SKIP] {href}", extra={"job": href})
+    return jobs, len(records)
+
+
+def jobs_from_cards(cards, visited):
+    """Same as jobs_from_api for (href, card_text) result cards; age and relevance come from the card text."""
+    jobs = []
+    for href, card_text in cards:
+        if href not in visited:
+            visited.add(href)
+            jobs.append({
+                "url": href, "prefiltered": False,
+                "posted_at": posted_at_from_text(card_text),
+                "relevance": relevance_score(card_text),
+            })
+    return jobs, len(cards)
+
+
+def collect_page_jobs(driver, visited):
+    """New jobs on the results page loaded in the current tab (see jobs_from_api)."""
+    if USE_NETWORK_CAPTURE:
+        return jobs_from_api(collect_api_jobs(driver, "naukri"), visited)
+    cards = harvest_cards(
+        driver, SEARCH_CARD_SELECTOR, SEARCH_CARD_SELECTOR, text_selector=SEARCH_TUPLE_SELECTOR,
+        idle_ticks=HARVEST_PAGE_IDLE_TICKS,
+    )
+    return jobs_from_cards([(href, card_text) for _, href, card_text in cards], visited)
+
+
+def back_to_results(driver):
+    """Close any job tab left open and focus the results tab."""
+    while len(driver.window_handles) > 1:
+        driver.switch_to.window(driver.window_handles[-1])
+        driver.close()
+    driver.switch_to.window(driver.window_handles[0])
+
+
+def click_apply(driver, href) -> ApplyResult:
+    """
+    Click Apply on the open job page and wait for the portal's answer
+    (apply_confirm.py), answering any questionnaire on the way.
+    """
+    if find(driver, "naukri", "already_applied"):
+        return ApplyResult(ApplyResult.ALREADY_APPLIED, "marked applied on the page", source="page")
+    for xpath in [
+        "//button[contains(.,'Apply')]",
+        "//a[contains(.,'Apply')]",
+    ]:
+        try:
+            btn = driver.find_element(By.XPATH, xpath)
+        except NoSuchElementException:
+            continue
+        result = confirm_apply(driver, btn.click)
+        if not result:
+            log.warning(f"[APPLY {result.status.upper()}] {href}: {result.detail}")
+        return result
+    return ApplyResult(ApplyResult.ERROR, "no Apply button", source="page")
+
+
+def store_verdict(href, detail, verdict, reason=None, latency=None):
+    """Persist one look at a job; header fields come from the page when it was read."""
+    page_text = detail.text if detail else ""
+    posting = {"portal": "naukri", "url": href, "posted_at": posted_at_from_text(page_text)}
+    if detail:
+        posting.update(title=detail.get("title"), company=detail.get("company"),
+                       locations=detail.get("location"), salary=detail.get("salary"),
+                       skills=detail.get("key_details"))
+    m = re.search(r"\d+\s*[-–]\s*\d+\s*(?:yrs|years)", page_text.lower())
+    if m:
+        posting["min_exp"], posting["max_exp"] = parse_experience(m.group(0))
+    JOB_STORE.record(posting, verdict, reason, script="job_update", latency=latency)
+
+
+def open_job_tab(driver, wait, href):
+    before = set(driver.window_handles)
+    driver.execute_script("window.open(arguments[0]);", href)
+    # a prefetch window may be open too, so find the new handle rather than assume [-1]
+    new = [h for h in driver.window_handles if h not in before]
+    driver.switch_to.window(new[-1] if new else driver.window_handles[-1])
+    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    time.sleep(3)
+
+
+def process_job(driver, wait, href, prefiltered, posted_at=None, detail=None):
+    """
+    Filter one job and apply. The relevance check reads the job header, key
+    details and JD in a single read_job_detail() call, unless `detail` was
+    already read (job_lookahead.py); a tab is only opened for jobs that are
+    applied to. Returns "skipped", "matched" (dry run), "applied",
+    "already_applied", "failed" or "quota" (no slot left in the daily
+    apply quota, see apply_quota.py).
+    Errors propagate to the caller's retry policy, with the job tab closed.
+    `posted_at` (epoch seconds, if known) is used for the posting-to-apply
+    latency of an apply.
+    """
+    try:
+        tab_open = False
+        if not prefiltered and detail is None:
+            detail = read_job_detail(driver, href)
+            if detail is None:
+                # hidden window not readable (popup blocked / redirect) - use a tab
+                open_job_tab(driver, wait, href)
+                tab_open = True
+                detail = extract_detail(driver)
+            if not is_relevant_job(detail.text):
+                log.info(f"[SKIP] {href}")
+                store_verdict(href, detail, "skipped", _skip_reason.get())
+                if tab_open:
+                    back_to_results(driver)
+                return "skipped"
+
+        if DRY_RUN:
+            log.info(f"[MATCH] (dry run) {href}")
+            store_verdict(href, detail, "matched")
+            if tab_open:
+                back_to_results(driver)
+            return "matched"
+
+        slot = QUOTA.reserve("naukri")
+        if slot is None:
+            if tab_open:
+                back_to_results(driver)
+            return "quota"
+        result = None
+        try:
+            if not tab_open:
+                open_job_tab(driver, wait, href)
+            result = click_apply(driver, href)
+        finally:
+            QUOTA.finish(slot, bool(result))
+
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+
+        if result:
+            RUN_METRICS.applied += 1
+            log.info(f"[APPLIED] {href}")
+            latency = record_apply_latency(href, posted_at or posted_at_from_text(detail.text if detail else ""))
+            store_verdict(href, detail, "applied", latency=latency)
+            return "applied"
+        if result.status == ApplyResult.ALREADY_APPLIED:
+            RUN_METRICS.skip("already_applied")
+            log.info(f"[ALREADY APPLIED] {href}")
+            store_verdict(href, detail, "already_applied")
+            return "already_applied"
+        RUN_METRICS.failed += 1
+        log.info(f"[SKIP / FAILED APPLY] {href}")
+        store_verdict(href, detail, "failed", f"{result.status}: {result.detail}")
+        return "failed"
+
+    except Exception:
+        back_to_results(driver)
+        raise
+
+
+def load_results_page(driver, query, location, page, visited):
+    """Load a results page in the current tab and collect its new jobs."""
+    url = search_url(query, location, page)
+    try:
+        hot_path(driver).get(url)
+    except TimeoutException:
+        # a slow page is still worth reading: the cards are usually there before the load event
+        log.warning(f"Results page {url} did not finish loading; reading what rendered")
+    return collect_page_jobs(driver, visited)
+
+
+def crawl_and_apply(lifecycle, plan, visited, searches):
+    """
+    Discovery and apply, pipelined over the crawl plan. Result pages are
+    visited by URL; while the jobs found so far are processed (freshest
+    first), the next results page is already loading in the background
+    (page_prefetch.py), so neither stage waits for the other. A search stops
+    at its first empty page. Appends (query, location, page_stats) per
+    search to `searches`; each page's {"found", "passed", "applied"} dict is
+    filled in by apply_queued() through the jobs' "stats" reference.
+    """
+    pages = [(query, location, page) for query, location, n in plan for page in range(1, n + 1)]
+    prefetch = PagePrefetcher(SEARCH_CARD_SELECTOR, SEARCH_TUPLE_SELECTOR, use_api=USE_NETWORK_CAPTURE)
+    lookahead = Lookahead()
+    jobs_queue = FreshnessQueue()
+    page_stats = {}
+    exhausted = set()
+
+    try:
+        for i, (query, location, page) in enumerate(pages):
+            search = (query, location)
+            if search in exhausted:
+                continue
+            if search not in page_stats:
+                page_stats[search] = []
+                searches.append((query, location, page_stats[search]))
+                log.info(f"Searching '{query}' in '{location}'")
+
+            driver = lifecycle.driver
+            with step("results_page"):
+                records = prefetch.collect(driver, query, location, page)
+                if records is None:
+                    jobs, found = load_results_page(driver, query, location, page, visited)
+                elif USE_NETWORK_CAPTURE:
+                    jobs, found = jobs_from_api(records, visited)
+                else:
+                    jobs, found = jobs_from_cards(records, visited)
+            log.info(f"Page {page}: {len(jobs)} new of {found} job links")
+            stats = {"found": found, "passed": 0, "applied": 0}
+            page_stats[search].append(stats)
+            if not found:
+                exhausted.add(search)
+
+            for job in jobs:
+                job["stats"] = stats
+                jobs_queue.push(job, job["posted_at"], job["relevance"])
+
+            # the next page loads while this page's jobs are processed
+            for upcoming in pages[i + 1:]:
+                if upcoming[:2] not in exhausted:
+                    prefetch.start(driver, *upcoming)
+                    break
+            if not apply_queued(lifecycle, jobs_queue, lookahead, visited):
+                log.info("[QUOTA] apply quota used up, stopping the crawl")
+                break
+    finally:
+        lookahead.close(lifecycle.driver)
+        lookahead.log_report()
+
+
+# outcomes that are not retried on a later run ("failed" is, "matched" is a dry run)
+FINAL_OUTCOMES = ("skipped", "applied", "already_applied")
+
+
+def apply_queued(lifecycle, jobs_queue, lookahead=None, visited=None):
+    """
+    Process queued jobs freshest first until the queue is empty. With a
+    Lookahead, the next jobs' pages load in background windows while the
+    current one is processed. Jobs with a final outcome are marked done in
+    `visited` (a seen_filter.VisitedJobs), so later runs skip them. Returns
+    False if it stopped because the daily apply quota is used up.
+    """
+    def upcoming():
+        return [j["url"] for j in jobs_queue.peek(len(jobs_queue)) if not j["prefiltered"]][:lookahead.tabs]
+
+    driver = lifecycle.driver
+    wait = WebDriverWait(driver, 10)
+    if lookahead is not None:
+        lookahead.fill(driver, upcoming())
+    while True:
+        job = jobs_queue.pop()
+        if job is None:
+            break
+        href = job["url"]
+        RUN_METRICS.checked += 1
+        with job_context(href), step("job"):
+            detail = None
+            if lookahead is not None and not job["prefiltered"]:
+                detail = lookahead.read(driver, href)
+                lookahead.fill(driver, upcoming())
+            try:
+                outcome = RETRY.call(
+                    process_job, driver, wait, href, job["prefiltered"], job["posted_at"], detail,
+                    portal="naukri",
+                )
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                RUN_METRICS.failed += 1
+                log.error(f"[ERROR job] {href} -> {e}")
+                outcome = "failed"
+            # may hand back a fresh browser
+            driver = lifecycle.after_job()
+            wait = WebDriverWait(driver, 10)
+        if outcome == "quota":
+            return False
+        if visited is not None and outcome in FINAL_OUTCOMES:
+            visited.mark_done(href, outcome)
+        if outcome != "skipped":
+            job["stats"]["passed"] += 1
+        if outcome == "applied":
+            job["stats"]["applied"] += 1
+    return True
+
+
 def main():
-    load_dotenv()
     email = os.getenv("NAUKRI_EMAIL")
     password = os.getenv("NAUKRI_PASSWORD")
 
     if not email or not password:
         raise RuntimeError("Please set NAUKRI_EMAIL and NAUKRI_PASSWORD in .env")
 
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
+    # Chrome is recycled every RECYCLE_AFTER_JOBS jobs / above RECYCLE_RSS_MB
+    lifecycle = DriverLifecycle(start_driver, after_restart=on_driver_restart)
+    driver = lifecycle.start()
 
-    driver = webdriver.Chrome(options=chrome_options)
-    wait = WebDriverWait(driver, 10)
+    history = load_history()
+    plan = plan_crawl(
+        SEARCH_QUERIES, SEARCH_LOCATIONS, history,
+        CRAWL_BUDGET_PAGES, MAX_PAGES_PER_SEARCH,
+    )
+    log.info(f"Crawl plan: {plan}", extra={"plan": plan})
+    QUOTA.log_status("naukri")
 
     try:
         # LOGIN
-        driver.get("https://www.naukri.com/")
-        time.sleep(5)
-
-        try:
-            login_btn = driver.find_element(By.LINK_TEXT, "Login")
-            login_btn.click()
-            time.sleep(3)
-
-            email_input = driver.find_element(
-                By.XPATH,
-                "//input[contains(@placeholder,'Email') or contains(@placeholder,'Username')]",
-            )
-            pass_input = driver.find_element(
-                By.XPATH,
-                "//input[@type='password' or contains(@placeholder,'password')]",
-            )
-
-            email_input.send_keys(email)
-            pass_input.send_keys(password)
-            pass_input.send_keys(Keys.ENTER)
-            time.sleep(6)
-
-        except NoSuchElementException:
-            pass  # already logged in
+        with step("login"):
+            login(driver, email, password)
 
         # SEARCH
-        driver.get(SEARCH_URL)
-        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        time.sleep(3)
+        if USE_NETWORK_CAPTURE:
+            start_network_capture(driver)
+
+        # DISCOVER + APPLY, pipelined
+        # shared by all searches, so overlapping results are processed once;
+        # jobs finished on earlier runs are skipped too (seen_filter.py)
+        visited = VisitedJobs()
+        searches = []
+        try:
+            crawl_and_apply(lifecycle, plan, visited, searches)
+        except CircuitOpenError as e:
+            log.error(f"Stopping run: {e}")
 
-        print("[INFO] Search URL:", driver.current_url)
-        print("[INFO] Page title:", driver.title)
-
-        applied_count = 0
-        checked_count = 0
-
-        visited = set()
-
-        # LOOP PAGES
-        for page in range(1, 5):
-            time.sleep(4)
-            print(f"[INFO] On page {page}")
-
-            job_links_elems = driver.find_elements(
-                By.XPATH,
-                "//a[contains(@href,'/job-listings-') and @title]"
-            )
-
-            job_hrefs = []
-            for el in job_links_elems:
-                href = el.get_attribute("href")
-                if href and href not in visited:
-                    visited.add(href)
-                    job_hrefs.append(href)
-
-            print(f"[INFO] Found {len(job_hrefs)} job links on this page")
-
-            # OPEN JOBS
-            for href in job_hrefs:
-                checked_count += 1
-
-                try:
-                    driver.execute_script("window.open(arguments[0]);", href)
-                    driver.switch_to.window(driver.window_handles[-1])
-                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    time.sleep(3)
-
-                    body_text = driver.find_element(By.TAG_NAME, "body").text
-
-                    if not is_relevant_job(body_text):
-                        print(f"[SKIP] {href}")
-                        driver.close()
-                        driver.switch_to.window(driver.window_handles[0])
-                        continue
-
-                    if DRY_RUN:
-                        print(f"[MATCH] (dry run) {href}")
-                        driver.close()
-                        driver.switch_to.window(driver.window_handles[0])
-                        continue
-
-                    # APPLY LOGIC
-                    applied_here = False
-                    for xpath in [
-                        "//button[contains(.,'Apply')]",
-                        "//a[contains(.,'Apply')]",
-                    ]:
-                        try:
-                            btn = driver.find_element(By.XPATH, xpath)
-                            btn.click()
-                            time.sleep(5)
-
-                            after_text = driver.find_element(By.TAG_NAME, "body").text.lower()
-
-                            if "error while processing" in after_text:
-                                print(f"[NAUKRI ERROR] Apply failed for {href}")
-                                applied_here = False
-                            else:
-                                applied_here = True
-
-                            break
-
-                        except:
-                            continue
-
-                    if applied_here:
-                        applied_count += 1
-                        print(f"[APPLIED] {href}")
-                    else:
-                        print(f"[SKIP / FAILED APPLY] {href}")
-
-                    driver.close()
-                    driver.switch_to.window(driver.window_handles[0])
-
-                except Exception as e:
-                    print(f"[ERROR job] {href} -> {e}")
-                    if len(driver.window_handles) > 1:
-                        driver.close()
-                        driver.switch_to.window(driver.window_handles[0])
-                    continue
-
-            # NEXT PAGE
-            try:
-                next_btn = driver.find_element(
-                    By.XPATH,
-                    "//a[contains(.,'Next') or contains(@aria-label,'Next')]",
-                )
-                driver.execute_script("arguments[0].scrollIntoView(true);", next_btn)
-                time.sleep(1)
-                driver.execute_script("arguments[0].click();", next_btn)
-            except:
-                break
+        for query, location, page_stats in searches:
+            record_run(history, query, location, page_stats)
+        save_history(history)
 
-        print(f"[DONE] Checked {checked_count} jobs, applied to {applied_count} relevant ones.")
+        log.info(f"[DONE] Checked {RUN_METRICS.checked} jobs, applied to {RUN_METRICS.applied} relevant ones.")
 
     finally:
         time.sleep(3)
-        driver.quit()
+        lifecycle.quit()
+        ROUND_TRIPS.log_report()
+        DETAIL_BYTES.log_report()
+        SEEN_FILTER.log_report()
+        finish_run("job_update", log)
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+job_watch.py
+Watch mode: react to new Naukri postings within minutes.
+
+    python job_watch.py                  # poll forever, every WATCH_INTERVAL_SECONDS
+    python job_watch.py --polls 5        # stop after 5 polls
+    python job_watch.py --api            # poll the search API instead of the results page
+
+A full job_update run pays for Chrome startup, login and a multi-page crawl.
+Here one browser is started and logged in once and kept warm; every interval
+only page 1 of each configured search (job_update.SEARCH_QUERIES x
+SEARCH_LOCATIONS) is read, either by loading it in the warm tab or with an
+in-page fetch() of the search API that the results page itself calls (same
+origin, session cookies - no page render at all). The job IDs are diffed
+against the previous poll of that search, and only new IDs go through the
+usual filter + apply (job_update.process_job), freshest first.
+
+The first poll of each search is a baseline: what is already listed is
+remembered, not applied to (use job_update for the backlog).
+
+Every poll logs its cost (wall time, WebDriver round trips) and, for each
+new job, the detection latency - time from posting (when the listing says
+"N minutes/hours ago" or the API gives a timestamp) to the poll that saw it.
+"""
+
+import os
+import random
+import sys
+import time
+
+from dotenv import load_dotenv
+from selenium.webdriver.support.ui import WebDriverWait
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+import job_update
+from driver_batch import ROUND_TRIPS, step
+from driver_lifecycle import DriverLifecycle
+from freshness_queue import FreshnessQueue, posted_at_from_text
+from job_detail import DETAIL_BYTES
+from job_harvest import HARVEST_PAGE_IDLE_TICKS, harvest_cards
+from job_network import NAUKRI_API_HEADERS, naukri_search_api_url, parse_naukri_search
+from job_store import JOB_STORE, job_id_from_url
+from retry_policy import RETRY, CircuitOpenError
+from run_log import get_logger, job_context, finish_run, RUN_METRICS
+
+log = get_logger("job_watch")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+WATCH_INTERVAL_SECONDS = int(os.getenv("WATCH_INTERVAL_SECONDS", "180"))
+WATCH_JITTER_SECONDS = 30          # spread polls so they don't look like a timer
+
+FETCH_JSON_JS = """
+const url = arguments[0], headers = arguments[1];
+const done = arguments[arguments.length - 1];
+fetch(url, {headers: headers, credentials: "include"})
+    .then(r => r.ok ? r.json().then(body => done({ok: true, body: body}))
+                    : done({ok: false, error: "HTTP " + r.status}))
+    .catch(e => done({ok: false, error: String(e)}));
+"""
+
+
+def read_first_page_api(driver, query, location):
+    """Job records of page 1 via an in-page fetch() of the search API."""
+    result = driver.execute_async_script(
+        FETCH_JSON_JS, naukri_search_api_url(query, location), NAUKRI_API_HEADERS,
+    )
+    if not result.get("ok"):
+        raise RuntimeError(f"search API failed for {query!r}/{location!r}: {result.get('error')}")
+    return parse_naukri_search(result["body"])
+
+
+def read_first_page_tab(driver, query, location):
+    """Job records of page 1 from the rendered results page in the warm tab."""
+    driver.get(job_update.search_url(query, location))
+    records = []
+    for job_id, href, card_text in harvest_cards(
+        driver, job_update.SEARCH_CARD_SELECTOR, job_update.SEARCH_CARD_SELECTOR,
+        text_selector=job_update.SEARCH_TUPLE_SELECTOR, timeout=20, idle_ticks=HARVEST_PAGE_IDLE_TICKS,
+    ):
+        records.append({
+            "portal": "naukri", "job_id": job_id_from_url(href), "url": href,
+            "posted_at": posted_at_from_text(card_text),
+            "relevance": job_update.relevance_score(card_text),
+        })
+    return records
+
+
+class Watcher:
+    def __init__(self, lifecycle, use_api=False):
+        self.lifecycle = lifecycle
+        self.use_api = use_api
+        self.last_ids = {}     # (query, location) -> job ids seen on the previous poll
+        self.handled = set()   # job ids already sent through filter/apply this session
+        self.polls = 0
+
+    def poll(self):
+        """One pass over every search; returns the number of new jobs processed."""
+        self.polls += 1
+        driver = self.lifecycle.driver
+        started = time.time()
+        trips_before = sum(ROUND_TRIPS.calls.values())
+        fresh = FreshnessQueue()
+        new_count = 0
+
+        with step("watch_poll"):
+            for query in job_update.SEARCH_QUERIES:
+                for location in job_update.SEARCH_LOCATIONS:
+                    key = (query, location)
+                    try:
+                        if self.use_api:
+                            records = read_first_page_api(driver, query, location)
+                        else:
+                            records = read_first_page_tab(driver, query, location)
+                    except Exception as e:
+                        log.warning(f"[WATCH] poll of {query!r}/{location!r} failed: {e}")
+                        continue
+                    ids = {r["job_id"] for r in records}
+                    baseline = key not in self.last_ids
+                    new_ids = set() if baseline else ids - self.last_ids[key] - self.handled
+                    self.last_ids[key] = ids
+                    for record in records:
+                        if record["job_id"] in new_ids:
+                            self.queue_new(fresh, record, started)
+                            new_count += 1
+                    if baseline:
+                        self.handled |= ids
+
+        poll_seconds = time.time() - started
+        trips = sum(ROUND_TRIPS.calls.values()) - trips_before
+        log.info(
+            f"[WATCH] poll #{self.polls}: {new_count} new jobs, {poll_seconds:.1f}s, {trips} round trips",
+            extra={"poll": self.polls, "new_jobs": new_count,
+                   "poll_seconds": round(poll_seconds, 2), "round_trips": trips},
+        )
+        self.process(fresh)
+        return new_count
+
+    def queue_new(self, fresh, record, detected_at):
+        self.handled.add(record["job_id"])
+        posted_at = record.get("posted_at")
+        latency = f"{(detected_at - posted_at) / 60:.0f} min after posting" if posted_at else "posting time unknown"
+        log.info(f"[WATCH] new job detected ({latency}): {record['url']}",
+                 extra={"job": record["url"],
+                        "detection_latency_s": round(detected_at - posted_at) if posted_at else None})
+        prefiltered = False
+        if self.use_api:
+            # API records carry enough to filter without opening the page
+            if not job_update.is_relevant_record(record):
+                RUN_METRICS.checked += 1
+                JOB_STORE.record(record, "skipped", job_update._skip_reason.get(), script="job_watch")
+                return
+            prefiltered = True
+            record["relevance"] = job_update.relevance_score(f"{record.get('title', '')} {record.get('skills', '')}")
+        JOB_STORE.record(record)
+        fresh.push({"url": record["url"], "prefiltered": prefiltered, "posted_at": posted_at},
+                   posted_at, record.get("relevance", 0))
+
+    def process(self, fresh):
+        driver = self.lifecycle.driver
+        wait = WebDriverWait(driver, 10)
+        while fresh:
+            job = fresh.pop()
+            RUN_METRICS.checked += 1
+            with job_context(job["url"]), step("job"):
+                try:
+                    outcome = RETRY.call(
+                        job_update.process_job, driver, wait, job["url"], job["prefiltered"],
+                        job["posted_at"], portal="naukri",
+                    )
+                except CircuitOpenError:
+                    raise
+                except Exception as e:
+                    RUN_METRICS.failed += 1
+                    log.error(f"[ERROR job] {job['url']} -> {e}")
+                    outcome = "failed"
+                driver = self.lifecycle.after_job()
+                wait = WebDriverWait(driver, 10)
+            if outcome == "quota":
+                log.info(f"[WATCH] apply quota used up, {len(fresh)} new jobs left for the next window")
+                break
+
+
+def main(argv):
+    email = os.getenv("NAUKRI_EMAIL")
+    password = os.getenv("NAUKRI_PASSWORD")
+    if not email or not password:
+        raise RuntimeError("Please set NAUKRI_EMAIL and NAUKRI_PASSWORD in .env")
+
+    max_polls = int(argv[argv.index("--polls") + 1]) if "--polls" in argv else None
+    lifecycle = DriverLifecycle(job_update.start_driver, after_restart=job_update.on_driver_restart)
+    driver = lifecycle.start()
+    try:
+        with step("login"):
+            job_update.login(driver, email, password)
+        watcher = Watcher(lifecycle, use_api="--api" in argv)
+        while True:
+            try:
+                watcher.poll()
+            except CircuitOpenError as e:
+                log.error(f"[WATCH] backing off: {e}")
+            if max_polls is not None and watcher.polls >= max_polls:
+                break
+            time.sleep(WATCH_INTERVAL_SECONDS + random.uniform(0, WATCH_JITTER_SECONDS))
+    except KeyboardInterrupt:
+        log.info("[WATCH] stopped.")
+    finally:
+        lifecycle.quit()
+        ROUND_TRIPS.log_report()
+        DETAIL_BYTES.log_report()
+        finish_run("job_watch", log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,156 @@
+"""
+page_prefetch.py
+Load the next Naukri results page in the background while jobs are processed.
+
+Result pages are addressed by URL (results_page_url(): page N of a search is
+".../<query>-jobs-in-<location>-N"), so nothing has to be clicked to move on,
+and the next page can start loading before the current page's jobs are done.
+
+PagePrefetcher.start() returns immediately after kicking off the load from
+the results tab (tab 0):
+  - DOM mode: a hidden window (like driver_batch.open_extract_close) loads
+    the page URL;
+  - API mode (job_update.USE_NETWORK_CAPTURE): an in-page fetch() of the
+    search API for that page number.
+Meanwhile the driver is free to filter/apply. collect() later waits - in the
+page, one round trip - for the load to finish and returns the page's job
+cards (DOM: [(href, card_text)]) or API records (parse_naukri_search), then
+closes the window. It returns None whenever the prefetch can't be used (popup
+blocked, window closed, browser recycled, timeout); the caller then loads
+the page in tab 0 as before.
+"""
+
+from cdp_direct import hot_path
+from driver_batch import ensure_script_timeout
+from job_network import NAUKRI_API_HEADERS, naukri_search_api_url, parse_naukri_search
+from run_log import get_logger
+
+log = get_logger("page_prefetch")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+PREFETCH_TIMEOUT_SECONDS = 20
+PREFETCH_EMPTY_AFTER_MS = 4000     # page loaded this long with no cards => no results
+
+START_JS = """
+const key = arguments[0], url = arguments[1], apiHeaders = arguments[2];
+const slots = window.__jobbotPrefetch = window.__jobbotPrefetch || {};
+const old = slots[key];
+if (old && old.win && !old.win.closed) old.win.close();
+if (apiHeaders) {
+    const slot = slots[key] = {done: false};
+    fetch(url, {headers: apiHeaders, credentials: "include"})
+        .then(r => r.ok ? r.json().then(body => { slot.body = body; slot.done = true; })
+                        : (slot.error = "HTTP " + r.status, slot.done = true))
+        .catch(e => { slot.error = String(e); slot.done = true; });
+    return true;
+}
+const win = window.open(url, "_blank", "noopener=no,width=10,height=10");
+slots[key] = {win: win};
+return !!win;
+"""
+
+COLLECT_JS = """
+const key = arguments[0], cardSel = arguments[1], tupleSel = arguments[2];
+const timeoutMs = arguments[3], emptyAfterMs = arguments[4];
+const done = arguments[arguments.length - 1];
+const slots = window.__jobbotPrefetch || {};
+const slot = slots[key];
+if (!slot) { done({ok: false, error: "not started"}); return; }
+const started = Date.now();
+function finish(result) {
+    if (slot.win && !slot.win.closed) slot.win.close();
+    delete slots[key];
+    done(result);
+}
+(function poll() {
+    try {
+        if (!slot.win) {
+            if (slot.done) { finish(slot.error ? {ok: false, error: slot.error} : {ok: true, body: slot.body}); return; }
+        } else if (slot.win.closed) {
+            finish({ok: false, error: "window closed"}); return;
+        } else {
+            const doc = slot.win.document;
+            if (doc && doc.readyState === "complete" && slot.win.location.href !== "about:blank") {
+                slot.readyAt = slot.readyAt || Date.now();
+                const cards = [], seen = new Set();
+                for (const a of doc.querySelectorAll(cardSel)) {
+                    if (!a.href || seen.has(a.href)) continue;
+                    seen.add(a.href);
+                    const box = a.closest(tupleSel) || a;
+                    cards.push([a.href, (box.innerText || "").slice(0, 600)]);
+                }
+                if (cards.length || Date.now() - slot.readyAt > emptyAfterMs) {
+                    finish({ok: true, cards: cards}); return;
+                }
+            }
+        }
+    } catch (e) {
+        finish({ok: false, error: "cross-origin: " + e.message}); return;
+    }
+    if (Date.now() - started > timeoutMs) { finish({ok: false, error: "timeout"}); return; }
+    setTimeout(poll, 150);
+})();
+"""
+
+
+def results_page_url(query, location, page=1):
+    """URL of result page `page` of a Naukri search (page 1 has no suffix)."""
+    url = f"https://www.naukri.com/{query.replace(' ', '-')}-jobs-in-{location.replace(' ', '-')}"
+    return url if page <= 1 else f"{url}-{page}"
+
+
+class PagePrefetcher:
+    def __init__(self, card_selector, tuple_selector, use_api=False):
+        self.card_selector = card_selector
+        self.tuple_selector = tuple_selector
+        self.use_api = use_api
+        self.started = set()   # keys started and not collected yet
+
+    @staticmethod
+    def key(query, location, page):
+        return f"{query}|{location}|{page}"
+
+    def start(self, driver, query, location, page):
+        """Begin loading a results page in the background; False if it couldn't start."""
+        key = self.key(query, location, page)
+        if self.use_api:
+            args = (naukri_search_api_url(query, location, page), NAUKRI_API_HEADERS)
+        else:
+            args = (results_page_url(query, location, page), None)
+        try:
+            ok = hot_path(driver).execute_script(START_JS, key, *args)
+        except Exception as e:
+            log.debug(f"[PREFETCH] could not start {key}: {e}")
+            return False
+        if ok:
+            self.started.add(key)
+            log.debug(f"[PREFETCH] loading {key} in the background")
+        return bool(ok)
+
+    def collect(self, driver, query, location, page, timeout=PREFETCH_TIMEOUT_SECONDS):
+        """
+        The prefetched page: [(href, card_text)] in DOM mode, API records in API
+        mode, or None if there is nothing usable (caller loads the page itself).
+        """
+        key = self.key(query, location, page)
+        if key not in self.started:
+            return None
+        self.started.discard(key)
+        driver = hot_path(driver)
+        ensure_script_timeout(driver, timeout + 5)
+        try:
+            result = driver.execute_async_script(
+                COLLECT_JS, key, self.card_selector, self.tuple_selector,
+                int(timeout * 1000), PREFETCH_EMPTY_AFTER_MS,
+            )
+        except Exception as e:
+            log.debug(f"[PREFETCH] collect of {key} failed: {e}")
+            return None
+        if not result.get("ok"):
+            log.info(f"[PREFETCH] {key} not usable ({result.get('error')}), loading it directly")
+            return None
+        if self.use_api:
+            return parse_naukri_search(result["body"])
+        return [tuple(card) for card in result["cards"]]
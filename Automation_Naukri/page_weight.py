@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+page_weight.py
+Profile what each portal page costs to load, and block what we don't need.
+
+    python page_weight.py profile naukri        # profile, propose, validate, save
+    python page_weight.py profile hirist --no-validate
+    python page_weight.py show                  # saved blocklists
+
+Profiling walks one portal's flow - login, profile, listing, job detail -
+in a Chrome with the DevTools performance log on, and adds up, per page type,
+the bytes / requests / load time each domain and resource type contributed
+(Network.requestWillBeSent / responseReceived / loadingFinished events).
+
+From that it proposes URL patterns to block: heavy third-party domains, and
+images / fonts / media from any domain. The proposal is validated by running
+the same flow again with Network.setBlockedURLs set and checking that the
+controls we depend on still work - login, the profile's Save (the editor is
+opened, nothing is saved), result cards, and the Apply button (not clicked).
+If the full list breaks a check, it is bisected down to the patterns that
+don't. The validated list is written to RESOURCE_BLOCKLIST_FILE, and
+apply_blocklist() installs it in every browser the scripts start.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from job_network import enable_network_capture
+from run_log import get_logger
+
+log = get_logger("page_weight")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+RESOURCE_BLOCKLIST_FILE = os.getenv("RESOURCE_BLOCKLIST_FILE", "resource_blocklist.json")
+USE_RESOURCE_BLOCKLIST = os.getenv("USE_RESOURCE_BLOCKLIST", "true").lower() == "true"
+
+FIRST_PARTY = {
+    "naukri": ("naukri.com", "naukimg.com"),
+    "hirist": ("hirist.tech", "hirist.com"),
+}
+# Never proposed: login captchas and the like live here
+NEVER_BLOCK = ("recaptcha", "gstatic.com", "google.com", "hcaptcha", "cloudflare")
+
+# A third-party domain is proposed when it adds this much to any page type
+PROPOSE_MIN_BYTES = 50 * 1024
+PROPOSE_MIN_REQUESTS = 5
+PROPOSE_MIN_SECONDS = 1.0
+
+# Resource types blocked by file extension on every domain, first party included
+BLOCK_TYPE_EXTENSIONS = {
+    "Image": (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico"),
+    "Font": (".woff", ".woff2", ".ttf", ".otf"),
+    "Media": (".mp4", ".webm", ".mp3"),
+}
+
+SETTLE_SECONDS = 3   # let late requests of a page land before it is tallied
+
+HAS_CONTROL_JS = """
+const rx = new RegExp(arguments[0], "i");
+return Array.from(document.querySelectorAll("button, a, input[type=submit]")).some(el => {
+    const r = el.getBoundingClientRect();
+    const text = (el.innerText || el.value || "").trim();
+    return r.width > 0 && r.height > 0 && !el.disabled && rx.test(text);
+});
+"""
+
+NAV_TIMING_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+return nav ? Math.round(nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.duration) : null;
+"""
+
+
+def registrable_domain(host):
+    parts = (host or "").split(".")
+    if len(parts) >= 3 and parts[-2] in ("co", "com", "net", "org") and len(parts[-1]) == 2:
+        return ".".join(parts[-3:])
+    return ".".join(parts[-2:])
+
+
+# -----------------------------
+# Installing a saved blocklist
+# -----------------------------
+_saved = None
+
+
+def load_blocklists(path=RESOURCE_BLOCKLIST_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def apply_blocklist(driver, portal):
+    """Block the saved, validated patterns for `portal` in this browser (no-op if none)."""
+    global _saved
+    if not USE_RESOURCE_BLOCKLIST:
+        return driver
+    if _saved is None:
+        _saved = load_blocklists()
+    patterns = (_saved.get(portal) or {}).get("patterns") or []
+    if patterns:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            log.info(f"[BLOCKLIST] {portal}: blocking {len(patterns)} URL patterns")
+        except Exception as e:
+            log.warning(f"[BLOCKLIST] could not install for {portal}: {e}")
+    return driver
+
+
+# -----------------------------
+# Profiling
+# -----------------------------
+class PageWeight:
+    """Per page type: (domain, resource type) -> bytes / requests / seconds, plus load times."""
+
+    def __init__(self):
+        self.cells = defaultdict(lambda: {"bytes": 0, "requests": 0, "seconds": 0.0, "blocked": 0})
+        self.load_ms = defaultdict(list)
+
+    def add_events(self, page_type, entries):
+        requests = {}
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = msg.get("method"), msg.get("params", {})
+            rid = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                requests[rid] = {
+                    "url": params.get("request", {}).get("url", ""),
+                    "type": params.get("type", "Other"),
+                    "start": params.get("timestamp", 0.0),
+                }
+            elif method == "Network.responseReceived" and rid in requests:
+                requests[rid]["type"] = params.get("type", requests[rid]["type"])
+            elif method in ("Network.loadingFinished", "Network.loadingFailed") and rid in requests:
+                req = requests.pop(rid)
+                if req["url"].startswith("data:"):
+                    continue
+                cell = self.cells[(page_type, registrable_domain(urlparse(req["url"]).hostname), req["type"])]
+                cell["requests"] += 1
+                cell["seconds"] += max(0.0, params.get("timestamp", req["start"]) - req["start"])
+                if method == "Network.loadingFinished":
+                    cell["bytes"] += int(params.get("encodedDataLength", 0))
+                elif params.get("blockedReason"):
+                    cell["blocked"] += 1
+
+    def page_totals(self):
+        totals = defaultdict(lambda: {"bytes": 0, "requests": 0, "blocked": 0})
+        for (page_type, _, _), cell in self.cells.items():
+            for k in totals[page_type]:
+                totals[page_type][k] += cell[k]
+        for page_type, values in self.load_ms.items():
+            totals[page_type]["load_ms"] = round(sum(values) / len(values))
+        return dict(totals)
+
+    def report(self, top=12):
+        rows = sorted(self.cells.items(), key=lambda kv: -kv[1]["bytes"])[:top]
+        lines = [f"{'page':<11} {'domain':<28} {'type':<11} {'KB':>8} {'reqs':>5} {'sec':>6}"]
+        for (page_type, domain, rtype), c in rows:
+            lines.append(
+                f"{page_type:<11} {domain:<28} {rtype:<11} {c['bytes'] / 1024:>8.1f} {c['requests']:>5} {c['seconds']:>6.1f}"
+            )
+        return "\n".join(lines)
+
+
+def start_profiling_driver(blocked=None):
+    chrome_options = Options()
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-notifications")
+    enable_network_capture(chrome_options)
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.implicitly_wait(2)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})  # weigh real transfers
+    if blocked:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked)})
+    driver.get_log("performance")
+    return driver
+
+
+def has_control(driver, pattern):
+    return bool(driver.execute_script(HAS_CONTROL_JS, pattern))
+
+
+# -----------------------------
+# Flows: (page type, action) - an action drives the page and returns None when
+# the page works, or a string saying what broke
+# -----------------------------
+def naukri_flow():
+    import job_update
+    from job_harvest import HARVEST_PAGE_IDLE_TICKS, harvest_cards
+    from portal_selectors import find
+    from portals import NaukriAdapter
+
+    ctx = {}
+
+    def login(driver):
+        driver.get("https://www.naukri.com/nlogin/login")
+        time.sleep(3)
+        if not driver.execute_script("return !!document.querySelector('input[type=password]')"):
+            return "login form has no password field"
+        NaukriAdapter().login(driver)
+        return None
+
+    def profile(driver):
+        driver.get("https://www.naukri.com/mnjuser/profile")
+        time.sleep(4)
+        edit = find(driver, "naukri", "resume_headline_edit", scroll=True)
+        if edit is None:
+            return "resume headline edit button missing (not logged in?)"
+        driver.execute_script("arguments[0].click();", edit)
+        time.sleep(2)
+        if not has_control(driver, r"^save$"):
+            return "Save button missing in the headline editor"
+        return None  # editor is left unsaved; the next navigation discards it
+
+    def listing(driver):
+        driver.get(job_update.search_url(job_update.SEARCH_QUERIES[0], job_update.SEARCH_LOCATIONS[0]))
+        cards = harvest_cards(driver, job_update.SEARCH_CARD_SELECTOR, job_update.SEARCH_CARD_SELECTOR,
+                              target=5, timeout=20, idle_ticks=HARVEST_PAGE_IDLE_TICKS)
+        if not cards:
+            return "no result cards"
+        ctx["job_url"] = cards[0][1]
+        return None
+
+    def job_detail(driver):
+        if "job_url" not in ctx:
+            return "no job to open"
+        driver.get(ctx["job_url"])
+        time.sleep(3)
+        if not (find(driver, "naukri", "apply_button") or find(driver, "naukri", "already_applied")):
+            return "Apply button missing"
+        return None
+
+    return [("login", login), ("profile", profile), ("listing", listing), ("job_detail", job_detail)]
+
+
+def hirist_flow():
+    from job_harvest import harvest_cards, HIRIST_CARD_SELECTOR, HIRIST_LINK_SELECTOR
+    from portal_selectors import find
+    from portals import HiristAdapter
+
+    ctx = {}
+
+    def login(driver):
+        driver.get("https://www.hirist.tech/")
+        time.sleep(3)
+        if find(driver, "hirist", "jobseeker_login") is None:
+            return "Jobseeker Login button missing"
+        return None if HiristAdapter().login(driver) else "login did not complete"
+
+    def listing(driver):
+        driver.get(os.getenv("HIRIST_SEARCH_URL", "https://www.hirist.tech/"))
+        cards = [h for _, h in harvest_cards(driver, HIRIST_CARD_SELECTOR, HIRIST_LINK_SELECTOR,
+                                             target=5, timeout=20) if "hirist.tech" in h]
+        if not cards:
+            return "no job links"
+        ctx["job_url"] = cards[0]
+        return None
+
+    def job_detail(driver):
+        if "job_url" not in ctx:
+            return "no job to open"
+        driver.get(ctx["job_url"])
+        time.sleep(3)
+        return None if has_control(driver, r"apply") else "Apply button missing"
+
+    return [("login", login), ("listing", listing), ("job_detail", job_detail)]
+
+
+FLOWS = {"naukri": naukri_flow, "hirist": hirist_flow}
+
+
+def run_flow(portal, blocked=None):
+    """Run the portal flow once. Returns (PageWeight, [failures])."""
+    weight, failures = PageWeight(), []
+    driver = start_profiling_driver(blocked)
+    try:
+        for page_type, action in FLOWS[portal]():
+            try:
+                problem = action(driver)
+            except Exception as e:
+                problem = f"{type(e).__name__}: {e}"
+            time.sleep(SETTLE_SECONDS)
+            load_ms = driver.execute_script(NAV_TIMING_JS)
+            if load_ms:
+                weight.load_ms[page_type].append(load_ms)
+            weight.add_events(page_type, driver.get_log("performance"))
+            if problem:
+                failures.append(f"{page_type}: {problem}")
+    finally:
+        driver.quit()
+    return weight, failures
+
+
+# -----------------------------
+# Proposal + validation
+# -----------------------------
+def propose_blocklist(portal, weight):
+    """Rules worth blocking, heaviest first: [(label, [URL pattern, ...]), ...]."""
+    first_party = FIRST_PARTY[portal]
+    domains = defaultdict(lambda: {"bytes": 0, "requests": 0, "seconds": 0.0})
+    types = set()
+    for (page_type, domain, rtype), cell in weight.cells.items():
+        if rtype in BLOCK_TYPE_EXTENSIONS and cell["bytes"]:
+            types.add(rtype)
+        if domain in first_party or any(n in domain for n in NEVER_BLOCK):
+            continue
+        d = domains[(page_type, domain)]
+        for k in d:
+            d[k] += cell[k]
+
+    heavy = {}
+    for (page_type, domain), d in domains.items():
+        if (d["bytes"] >= PROPOSE_MIN_BYTES or d["requests"] >= PROPOSE_MIN_REQUESTS
+                or d["seconds"] >= PROPOSE_MIN_SECONDS):
+            heavy[domain] = max(heavy.get(domain, 0), d["bytes"])
+    rules = [(domain, [f"*://*{domain}/*"]) for domain in sorted(heavy, key=heavy.get, reverse=True)]
+    for rtype in sorted(types):
+        # one rule per resource type: its extensions stand or fall together
+        exts = BLOCK_TYPE_EXTENSIONS[rtype]
+        rules.append((rtype, [f"*{ext}" for ext in exts] + [f"*{ext}?*" for ext in exts]))
+    return rules
+
+
+def flatten(rules):
+    return [pattern for _, patterns in rules for pattern in patterns]
+
+
+def validate(portal, rules, runs):
+    weight, failures = run_flow(portal, blocked=flatten(rules))
+    runs.append(([label for label, _ in rules], failures))
+    log.info(f"[BLOCKLIST] validation with {len(rules)} rules: "
+             f"{'OK' if not failures else '; '.join(failures)}")
+    return weight if not failures else None
+
+
+def shrink(portal, accepted, candidates, runs):
+    """Largest-ish subset of `candidates` that still validates, by bisection.
+
+    One flow run when everything passes; roughly 2 * log2(n) more per rule that
+    breaks something.
+    """
+    if not candidates:
+        return accepted, None
+    weight = validate(portal, accepted + candidates, runs)
+    if weight is not None:
+        return accepted + candidates, weight
+    if len(candidates) == 1:
+        log.info(f"[BLOCKLIST] dropping {candidates[0][0]}")
+        return accepted, None
+    mid = len(candidates) // 2
+    accepted, _ = shrink(portal, accepted, candidates[:mid], runs)
+    return shrink(portal, accepted, candidates[mid:], runs)
+
+
+def save_blocklist(portal, patterns, before, after, path=RESOURCE_BLOCKLIST_FILE):
+    data = load_blocklists(path)
+    data[portal] = {
+        "patterns": patterns,
+        "validated_at": datetime.now().isoformat(timespec="seconds"),
+        "before": before,
+        "after": after,
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def profile(portal, do_validate=True):
+    log.info(f"[PROFILE] {portal}: baseline run")
+    baseline, failures = run_flow(portal)
+    print(baseline.report())
+    if failures:
+        log.error(f"[PROFILE] baseline flow is broken, not proposing anything: {failures}")
+        return 1
+    rules = propose_blocklist(portal, baseline)
+    print(f"\nproposed {len(rules)} rules:\n  " + "\n  ".join(
+        f"{label}: {' '.join(patterns)}" for label, patterns in rules))
+    if not do_validate or not rules:
+        return 0
+
+    runs = []
+    accepted, weight = shrink(portal, [], rules, runs)
+    if weight is None and accepted:
+        weight = validate(portal, accepted, runs)
+    if not accepted or weight is None:
+        log.warning(f"[PROFILE] no rule survived validation ({len(runs)} runs)")
+        return 1
+
+    before, after = baseline.page_totals(), weight.page_totals()
+    print(f"\nvalidated {len(accepted)}/{len(rules)} rules in {len(runs)} runs: "
+          f"{', '.join(label for label, _ in accepted)}")
+    for page_type in before:
+        b, a = before[page_type], after.get(page_type, {})
+        print(f"  {page_type:<11} {b['bytes'] / 1024:>8.0f} KB -> {a.get('bytes', 0) / 1024:>8.0f} KB, "
+              f"load {b.get('load_ms', '?')} ms -> {a.get('load_ms', '?')} ms")
+    save_blocklist(portal, flatten(accepted), before, after)
+    log.info(f"[PROFILE] saved {len(accepted)} rules for {portal} to {RESOURCE_BLOCKLIST_FILE}")
+    return 0
+
+
+def main(argv):
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    if args[:1] == ["show"]:
+        print(json.dumps(load_blocklists(), indent=2))
+        return 0
+    if len(args) == 2 and args[0] == "profile" and args[1] in FLOWS:
+        return profile(args[1], do_validate="--no-validate" not in argv)
+    print(f"usage: python page_weight.py profile <{'|'.join(FLOWS)}> [--no-validate] | show")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,148 @@
+"""
+portal_selectors.py
+Per-portal registry of scoped selectors for the hot-path element lookups.
+
+Expressions like //*[contains(translate(., 'APPLIED', 'applied'),'applied')]
+walk every node of the document and compare its whole descendant text, so
+they are slow on long job pages and match anything that merely *mentions*
+the word (a JD asking for "applied ML", a footer link...). A registry entry
+instead anchors the query to a small container - the job header, the apply
+container, the profile card - and matches the control's own text exactly.
+
+An entry is a list of Selector alternatives tried in order, all inside ONE
+execute_script call:
+
+    Selector(css, text=None, scope=None, anchor=None, anchor_text=None, up=None)
+
+    scope        CSS of the container(s) to search in (default: document)
+    anchor/_text optional: find a heading by CSS + text inside the scope,
+                 then search from anchor.closest(up)
+    css          the candidates
+    text         regex the candidate's normalized text must match (case-insensitive)
+
+Regexes are compiled once per page and cached on window.__portalSelectors.
+
+    find(driver, "naukri", "already_applied")           -> WebElement | None
+    find_all(driver, "hirist", "jobseeker_login")       -> [WebElement]
+
+selector_bench.py compares these entries with the XPaths they replaced over
+the saved pages in fixtures/pages/.
+"""
+
+
+class Selector:
+    def __init__(self, css, text=None, scope=None, anchor=None, anchor_text=None, up=None):
+        self.css = css
+        self.text = text
+        self.scope = scope
+        self.anchor = anchor
+        self.anchor_text = anchor_text
+        self.up = up
+
+    def to_js(self):
+        return {
+            "css": self.css, "text": self.text, "scope": self.scope,
+            "anchor": self.anchor, "anchorText": self.anchor_text, "up": self.up,
+        }
+
+
+# Naukri renders hashed class names (styles_apply-button__uJI3A), hence the
+# [class*=...] matches on the stable part.
+_NAUKRI_APPLY_SCOPE = (
+    "[class*='apply-button-container'], [class*='job-header'], "
+    "[class*='jd-header'], [class*='jobTupleHeader']"
+)
+
+REGISTRY = {
+    "naukri": {
+        "already_applied": [
+            Selector("#already-applied, [class*='already-applied']", scope=_NAUKRI_APPLY_SCOPE),
+            Selector("button, span, a", text=r"^(already\s+)?applied$", scope=_NAUKRI_APPLY_SCOPE),
+        ],
+        "apply_button": [
+            Selector("#apply-button, #company-site-button", scope=_NAUKRI_APPLY_SCOPE),
+            Selector("button, a", text=r"^apply( now| on company site)?$", scope=_NAUKRI_APPLY_SCOPE),
+        ],
+        "resume_headline_edit": [
+            Selector("span.edit, [class*='edit']", scope="#lazyResumeHead, [class*='resumeHeadline']"),
+            Selector(
+                "span.edit, [class*='edit'], [aria-label*='edit' i]",
+                anchor=".widgetTitle, h1, h2, h3, span, div",
+                anchor_text=r"^resume headline$",
+                up=".card, section, .widgetHead, [class*='widget']",
+            ),
+        ],
+        "resume_headline_editor": [
+            Selector("#resumeHeadlineTxt"),
+            Selector(
+                "textarea, [contenteditable='true'], .ql-editor",
+                scope="[class*='resumeHeadline'], [role='dialog'], .lightbox, form[name*='resume' i]",
+            ),
+        ],
+    },
+    "hirist": {
+        "already_applied": [
+            Selector("button", text=r"^(already\s+)?applied$"),
+        ],
+        "jobseeker_login": [
+            Selector("button, a", text=r"^jobseeker( login)?$", scope="header, nav, [class*='header']"),
+            Selector("button, a", text=r"^jobseeker login$"),
+        ],
+    },
+}
+
+FIND_JS = """
+const alternatives = arguments[0], all = arguments[1], scroll = arguments[2];
+const cache = window.__portalSelectors || (window.__portalSelectors = {});
+const rx = src => src && (cache[src] || (cache[src] = new RegExp(src, "i")));
+const norm = el => (el.innerText || el.textContent || "").replace(/\\s+/g, " ").trim();
+
+for (const alt of alternatives) {
+    let roots = alt.scope ? Array.from(document.querySelectorAll(alt.scope)) : [document];
+    if (alt.anchor) {
+        const anchorRx = rx(alt.anchorText);
+        const lifted = [];
+        for (const root of roots)
+            for (const a of root.querySelectorAll(alt.anchor))
+                if (!anchorRx || anchorRx.test(norm(a)))
+                    lifted.push((alt.up && a.closest(alt.up)) || a.parentElement);
+        roots = lifted;
+    }
+    const textRx = rx(alt.text);
+    const found = [];
+    for (const root of roots) {
+        for (const el of root.querySelectorAll(alt.css)) {
+            if (textRx && !textRx.test(norm(el))) continue;
+            if (!found.includes(el)) found.push(el);
+            if (!all) break;
+        }
+        if (found.length && !all) break;
+    }
+    if (found.length) {
+        if (scroll) found[0].scrollIntoView({block: "center"});
+        return all ? found : found[0];
+    }
+}
+return all ? [] : null;
+"""
+
+
+_COMPILED = {}
+
+
+def compiled(portal, key):
+    """The JSON-ready alternatives of one registry entry (built once, reused)."""
+    cached = _COMPILED.get((portal, key))
+    if cached is None:
+        cached = _COMPILED[(portal, key)] = [s.to_js() for s in REGISTRY[portal][key]]
+    return cached
+
+
+def find(driver, portal, key, scroll=False):
+    """First element for a registry entry, or None - one round trip."""
+    return driver.execute_script(FIND_JS, compiled(portal, key), False, scroll)
+
+
+def find_all(driver, portal, key):
+    """Every element matched by the first alternative that matches anything."""
+    return driver.execute_script(FIND_JS, compiled(portal, key), True, False)
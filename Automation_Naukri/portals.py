@@ -0,0 +1,158 @@
+"""
+portals.py
+Portal adapters: one object per job site exposing the same steps, so a single
+engine (job_engine.py) can drive all of them.
+
+Every adapter implements:
+    login(driver)                -> bool
+    discover(driver)             -> [job dict, ...]  ({"job_id", "url", ...})
+    extract(driver, job)         -> header + key details + JD text of the job page
+                                    (job_detail.py; page is left open)
+    is_applied(driver, job)      -> bool, checked on the open job page
+    is_relevant(job, detail)     -> bool
+    apply(driver, job)           -> bool
+
+plus the per-portal knobs name / max_jobs / concurrency / min_apply_interval.
+
+The adapters reuse the functions of the single-portal scripts; the Hirist
+script checks its credentials at import time, so it is imported lazily.
+"""
+
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from driver_batch import instrument
+from job_detail import extract_detail
+from job_network import enable_network_capture
+from page_weight import apply_blocklist
+from portal_selectors import find
+from run_log import get_logger
+
+log = get_logger("portals")
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class PortalAdapter:
+    name = "portal"
+    max_jobs = 5
+    concurrency = 1              # browsers working this portal's queue
+    min_apply_interval = 10.0    # seconds between two applies on this portal
+
+    def start_driver(self):
+        chrome_options = Options()
+        chrome_options.add_argument("--start-maximized")
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_argument("--disable-infobars")
+        chrome_options.add_argument("--disable-extensions")
+        enable_network_capture(chrome_options)  # apply confirmation reads the performance log
+        driver = instrument(webdriver.Chrome(options=chrome_options))
+        driver.implicitly_wait(5)
+        return apply_blocklist(driver, self.name)
+
+    def login(self, driver):
+        raise NotImplementedError
+
+    def discover(self, driver):
+        raise NotImplementedError
+
+    def extract(self, driver, job):
+        driver.get(job["url"])
+        time.sleep(2)
+        return extract_detail(driver, self.name).text
+
+    def is_applied(self, driver, job):
+        return find(driver, self.name, "already_applied") is not None
+
+    def is_relevant(self, job, detail):
+        return True
+
+    def apply(self, driver, job):
+        raise NotImplementedError
+
+
+class NaukriAdapter(PortalAdapter):
+    name = "naukri"
+
+    def __init__(self):
+        self.max_jobs = _env_int("MAX_JOBS_PER_RUN", 5)
+        self.concurrency = _env_int("NAUKRI_CONCURRENCY", 1)
+        self.min_apply_interval = _env_float("NAUKRI_MIN_APPLY_INTERVAL", 15.0)
+
+    def login(self, driver):
+        import job_update
+        email, password = os.getenv("NAUKRI_EMAIL"), os.getenv("NAUKRI_PASSWORD")
+        if not email or not password:
+            raise RuntimeError("Please set NAUKRI_EMAIL and NAUKRI_PASSWORD in .env")
+        job_update.login(driver, email, password)
+        return True
+
+    def discover(self, driver):
+        import job_update
+        from search_planner import load_history, plan_crawl
+        from seen_filter import VisitedJobs
+
+        plan = plan_crawl(
+            job_update.SEARCH_QUERIES, job_update.SEARCH_LOCATIONS, load_history(),
+            job_update.CRAWL_BUDGET_PAGES, job_update.MAX_PAGES_PER_SEARCH,
+        )
+        visited, jobs = VisitedJobs(seen=None), []
+        for query, location, pages in plan:
+            for page in range(1, pages + 1):
+                page_jobs, found = job_update.load_results_page(driver, query, location, page, visited)
+                jobs.extend(dict(job, job_id=job["url"]) for job in page_jobs)
+                if not found:
+                    break
+        return jobs
+
+    def is_relevant(self, job, detail):
+        import job_update
+        return job.get("prefiltered") or job_update.is_relevant_job(detail)
+
+    def apply(self, driver, job):
+        import job_update
+        return bool(job_update.click_apply(driver, job["url"]))
+
+
+class HiristAdapter(PortalAdapter):
+    name = "hirist"
+
+    def __init__(self):
+        self.max_jobs = _env_int("HIRIST_MAX_JOBS_PER_RUN", 5)
+        self.concurrency = _env_int("HIRIST_CONCURRENCY", 1)
+        self.min_apply_interval = _env_float("HIRIST_MIN_APPLY_INTERVAL", 10.0)
+
+    def login(self, driver):
+        import job_hirish
+        ok = job_hirish.login(driver)
+        time.sleep(4)
+        return ok
+
+    def discover(self, driver):
+        import job_hirish
+        return [{"job_id": href, "url": href} for href in job_hirish.collect_job_links(driver)]
+
+    def apply(self, driver, job):
+        import job_hirish
+        return job_hirish.click_apply_button(driver)
+
+
+ADAPTERS = {
+    "naukri": NaukriAdapter,
+    "hirist": HiristAdapter,
+}
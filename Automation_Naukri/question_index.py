@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+question_index.py
+BM25 search over the interview-question corpus (DevOps_Tools_Interview_Questions/).
+
+    python question_index.py build                      # (re)index files that changed
+    python question_index.py query "argocd rollback" [-n 10]
+    python question_index.py prep [--days 7] [-n 5] [--out prep_sheet.md]
+
+The corpus is split into one document per question: "### N. ..." headings in
+the tool guides, numbered / "Question N:" lines in the scraped argocd notes,
+short question-word lines in notes that number nothing.
+A document is the question (counted twice, so a title hit outranks a passing
+mention), its answer, its "##" section and the tool it belongs to.
+
+The index (QUESTION_INDEX_FILE, JSON) holds the inverted postings, the
+document table and, per source file, its size/mtime/hash and term counts.
+Every load stats the corpus: files whose size or mtime changed are re-hashed,
+and only files whose content really changed are re-parsed; the postings are
+then regenerated from the stored term counts. An unchanged corpus costs one
+stat per file.
+
+`prep` turns the postings job_update applied to (job_store: verdict
+"applied", skills from the search API or the job page's key-details block,
+else the title) into a markdown prep sheet: per application, the best
+matching questions, at most QUESTIONS_PER_TOOL about any one tool.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from run_log import get_logger
+
+log = get_logger("question_index")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+QUESTIONS_DIR = os.getenv(
+    "QUESTIONS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "DevOps_Tools_Interview_Questions"),
+)
+QUESTION_INDEX_FILE = os.getenv("QUESTION_INDEX_FILE", "question_index.json")
+INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+ANSWER_EXCERPT_CHARS = 240
+QUESTIONS_PER_TOOL = 2       # prep sheet: keep one tool from filling a whole application
+
+STOPWORDS = set("""
+a an and are as at be by can do does for from how i in is it its of on or that the this to
+what when where which who why with you your we our will would should using use used vs
+explain describe difference between
+""".split())
+# how postings spell things vs. how the guides do
+ALIASES = {
+    "k8s": "kubernetes",
+    "gha": "github",
+    "tf": "terraform",
+    "gcp": "google",
+    "elk": "elasticsearch",
+    "cicd": "ci",
+}
+
+QUESTION_HEADING_RE = re.compile(r"^#{3,4}\s+(?:\*\*)?(?:Q\s*)?\d+[.):]\s*(.+?)(?:\*\*)?\s*$")
+SECTION_RE = re.compile(r"^##\s+(.+?)\s*$")
+# plain-text notes: "12. What is ...?", "Question 3: ...", "🧠 1️⃣ What is ...?"
+PLAIN_QUESTION_RE = re.compile(
+    r"^\s*(?:[^\w\s]{1,3}\s*)?(?:Question\s*\d+\s*:|Q\d+[.:)]|\d+(?:\.|\)|️?⃣))\s*(.+?)\s*$"
+)
+LOOSE_QUESTION_RE = re.compile(r"^(What|How|Why|When|Where|Which|Can|Is|Are|Does|Do|Explain|Describe)\b")
+QUESTION_START_RE = re.compile(
+    r"^(what|how|why|when|where|which|who|can|is|are|does|do|explain|describe|define|list|"
+    r"compare|name|give|differentiate|difference)\b",
+    re.I,
+)
+
+
+def tokenize(text):
+    terms = []
+    for token in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        token = ALIASES.get(token, token)
+        if token not in STOPWORDS and (len(token) > 1 or token.isdigit()):
+            terms.append(token)
+    return terms
+
+
+def _clean(text):
+    """Markdown heading text without emphasis markers and emoji."""
+    return re.sub(r"\s+", " ", re.sub(r"[*_`#]|[^\x00-⿿]", "", text)).strip()
+
+
+def _plain_question(line):
+    m = PLAIN_QUESTION_RE.match(line)
+    if m and len(m.group(1)) < 240 and (m.group(1).endswith("?") or QUESTION_START_RE.match(_clean(m.group(1)))):
+        return m.group(1)
+    return None
+
+
+def _loose_question(line):
+    """An unnumbered question line in notes that number nothing ("How to achieve GitOps?")."""
+    line = line.strip()
+    if len(line) < 120 and not line.endswith((".", ":")) and LOOSE_QUESTION_RE.match(line):
+        return line
+    return None
+
+
+def split_questions(text):
+    """[(line, question, section, answer)] of one markdown / notes file."""
+    lines = text.splitlines()
+    if any(QUESTION_HEADING_RE.match(line) for line in lines):
+        mode = "headed"
+    elif any(_plain_question(line) for line in lines):
+        mode = "numbered"
+    else:
+        mode = "loose"
+    questions, section, current = [], "", None
+    for no, line in enumerate(lines, 1):
+        title = None
+        if mode == "headed":
+            m = QUESTION_HEADING_RE.match(line)
+            if m:
+                title = m.group(1)
+            elif SECTION_RE.match(line):
+                section = _clean(SECTION_RE.match(line).group(1))
+        elif mode == "numbered":
+            title = _plain_question(line)
+        else:
+            title = _loose_question(line)
+        if title is not None:
+            current = [no, _clean(title), section, []]
+            questions.append(current)
+        elif current is not None:
+            current[3].append(line)
+    return [(no, title, sec, "\n".join(body).strip()) for no, title, sec, body in questions]
+
+
+def tool_of(relpath):
+    """'CI_CD_Tools/GitHub_Actions_Interview_Questions.md' -> 'GitHub Actions'; 'argocd/3.md' -> 'argocd'."""
+    stem = os.path.splitext(os.path.basename(relpath))[0].replace("_Interview_Questions", "")
+    if stem.isdigit():
+        stem = os.path.basename(os.path.dirname(relpath))
+    return stem.replace("_", " ")
+
+
+def index_file(relpath, text):
+    """Documents of one file, each with its term counts."""
+    tool = tool_of(relpath)
+    docs = []
+    for line, title, section, answer in split_questions(text):
+        terms = tokenize(title) * TITLE_WEIGHT + tokenize(answer) + tokenize(section) + tokenize(tool)
+        tf = {}
+        for term in terms:
+            tf[term] = tf.get(term, 0) + 1
+        excerpt = re.sub(r"\s+", " ", re.sub(r"[*`#>|]", " ", answer)).strip()[:ANSWER_EXCERPT_CHARS]
+        docs.append({"line": line, "title": title, "section": section, "tool": tool,
+                     "excerpt": excerpt, "len": len(terms), "tf": tf})
+    return docs
+
+
+class QuestionIndex:
+    def __init__(self, path=QUESTION_INDEX_FILE, root=QUESTIONS_DIR):
+        self.path = path
+        self.root = os.path.normpath(root)
+        self.files = {}      # relpath -> {"size", "mtime", "sha1", "docs"}
+        self.docs = []       # [{"file", "line", "title", "section", "tool", "excerpt", "len"}]
+        self.postings = {}   # term -> [[doc index, tf], ...]
+        self.avgdl = 0.0
+
+    def load(self):
+        """Read the index file (if any) and bring it up to date with the corpus."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("root") == self.root:
+                self.files = data["files"]
+                self.docs = data["docs"]
+                self.postings = data["postings"]
+                self.avgdl = data["avgdl"]
+        except (OSError, ValueError, KeyError):
+            pass
+        changed = self.refresh()
+        if changed:
+            self.save()
+        return changed
+
+    def _corpus(self):
+        found = {}
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".md") and name != "README.md":
+                    full = os.path.join(dirpath, name)
+                    found[os.path.relpath(full, self.root).replace(os.sep, "/")] = full
+        return found
+
+    def refresh(self):
+        """Re-index added/changed files, drop removed ones; the changed relpaths."""
+        changed = []
+        corpus = self._corpus()
+        for relpath in set(self.files) - set(corpus):
+            del self.files[relpath]
+            changed.append(relpath)
+        for relpath, full in sorted(corpus.items()):
+            st = os.stat(full)
+            entry = self.files.get(relpath)
+            if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+                continue
+            with open(full, "rb") as f:
+                raw = f.read()
+            sha1 = hashlib.sha1(raw).hexdigest()
+            if entry and entry["sha1"] == sha1:
+                entry["mtime"] = st.st_mtime      # touched, not edited
+                changed.append(relpath)
+                continue
+            self.files[relpath] = {
+                "size": st.st_size, "mtime": st.st_mtime, "sha1": sha1,
+                "docs": index_file(relpath, raw.decode("utf-8", errors="replace")),
+            }
+            changed.append(relpath)
+        if changed or not self.docs:
+            self._build_postings()
+        return changed
+
+    def _build_postings(self):
+        self.docs, self.postings = [], {}
+        for relpath in sorted(self.files):
+            for doc in self.files[relpath]["docs"]:
+                i = len(self.docs)
+                self.docs.append({k: v for k, v in doc.items() if k != "tf"} | {"file": relpath})
+                for term, count in doc["tf"].items():
+                    self.postings.setdefault(term, []).append([i, count])
+        self.avgdl = sum(d["len"] for d in self.docs) / len(self.docs) if self.docs else 0.0
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "root": self.root, "files": self.files,
+                       "docs": self.docs, "postings": self.postings, "avgdl": self.avgdl}, f)
+        os.replace(tmp, self.path)
+
+    def search(self, query, n=10, per_tool=None):
+        """[(score, doc)] best first; at most `per_tool` hits about one tool."""
+        n_docs = len(self.docs)
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.docs[i]["len"] / self.avgdl)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        hits, per = [], {}
+        for i in sorted(scores, key=scores.get, reverse=True):
+            doc = self.docs[i]
+            if per_tool is not None:
+                if per.get(doc["tool"], 0) >= per_tool:
+                    continue
+                per[doc["tool"]] = per.get(doc["tool"], 0) + 1
+            hits.append((scores[i], doc))
+            if len(hits) >= n:
+                break
+        return hits
+
+
+def load_index(path=QUESTION_INDEX_FILE, root=QUESTIONS_DIR):
+    index = QuestionIndex(path, root)
+    changed = index.load()
+    if changed:
+        log.info(f"[QINDEX] re-indexed {len(changed)} file(s); {len(index.docs)} questions, "
+                 f"{len(index.postings)} terms")
+    return index
+
+
+def applied_postings(days=7):
+    """Postings with a last verdict of "applied" from the last `days` days, newest first."""
+    from job_store import connect
+
+    conn = connect()
+    try:
+        return conn.execute(
+            "SELECT portal, job_id, url, title, company, skills, last_seen FROM postings "
+            "WHERE verdict = 'applied' AND last_seen >= ? ORDER BY last_seen DESC",
+            (time.time() - days * 86400,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def prep_sheet(index, postings, n=5):
+    """Markdown: per application, the `n` best matching questions."""
+    out = [f"# Interview prep - {time.strftime('%Y-%m-%d')}", ""]
+    for portal, job_id, url, title, company, skills, last_seen in postings:
+        query = skills or title or ""
+        out.append(f"## {title or job_id} - {company or portal}")
+        out.append(f"Applied {time.strftime('%Y-%m-%d', time.localtime(last_seen))} · {url}")
+        out.append(f"Skills: {query or '(none recorded)'}")
+        out.append("")
+        hits = index.search(f"{query} {title or ''}", n=n, per_tool=QUESTIONS_PER_TOOL)
+        if not hits:
+            out.append("_No matching questions in the corpus._")
+        for score, doc in hits:
+            out.append(f"- **[{doc['tool']}] {doc['title']}** ({doc['file']}:{doc['line']})")
+            if doc["excerpt"]:
+                out.append(f"  {doc['excerpt']}")
+        out.append("")
+    return "\n".join(out)
+
+
+def _option(args, name, default):
+    if name in args:
+        i = args.index(name)
+        value = args[i + 1]
+        del args[i:i + 2]
+        return value
+    return default
+
+
+def main(argv):
+    args = argv[1:]
+    command = args.pop(0) if args else None
+    n = int(_option(args, "-n", "10" if command == "query" else "5"))
+    if command == "build":
+        started = time.perf_counter()
+        index = load_index()
+        print(f"{len(index.files)} files, {len(index.docs)} questions, {len(index.postings)} terms "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms -> {index.path}")
+        return 0
+    if command == "query" and args:
+        started = time.perf_counter()
+        index = load_index()
+        loaded = time.perf_counter()
+        hits = index.search(" ".join(args), n=n)
+        done = time.perf_counter()
+        for score, doc in hits:
+            print(f"{score:6.2f}  [{doc['tool']}] {doc['title']}  ({doc['file']}:{doc['line']})")
+        print(f"{len(hits)} hits; load {(loaded - started) * 1000:.1f} ms, search {(done - loaded) * 1000:.2f} ms")
+        return 0
+    if command == "prep":
+        days = int(_option(args, "--days", "7"))
+        out_file = _option(args, "--out", None)
+        postings = applied_postings(days)
+        if not postings:
+            print(f"no applied postings in job_store in the last {days} days")
+            return 1
+        sheet = prep_sheet(load_index(), postings, n=n)
+        if out_file:
+            with open(out_file, "w", encoding="utf-8") as f:
+                f.write(sheet)
+            print(f"prep sheet for {len(postings)} applications -> {out_file}")
+        else:
+            print(sheet)
+        return 0
+    print('usage: python question_index.py build | query "<terms>" [-n N] | '
+          "prep [--days D] [-n N] [--out file.md]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
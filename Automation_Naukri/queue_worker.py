@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+queue_worker.py
+Crawl and apply through the shared work queue (work_queue.py), so several
+machines can work the same searches without stepping on each other.
+
+    python queue_worker.py produce naukri        # enqueue today's planned searches
+    python queue_worker.py produce hirist        # enqueue today's listing crawl
+    python queue_worker.py work naukri           # lease + run crawl/apply items until idle
+    python queue_worker.py work hirist --dry-run # filter only (use a separate WORK_QUEUE_URL:
+                                                 # dry-run items are acked like real ones)
+
+Item kinds, per portal:
+    crawl:<portal>   a search (Naukri: query/location/pages from search_planner)
+                     or the Hirist listing; the worker that runs it enqueues
+                     one apply item per job found
+    apply:<portal>   one job URL, keyed by its job id so it is queued once
+
+Workers prefer apply items over crawl items, stop taking apply items after
+the portal's MAX_JOBS_PER_RUN or while the daily apply quota (apply_quota.py)
+has nothing left for the portal, and exit after WORKER_IDLE_EXIT_SECONDS with
+nothing to lease. Every apply goes through work_queue's apply claim, so a job
+is never applied to twice even if a worker dies mid-apply.
+"""
+
+import os
+import socket
+import sys
+import time
+from datetime import date
+
+from dotenv import load_dotenv
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from apply_quota import QUOTA
+from driver_lifecycle import DriverLifecycle
+from job_engine import RateLimiter
+from job_store import JOB_STORE, job_id_from_url
+from portals import ADAPTERS
+from retry_policy import RETRY, CircuitOpenError, BREAKER_COOLDOWN
+from run_log import get_logger, job_context, finish_run, RUN_METRICS
+from work_queue import open_queue
+
+log = get_logger("queue_worker")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+WORKER_IDLE_EXIT_SECONDS = int(os.getenv("WORKER_IDLE_EXIT_SECONDS", "120"))
+WORKER_POLL_SECONDS = 5
+CRAWL_LEASE_SECONDS = 900   # a multi-page search can take a while
+APPLY_LEASE_SECONDS = 300
+
+
+def produce(queue, portal):
+    """Enqueue today's crawl items for `portal`; returns how many were new."""
+    today = date.today().isoformat()
+    added = 0
+    if portal == "naukri":
+        import job_update
+        from search_planner import load_history, plan_crawl
+
+        plan = plan_crawl(
+            job_update.SEARCH_QUERIES, job_update.SEARCH_LOCATIONS, load_history(),
+            job_update.CRAWL_BUDGET_PAGES, job_update.MAX_PAGES_PER_SEARCH,
+        )
+        for query, location, pages in plan:
+            added += queue.enqueue(
+                "crawl:naukri", f"crawl:naukri:{query}|{location}:{today}",
+                {"query": query, "location": location, "pages": pages},
+            )
+    else:
+        added += queue.enqueue(f"crawl:{portal}", f"crawl:{portal}:{today}", {})
+    log.info(f"[QUEUE] {added} new crawl items for {portal}")
+    return added
+
+
+def enqueue_jobs(queue, portal, jobs):
+    added = 0
+    for job in jobs:
+        payload = {k: v for k, v in job.items() if k != "stats"}
+        added += queue.enqueue(f"apply:{portal}", job_id_from_url(job["url"]), payload)
+    return added
+
+
+def run_crawl(queue, adapter, driver, payload):
+    """Run one crawl item; returns the number of new apply items."""
+    if adapter.name != "naukri":
+        jobs = adapter.discover(driver)
+    else:
+        import job_update
+        from seen_filter import VisitedJobs
+
+        jobs, visited = [], VisitedJobs(seen=None)
+        for page in range(1, payload["pages"] + 1):
+            page_jobs, found = job_update.load_results_page(
+                driver, payload["query"], payload["location"], page, visited,
+            )
+            jobs.extend(page_jobs)
+            if not found:
+                break
+    added = enqueue_jobs(queue, adapter.name, jobs)
+    log.info(f"[QUEUE] crawl found {len(jobs)} jobs, {added} new apply items")
+    return added
+
+
+def run_apply(queue, adapter, driver, job, key, limiter, dry_run):
+    """extract -> applied? -> relevant? -> quota -> claim -> apply. Returns an outcome string."""
+    detail = adapter.extract(driver, job)
+    if adapter.is_applied(driver, job):
+        return "already_applied"
+    if not adapter.is_relevant(job, detail):
+        return "skipped"
+    if dry_run:
+        return "matched"
+    slot = QUOTA.reserve(adapter.name)
+    if slot is None:
+        return "quota"
+    ok = False
+    try:
+        if not queue.claim_apply(key, WORKER_ID):
+            # another worker - possibly one that died mid-apply - got here first
+            return "claimed"
+        limiter.wait()
+        ok = adapter.apply(driver, job)
+    finally:
+        QUOTA.finish(slot, ok)
+    return "applied" if ok else "failed"
+
+
+def work(queue, portal, dry_run=False):
+    adapter = ADAPTERS[portal]()
+    limiter = RateLimiter(adapter.min_apply_interval)
+    lifecycle = DriverLifecycle(
+        adapter.start_driver, after_restart=adapter.login,
+        report_file=f"memory_report_worker_{portal}.csv",
+    )
+    queue.recover()
+    QUOTA.log_status(portal)
+    applied = 0
+    idle_since = time.time()
+    driver = lifecycle.start()
+    try:
+        if not adapter.login(driver):
+            log.error(f"[{portal}] login failed, worker stopping")
+            return
+        while time.time() - idle_since < WORKER_IDLE_EXIT_SECONDS:
+            kinds = [f"crawl:{portal}"]
+            if applied < adapter.max_jobs and QUOTA.remaining(portal) > 0:
+                kinds.insert(0, f"apply:{portal}")
+            lease = None
+            for kind in kinds:
+                visibility = APPLY_LEASE_SECONDS if kind.startswith("apply") else CRAWL_LEASE_SECONDS
+                lease = queue.lease([kind], visibility=visibility)
+                if lease:
+                    break
+            if lease is None:
+                time.sleep(WORKER_POLL_SECONDS)
+                continue
+            idle_since = time.time()
+
+            ref = lease.payload.get("url") or lease.key
+            with job_context(ref):
+                try:
+                    if lease.kind.startswith("crawl"):
+                        RETRY.call(run_crawl, queue, adapter, driver, lease.payload, portal=portal)
+                        outcome = "crawled"
+                    else:
+                        RUN_METRICS.add("checked")
+                        outcome = RETRY.call(
+                            run_apply, queue, adapter, driver, lease.payload, lease.key,
+                            limiter, dry_run, portal=portal,
+                        )
+                except CircuitOpenError as e:
+                    log.error(f"[{portal}] {e}; handing {lease.key} back")
+                    queue.nack(lease, delay=BREAKER_COOLDOWN)
+                    time.sleep(WORKER_POLL_SECONDS)
+                    continue
+                except Exception as e:
+                    RUN_METRICS.add("failed")
+                    log.error(f"[{portal}] [ERROR] {lease} -> {e}")
+                    queue.nack(lease)
+                    driver = lifecycle.after_job()
+                    continue
+
+                if outcome == "quota":
+                    # another process took the last slot; the item waits for the next window
+                    queue.nack(lease, delay=QUOTA.seconds_to_next_window())
+                    driver = lifecycle.after_job()
+                    continue
+                if not queue.ack(lease):
+                    log.warning(f"[{portal}] lease on {lease.key} expired before ack")
+                log.info(f"[{portal}] {outcome.upper()} {ref}", extra={"outcome": outcome})
+                if outcome == "applied":
+                    applied += 1
+                    RUN_METRICS.add("applied")
+                elif outcome == "failed":
+                    RUN_METRICS.add("failed")
+                elif outcome not in ("crawled", "skipped"):
+                    RUN_METRICS.skip(outcome)
+                if outcome != "crawled":
+                    JOB_STORE.record({"portal": portal, "url": ref}, outcome, script="queue_worker")
+            driver = lifecycle.after_job()
+        log.info(f"[{portal}] idle for {WORKER_IDLE_EXIT_SECONDS}s, exiting")
+    finally:
+        lifecycle.quit()
+
+
+def main(argv):
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    if len(args) != 2 or args[0] not in ("produce", "work") or args[1] not in ADAPTERS:
+        print(f"usage: python queue_worker.py produce|work <{'|'.join(ADAPTERS)}> [--dry-run]")
+        return 2
+    command, portal = args
+    queue = open_queue()
+    if command == "produce":
+        produce(queue, portal)
+        return 0
+    try:
+        work(queue, portal, dry_run="--dry-run" in argv)
+    finally:
+        finish_run(f"queue_worker_{portal}", log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
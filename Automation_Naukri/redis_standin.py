@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+redis_standin.py
+Tiny in-memory stand-in for a Redis server, for exercising work_queue.py.
+
+    python redis_standin.py [port]          # default 6399
+
+Speaks RESP over TCP and implements only the commands the Redis work-queue
+backend sends (strings, sets, hashes, sorted sets, WATCH/MULTI/EXEC, a few
+admin commands).
+Single process, no persistence, no expiry sweeps beyond SET ... EX on read.
+Point WORK_QUEUE_URL=redis://127.0.0.1:6399/0 at it, or let
+`python work_queue.py selftest redis` start one in-process.
+"""
+
+import socketserver
+import sys
+import threading
+import time
+
+
+class RespError(Exception):
+    pass
+
+
+# commands that modify their first key (DEL: every key), for WATCH
+WRITE_COMMANDS = {"set", "sadd", "srem", "hset", "hincrby", "zadd", "zrem", "zpopmin"}
+
+
+class Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}      # key -> str | set | dict | {"zset": dict}
+        self.expires = {}   # key -> epoch seconds
+        self.versions = {}  # key -> write count, for WATCH
+
+    def _get(self, key, kind=None):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        value = self.data.get(key)
+        if value is not None and kind is not None and not isinstance(value, kind):
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    # --- commands: each takes the argument strings, returns a RESP-able value
+    def cmd_ping(self, *args):
+        return "PONG"
+
+    def cmd_select(self, db):
+        return "OK"
+
+    def cmd_auth(self, *args):
+        return "OK"
+
+    def cmd_flushdb(self):
+        self.data.clear()
+        self.expires.clear()
+        return "OK"
+
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._get(key) is not None:
+                del self.data[key]
+                removed += 1
+            self.expires.pop(key, None)
+        return removed
+
+    def cmd_get(self, key):
+        return self._get(key, str)
+
+    def cmd_set(self, key, value, *options):
+        options = [o.upper() for o in options]
+        if "NX" in options and self._get(key) is not None:
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if "EX" in options:
+            self.expires[key] = time.time() + int(options[options.index("EX") + 1])
+        return "OK"
+
+    def cmd_sadd(self, key, *members):
+        s = self._get(key, set)
+        if s is None:
+            s = self.data[key] = set()
+        before = len(s)
+        s.update(members)
+        return len(s) - before
+
+    def cmd_srem(self, key, *members):
+        s = self._get(key, set) or set()
+        before = len(s)
+        s.difference_update(members)
+        return before - len(s)
+
+    def cmd_sismember(self, key, member):
+        return int(member in (self._get(key, set) or ()))
+
+    def cmd_smembers(self, key):
+        return sorted(self._get(key, set) or ())
+
+    def cmd_scard(self, key):
+        return len(self._get(key, set) or ())
+
+    def cmd_hset(self, key, *pairs):
+        h = self._get(key, dict)
+        if h is None:
+            h = self.data[key] = {}
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in h
+            h[field] = value
+        return added
+
+    def cmd_hget(self, key, field):
+        return (self._get(key, dict) or {}).get(field)
+
+    def cmd_hgetall(self, key):
+        flat = []
+        for field, value in (self._get(key, dict) or {}).items():
+            flat += [field, value]
+        return flat
+
+    def cmd_hincrby(self, key, field, amount):
+        h = self._get(key, dict)
+        if h is None:
+            h = self.data[key] = {}
+        h[field] = str(int(h.get(field, "0")) + int(amount))
+        return int(h[field])
+
+    def _zset(self, key, create=False):
+        z = self._get(key, ZSet)
+        if z is None and create:
+            z = self.data[key] = ZSet()
+        return z
+
+    def cmd_zadd(self, key, *args):
+        nx = False
+        args = list(args)
+        while args and args[0].upper() in ("NX", "XX", "GT", "LT", "CH"):
+            nx = nx or args.pop(0).upper() == "NX"
+        z = self._zset(key, create=True)
+        added = 0
+        for score, member in zip(args[::2], args[1::2]):
+            if nx and member in z:
+                continue
+            added += member not in z
+            z[member] = float(score)
+        return added
+
+    def cmd_zrem(self, key, *members):
+        z = self._zset(key) or {}
+        return sum(1 for m in members if z.pop(m, None) is not None)
+
+    def cmd_zscore(self, key, member):
+        score = (self._zset(key) or {}).get(member)
+        return None if score is None else repr(score)
+
+    def cmd_zcard(self, key):
+        return len(self._zset(key) or ())
+
+    def cmd_zpopmin(self, key, count="1"):
+        z = self._zset(key) or {}
+        flat = []
+        for member, score in sorted(z.items(), key=lambda ms: (ms[1], ms[0]))[:int(count)]:
+            del z[member]
+            flat += [member, repr(score)]
+        return flat
+
+    def _run(self, args):
+        handler = getattr(self, f"cmd_{args[0].lower()}", None)
+        if handler is None:
+            raise RespError(f"ERR unknown command '{args[0]}'")
+        name = args[0].lower()
+        written = args[1:] if name in ("del", "flushdb") else args[1:2] if name in WRITE_COMMANDS else ()
+        if name == "flushdb":
+            written = list(self.data)
+        for key in written:
+            self.versions[key] = self.versions.get(key, 0) + 1
+        try:
+            return handler(*args[1:])
+        except TypeError:
+            raise RespError(f"ERR wrong number of arguments for '{args[0]}'")
+
+    def execute(self, args):
+        with self.lock:
+            return self._run(args)
+
+    def watch(self, keys):
+        with self.lock:
+            return {key: self.versions.get(key, 0) for key in keys}
+
+    def exec_multi(self, queued, watched):
+        """Replies of `queued`, or None if a watched key was written since WATCH."""
+        with self.lock:
+            if any(self.versions.get(key, 0) != version for key, version in watched.items()):
+                return None
+            replies = []
+            for args in queued:
+                try:
+                    replies.append(self._run(args))
+                except RespError as e:
+                    replies.append(e)
+            return replies
+
+
+class ZSet(dict):
+    """member -> score"""
+
+
+def encode(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, list):
+        return f"*{len(value)}\r\n".encode() + b"".join(encode(v) for v in value)
+    if value in ("OK", "PONG", "QUEUED"):
+        return f"+{value}\r\n".encode()
+    data = str(value).encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.decode().split()  # inline command (redis-cli / telnet)
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2].decode())
+        return args
+
+    def handle(self):
+        store = self.server.store
+        watched, queued = {}, None   # per-connection transaction state
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            if not args:
+                continue
+            name = args[0].upper()
+            try:
+                if name == "WATCH":
+                    watched.update(store.watch(args[1:]))
+                    reply = "OK"
+                elif name == "UNWATCH":
+                    watched = {}
+                    reply = "OK"
+                elif name == "MULTI":
+                    if queued is not None:
+                        raise RespError("ERR MULTI calls can not be nested")
+                    queued, reply = [], "OK"
+                elif name == "DISCARD":
+                    queued, watched, reply = None, {}, "OK"
+                elif name == "EXEC":
+                    if queued is None:
+                        raise RespError("ERR EXEC without MULTI")
+                    reply = store.exec_multi(queued, watched)
+                    queued, watched = None, {}
+                elif queued is not None:
+                    queued.append(args)
+                    reply = "QUEUED"
+                else:
+                    reply = store.execute(args)
+            except RespError as e:
+                reply = e
+            self.wfile.write(encode(reply))
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, RespHandler)
+        self.store = Store()
+
+
+def serve(port=6399):
+    server = StandInServer(("127.0.0.1", port))
+    print(f"[STANDIN] redis stand-in on redis://127.0.0.1:{server.server_address[1]}/0")
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 6399
+    try:
+        serve(port).serve_forever()
+    except KeyboardInterrupt:
+        pass
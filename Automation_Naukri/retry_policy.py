@@ -0,0 +1,183 @@
+"""
+retry_policy.py
+Shared retry layer for the job loops.
+
+Errors are classified as transient (stale element, page-load timeout,
+intercepted click, dropped connection...) or permanent (missing element,
+bad selector, closed window...). Transient ones are retried a bounded
+number of times with exponential backoff and full jitter; permanent ones are
+raised straight away. Each portal has a circuit breaker: when the failure
+rate over its recent attempts spikes, further calls fail fast with
+CircuitOpenError until a cool-down has passed. Every failure is counted per
+kind and exception class in RUN_METRICS for the run report.
+"""
+
+import random
+import time
+from collections import deque
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidArgumentException,
+    InvalidSelectorException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from run_log import get_logger, RUN_METRICS
+
+log = get_logger("retry_policy")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+RETRY_ATTEMPTS = 3          # total tries for a transient failure
+RETRY_BASE_DELAY = 1.0      # seconds; doubled per attempt
+RETRY_MAX_DELAY = 15.0
+
+BREAKER_WINDOW = 20         # attempts remembered per portal
+BREAKER_MIN_CALLS = 8       # don't judge a portal on fewer attempts than this
+BREAKER_FAILURE_RATE = 0.6  # open when this share of the window failed
+BREAKER_COOLDOWN = 300      # seconds to stay open
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+_TRANSIENT_TYPES = (
+    StaleElementReferenceException,
+    TimeoutException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    ConnectionError,
+    TimeoutError,
+)
+_PERMANENT_TYPES = (
+    NoSuchElementException,
+    InvalidSelectorException,
+    InvalidArgumentException,
+    NoSuchWindowException,
+)
+# WebDriverException is a catch-all; decide on its message
+_TRANSIENT_MESSAGES = (
+    "net::err_",
+    "timed out",
+    "timeout",
+    "disconnected",
+    "connection refused",
+    "connection reset",
+    "target frame detached",
+    "cannot determine loading status",
+    "chrome not reachable",
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling into a portal whose breaker is open."""
+
+
+def classify(exc):
+    """TRANSIENT or PERMANENT for any exception raised by a job step."""
+    if isinstance(exc, _PERMANENT_TYPES):
+        return PERMANENT
+    if isinstance(exc, _TRANSIENT_TYPES):
+        return TRANSIENT
+    if isinstance(exc, WebDriverException):
+        msg = (exc.msg or str(exc) or "").lower()
+        if any(m in msg for m in _TRANSIENT_MESSAGES):
+            return TRANSIENT
+    return PERMANENT
+
+
+class CircuitBreaker:
+    def __init__(self, portal, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 failure_rate=BREAKER_FAILURE_RATE, cooldown=BREAKER_COOLDOWN):
+        self.portal = portal
+        self.results = deque(maxlen=window)  # True = ok
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.opened_at = None
+
+    def allow(self):
+        if self.opened_at is None:
+            return True
+        if time.time() - self.opened_at >= self.cooldown:
+            # half-open: let calls through again, starting from a clean window
+            log.info(f"[RETRY] breaker for {self.portal} half-open after cool-down")
+            self.opened_at = None
+            self.results.clear()
+            return True
+        return False
+
+    def record(self, ok):
+        self.results.append(ok)
+        if self.opened_at is not None or len(self.results) < self.min_calls:
+            return
+        failures = self.results.count(False)
+        if failures / len(self.results) >= self.failure_rate:
+            self.opened_at = time.time()
+            RUN_METRICS.error("breaker", f"{self.portal}_open")
+            log.error(
+                f"[RETRY] breaker OPEN for {self.portal}: {failures}/{len(self.results)} "
+                f"recent attempts failed; pausing {self.cooldown}s"
+            )
+
+
+class RetryPolicy:
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breakers = {}
+
+    def breaker(self, portal):
+        if portal not in self.breakers:
+            self.breakers[portal] = CircuitBreaker(portal)
+        return self.breakers[portal]
+
+    def backoff(self, attempt):
+        """Full jitter: uniform in [0, min(max_delay, base * 2**attempt)]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, fn, *args, portal="naukri", on_retry=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) under the policy. `on_retry(exc)` runs before
+        each new attempt (e.g. to close a half-open tab). Raises the last
+        error, or CircuitOpenError if the portal's breaker is open.
+        """
+        breaker = self.breaker(portal)
+        for attempt in range(self.attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f"{portal} circuit open")
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                kind = classify(e)
+                RUN_METRICS.error(kind, type(e).__name__)
+                breaker.record(False)
+                if kind == PERMANENT or attempt == self.attempts - 1:
+                    raise
+                delay = self.backoff(attempt)
+                log.warning(
+                    f"[RETRY] {type(e).__name__} (transient), attempt {attempt + 1}/{self.attempts}; "
+                    f"retrying in {delay:.1f}s",
+                    extra={"error": str(e).splitlines()[0] if str(e) else ""},
+                )
+                if on_retry is not None:
+                    try:
+                        on_retry(e)
+                    except Exception:
+                        pass
+                time.sleep(delay)
+            else:
+                breaker.record(True)
+                return result
+
+
+RETRY = RetryPolicy()
@@ -0,0 +1,250 @@
+"""
+run_log.py
+Leveled, low-overhead logging and per-run counters for the automation scripts.
+
+- Console keeps the familiar "[INFO] ..." look, with a timestamp in front.
+- Every record also goes, as one JSON line, to LOG_FILE. Records are handed
+  to a background thread through a queue and written in batches, so file
+  I/O is never on the browser loop's hot path.
+- job_context() tags every record logged while a job is processed with a
+  short correlation id and times the job.
+- RUN_METRICS counts jobs checked / skipped per filter reason / applied /
+  failed / errors per class, tracks posting-to-apply latency, and writes
+  them in Prometheus textfile-collector format at the end of a run (point
+  node_exporter's --collector.textfile.directory at it).
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE", "run_log.jsonl")
+LOG_BUFFER_RECORDS = int(os.getenv("LOG_BUFFER_RECORDS", "200"))
+# one file per script ({script} is filled in), so runs don't overwrite each other
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "jobbot_{script}.prom")
+
+_correlation_id = contextvars.ContextVar("correlation_id", default="-")
+_listener = None
+
+# LogRecord attributes that are not user-supplied `extra=` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "cid"}
+
+
+class _CorrelationFilter(logging.Filter):
+    def filter(self, record):
+        record.cid = _correlation_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        doc = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "cid": getattr(record, "cid", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                doc[key] = value
+        if record.exc_info:
+            doc["exc"] = self.formatException(record.exc_info)
+        return json.dumps(doc, default=str, ensure_ascii=False)
+
+
+def _setup():
+    global _listener
+    root = logging.getLogger("jobbot")
+    if _listener is not None:
+        return root
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", "%H:%M:%S"))
+
+    json_file = logging.FileHandler(LOG_FILE, encoding="utf-8", delay=True)
+    json_file.setFormatter(JsonFormatter())
+    # batch file writes; anything at ERROR or above is flushed straight away
+    buffered = logging.handlers.MemoryHandler(
+        LOG_BUFFER_RECORDS, flushLevel=logging.ERROR, target=json_file
+    )
+
+    q = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(q)
+    queue_handler.addFilter(_CorrelationFilter())
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(q, console, buffered, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown)
+    return root
+
+
+def get_logger(name):
+    """Logger under the shared 'jobbot' tree, e.g. get_logger('job_update')."""
+    _setup()
+    return logging.getLogger(f"jobbot.{name}")
+
+
+def shutdown():
+    """Flush the background writer; safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()  # MemoryHandler.close() flushes to the file
+        _listener = None
+
+
+# -----------------------------
+# Run counters
+# -----------------------------
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()  # for the multi-portal engine's worker threads
+        self.started = time.time()
+        self.checked = 0
+        self.applied = 0
+        self.failed = 0
+        self.skipped = Counter()  # reason -> count
+        self.errors = Counter()   # (kind, exception class) -> count
+        self.job_seconds = 0.0
+        self.jobs_timed = 0
+        self.apply_latencies = []  # seconds from posting to apply, per applied job
+
+    def add(self, field, n=1):
+        """Thread-safe `RUN_METRICS.<field> += n`."""
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def skip(self, reason):
+        with self._lock:
+            self.skipped[reason] += 1
+
+    def error(self, kind, name):
+        with self._lock:
+            self.errors[(kind, name)] += 1
+
+    def apply_latency(self, seconds):
+        with self._lock:
+            self.apply_latencies.append(seconds)
+
+    def latency_quantile(self, q):
+        """Nearest-rank quantile of posting-to-apply latency (0.0 when none)."""
+        values = sorted(self.apply_latencies)
+        if not values:
+            return 0.0
+        return values[max(0, math.ceil(q * len(values)) - 1)]
+
+    def avg_job_seconds(self):
+        return self.job_seconds / self.jobs_timed if self.jobs_timed else 0.0
+
+    def summary(self):
+        return {
+            "checked": self.checked,
+            "applied": self.applied,
+            "failed": self.failed,
+            "skipped": dict(self.skipped),
+            "errors": {f"{kind}:{name}": n for (kind, name), n in self.errors.items()},
+            "avg_job_seconds": round(self.avg_job_seconds(), 2),
+            "posting_to_apply_hours_p50": round(self.latency_quantile(0.5) / 3600, 1),
+            "run_seconds": round(time.time() - self.started, 1),
+        }
+
+    def write_textfile(self, script, path=METRICS_TEXTFILE):
+        """Write the counters for `script` in Prometheus textfile format (atomic)."""
+        path = path.format(script=script)
+        label = f'script="{script}"'
+        lines = [
+            "# HELP jobbot_jobs_checked Jobs looked at in the last run.",
+            "# TYPE jobbot_jobs_checked gauge",
+            f"jobbot_jobs_checked{{{label}}} {self.checked}",
+            "# HELP jobbot_jobs_applied Applications submitted in the last run.",
+            "# TYPE jobbot_jobs_applied gauge",
+            f"jobbot_jobs_applied{{{label}}} {self.applied}",
+            "# HELP jobbot_jobs_failed Jobs that errored or whose apply failed in the last run.",
+            "# TYPE jobbot_jobs_failed gauge",
+            f"jobbot_jobs_failed{{{label}}} {self.failed}",
+            "# HELP jobbot_jobs_skipped Jobs rejected in the last run, by filter reason.",
+            "# TYPE jobbot_jobs_skipped gauge",
+        ]
+        for reason, count in sorted(self.skipped.items()):
+            lines.append(f'jobbot_jobs_skipped{{{label},reason="{reason}"}} {count}')
+        lines += [
+            "# HELP jobbot_errors Failures seen in the last run, by kind and exception class.",
+            "# TYPE jobbot_errors gauge",
+        ]
+        for (kind, name), count in sorted(self.errors.items()):
+            lines.append(f'jobbot_errors{{{label},kind="{kind}",class="{name}"}} {count}')
+        lines += [
+            "# HELP jobbot_job_seconds_avg Average wall time per processed job.",
+            "# TYPE jobbot_job_seconds_avg gauge",
+            f"jobbot_job_seconds_avg{{{label}}} {self.avg_job_seconds():.3f}",
+            "# HELP jobbot_posting_to_apply_seconds Time from job posting to our application, last run.",
+            "# TYPE jobbot_posting_to_apply_seconds summary",
+            f'jobbot_posting_to_apply_seconds{{{label},quantile="0.5"}} {self.latency_quantile(0.5):.0f}',
+            f'jobbot_posting_to_apply_seconds{{{label},quantile="0.95"}} {self.latency_quantile(0.95):.0f}',
+            f"jobbot_posting_to_apply_seconds_sum{{{label}}} {sum(self.apply_latencies):.0f}",
+            f"jobbot_posting_to_apply_seconds_count{{{label}}} {len(self.apply_latencies)}",
+            "# HELP jobbot_run_duration_seconds Wall time of the last run.",
+            "# TYPE jobbot_run_duration_seconds gauge",
+            f"jobbot_run_duration_seconds{{{label}}} {time.time() - self.started:.1f}",
+            "# HELP jobbot_last_run_timestamp_seconds When the last run finished.",
+            "# TYPE jobbot_last_run_timestamp_seconds gauge",
+            f"jobbot_last_run_timestamp_seconds{{{label}}} {time.time():.0f}",
+        ]
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+
+RUN_METRICS = RunMetrics()
+
+
+@contextlib.contextmanager
+def job_context(ref=None):
+    """
+    Scope one job: sets a fresh correlation id (logged as `cid`) and adds the
+    job's wall time to RUN_METRICS. Yields the id.
+    """
+    cid = uuid.uuid4().hex[:8]
+    token = _correlation_id.set(cid)
+    started = time.perf_counter()
+    try:
+        if ref:
+            logging.getLogger("jobbot").debug("job start", extra={"job": ref})
+        yield cid
+    finally:
+        with RUN_METRICS._lock:
+            RUN_METRICS.job_seconds += time.perf_counter() - started
+            RUN_METRICS.jobs_timed += 1
+        _correlation_id.reset(token)
+
+
+def finish_run(script, log=None):
+    """Log the run summary and export it for Prometheus."""
+    summary = RUN_METRICS.summary()
+    (log or get_logger(script)).info(f"run summary: {summary}", extra={"summary": summary})
+    try:
+        RUN_METRICS.write_textfile(script)
+    except OSError as e:
+        (log or get_logger(script)).warning(f"could not write metrics textfile: {e}")
+    return summary
@@ -0,0 +1,110 @@
+"""
+search_planner.py
+Spend a fixed crawl budget (result pages per run) on the search combinations
+that have paid off best.
+
+Every query x location combination keeps a running history in
+SEARCH_HISTORY_FILE: result pages loaded, jobs found, jobs that passed the
+filter, and jobs applied. plan_crawl() scores each combination by its
+smoothed apply yield per page load and hands out pages greedily, with each
+extra page on the same search worth a bit less than the previous one
+(later pages repeat earlier ones and go stale). Unexplored combinations get
+an optimistic prior so they are tried at least once.
+"""
+
+import json
+import os
+import time
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+
+SEARCH_HISTORY_FILE = os.getenv("SEARCH_HISTORY_FILE", "search_history.json")
+
+# Prior pseudo-counts: a new combination is treated as if it had applied to
+# PRIOR_APPLIED jobs over PRIOR_PAGES pages.
+PRIOR_APPLIED = 1.0
+PRIOR_PAGES = 2.0
+
+# Each further page of the same search is expected to yield this much of the previous one
+PAGE_DECAY = 0.7
+
+# Older runs count less: history is multiplied by this before a run is added
+HISTORY_DECAY = 0.9
+
+
+def combo_key(query, location):
+    return f"{query}|{location}"
+
+
+def load_history(path=SEARCH_HISTORY_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_history(history, path=SEARCH_HISTORY_FILE):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def apply_yield(stats):
+    """Smoothed applies per page loaded."""
+    stats = stats or {}
+    return (stats.get("applied", 0.0) + PRIOR_APPLIED) / (stats.get("pages", 0.0) + PRIOR_PAGES)
+
+
+def plan_crawl(queries, locations, history, budget_pages, max_pages_per_search):
+    """
+    Return [(query, location, pages), ...] ordered best-yield first, with
+    sum(pages) <= budget_pages. Every combination is visited at least once
+    while the budget allows; combinations that get 0 pages are left out.
+    """
+    combos = [(q, loc) for q in queries for loc in locations]
+    scores = {c: apply_yield(history.get(combo_key(*c))) for c in combos}
+    ranked = sorted(combos, key=lambda c: scores[c], reverse=True)
+
+    pages = {c: 0 for c in combos}
+    remaining = budget_pages
+
+    # one exploratory page each, best first
+    for c in ranked:
+        if remaining <= 0:
+            break
+        pages[c] = 1
+        remaining -= 1
+
+    # then the marginal page with the highest expected yield, until spent
+    while remaining > 0:
+        candidates = [c for c in ranked if 0 < pages[c] < max_pages_per_search]
+        if not candidates:
+            break
+        best = max(candidates, key=lambda c: scores[c] * PAGE_DECAY ** pages[c])
+        pages[best] += 1
+        remaining -= 1
+
+    return [(q, loc, pages[(q, loc)]) for q, loc in ranked if pages[(q, loc)] > 0]
+
+
+def record_run(history, query, location, page_stats):
+    """
+    Fold one run's per-page stats ([{"found", "passed", "applied"}, ...])
+    into the history for a combination.
+    """
+    key = combo_key(query, location)
+    stats = history.get(key) or {}
+    for field in ("pages", "found", "passed", "applied"):
+        stats[field] = stats.get(field, 0.0) * HISTORY_DECAY
+    stats["pages"] += len(page_stats)
+    for page in page_stats:
+        for field in ("found", "passed", "applied"):
+            stats[field] += page.get(field, 0)
+    stats["runs"] = stats.get("runs", 0) + 1
+    stats["last_run"] = int(time.time())
+    history[key] = stats
+    return stats
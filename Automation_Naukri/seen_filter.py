@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+seen_filter.py
+Canonical job keys + a persistent, memory-mapped Bloom filter of jobs already handled.
+
+    python seen_filter.py stats
+    python seen_filter.py check <job url> [...]
+    python seen_filter.py rebuild [capacity]     # resize the Bloom file from the exact table
+
+The same Naukri/Hirist job shows up under many hrefs - different search
+pages add their own tracking parameters (?src=..., &sid=..., &xp=...) - so
+deduplicating on the href processes one job several times. job_key() reduces
+a URL to "<portal>:<job id>" (the numeric id Naukri and Hirist put at the end
+of every job URL), and canonical_url() to the URL without query/fragment.
+
+SeenFilter remembers keys across runs and processes:
+  - a Bloom filter in a memory-mapped file (SEEN_BLOOM_FILE): k bit positions
+    per key from one blake2b digest (double hashing), so membership is O(1)
+    and ~1.2 MB holds a million keys at 1% false positives;
+  - an exact SQLite table (SEEN_DB_FILE) that every Bloom "maybe" is confirmed
+    against, so a false positive never makes us skip a new job. Most new
+    jobs are answered by the Bloom filter alone, without touching SQLite.
+Adds take an exclusive flock on the Bloom file where fcntl exists, so several
+crawlers can share it.
+
+VisitedJobs is what a crawl dedupes with: keys seen this run (in memory)
+plus the SeenFilter, which is only told about a job once it has a final
+verdict (mark_done) - a job that failed or was never reached is retried on
+the next run.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+from dotenv import load_dotenv
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from run_log import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+log = get_logger("seen_filter")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+SEEN_BLOOM_FILE = os.getenv("SEEN_BLOOM_FILE", "seen_jobs.bloom")
+SEEN_DB_FILE = os.getenv("SEEN_DB_FILE", "seen_jobs.sqlite3")
+SEEN_CAPACITY = int(os.getenv("SEEN_CAPACITY", "2000000"))
+SEEN_FP_RATE = 0.01
+SKIP_SEEN_JOBS = os.getenv("SKIP_SEEN_JOBS", "true").lower() == "true"
+
+PORTAL_HOSTS = {
+    "naukri.com": "naukri",
+    "hirist.tech": "hirist",
+    "hirist.com": "hirist",
+}
+# Both portals end job URLs in a numeric id: ...-120324009876, ...-1234567.html
+JOB_ID_RE = re.compile(r"-(\d{6,})(?:\.html?)?(?:[/?#]|$)")
+
+HEADER = struct.Struct("<8sQIQ")   # magic, bits, hashes, approximate count
+MAGIC = b"JOBBLOOM"
+
+
+def canonical_url(url):
+    """`url` without query string, fragment or trailing slash; host lowercased."""
+    parts = urlsplit((url or "").strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, "", ""))
+
+
+def portal_of(url):
+    host = urlsplit(url or "").netloc.lower()
+    for suffix, portal in PORTAL_HOSTS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return portal
+    return None
+
+
+def job_id_from_url(url):
+    """The stable job id of a Naukri/Hirist job URL; the canonical URL when it has none."""
+    m = JOB_ID_RE.search(url or "")
+    return m.group(1) if m else canonical_url(url)
+
+
+def job_key(url, portal=None):
+    """'<portal>:<job id>' - the same for every href of one job."""
+    return f"{portal or portal_of(url) or 'naukri'}:{job_id_from_url(url)}"
+
+
+# -----------------------------
+# Bloom filter
+# -----------------------------
+def bloom_size(capacity, fp_rate):
+    """(bits, hashes) for `capacity` keys at `fp_rate` false positives."""
+    bits = max(64, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+    bits = (bits + 63) // 64 * 64
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFile:
+    def __init__(self, path, capacity=SEEN_CAPACITY, fp_rate=SEEN_FP_RATE):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER.size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if not exists:
+            bits, hashes = bloom_size(capacity, fp_rate)
+            with self._locked():
+                if os.fstat(self.fd).st_size < HEADER.size:   # nobody beat us to it
+                    os.ftruncate(self.fd, HEADER.size + bits // 8)
+                    os.pwrite(self.fd, HEADER.pack(MAGIC, bits, hashes, 0), 0)
+        self.mm = mmap.mmap(self.fd, os.fstat(self.fd).st_size)
+        magic, self.bits, self.hashes, _ = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a seen-jobs Bloom file")
+        self.capacity = int(self.bits * (math.log(2) ** 2) / -math.log(fp_rate))
+
+    def _locked(self):
+        return _FileLock(self.fd)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key):
+        mm = self.mm
+        return all(mm[HEADER.size + p // 8] & (1 << (p % 8)) for p in self._positions(key))
+
+    def add(self, keys):
+        """Set the bits of `keys`; returns how many were not (probably) present before."""
+        added = 0
+        with self._locked():
+            mm = self.mm
+            for key in keys:
+                new = False
+                for p in self._positions(key):
+                    i, bit = HEADER.size + p // 8, 1 << (p % 8)
+                    if not mm[i] & bit:
+                        mm[i] |= bit
+                        new = True
+                added += new
+            if added:
+                magic, bits, hashes, count = HEADER.unpack_from(mm, 0)
+                HEADER.pack_into(mm, 0, magic, bits, hashes, count + added)
+        return added
+
+    @property
+    def count(self):
+        return HEADER.unpack_from(self.mm, 0)[3]
+
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+        os.close(self.fd)
+
+
+class _FileLock:
+    def __init__(self, fd):
+        self.fd = fd
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+
+# -----------------------------
+# Bloom + exact confirm
+# -----------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key        TEXT PRIMARY KEY,
+    first_seen REAL NOT NULL,
+    verdict    TEXT
+) WITHOUT ROWID;
+"""
+
+
+class SeenFilter:
+    def __init__(self, bloom_path=SEEN_BLOOM_FILE, db_path=SEEN_DB_FILE, capacity=SEEN_CAPACITY):
+        self.bloom_path = bloom_path
+        self.db_path = db_path
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self._bloom = None
+        self._db = None
+        self.bloom_negatives = 0   # answered by the Bloom filter alone
+        self.confirms = 0          # Bloom said maybe -> SQLite lookup
+        self.false_positives = 0
+
+    def _open(self):
+        if self._bloom is None:
+            self._bloom = BloomFile(self.bloom_path, self.capacity)
+            self._db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+            if self._bloom.count > self._bloom.capacity:
+                log.warning(f"[SEEN] {self._bloom.count} keys in a Bloom filter sized for "
+                            f"{self._bloom.capacity}; run `python seen_filter.py rebuild`")
+
+    def __contains__(self, key):
+        with self.lock:
+            self._open()
+            if key not in self._bloom:
+                self.bloom_negatives += 1
+                return False
+            self.confirms += 1
+            found = self._db.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+            self.false_positives += not found
+            return found
+
+    def add(self, keys, verdict=None):
+        keys = list(keys)
+        if not keys:
+            return
+        with self.lock:
+            self._open()
+            now = time.time()
+            # exact table first: a Bloom hit must always be confirmable
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO seen (key, first_seen, verdict) VALUES (?, ?, ?)",
+                    [(k, now, verdict) for k in keys],
+                )
+            self._bloom.add(keys)
+
+    def stats(self):
+        with self.lock:
+            self._open()
+            exact = self._db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+            bloom = self._bloom
+            return {
+                "keys": exact,
+                "bloom_keys": bloom.count,
+                "bloom_capacity": bloom.capacity,
+                "bloom_bytes": os.path.getsize(self.bloom_path),
+                "hashes": bloom.hashes,
+                "bloom_negatives": self.bloom_negatives,
+                "confirms": self.confirms,
+                "false_positives": self.false_positives,
+            }
+
+    def log_report(self):
+        checks = self.bloom_negatives + self.confirms
+        if not checks:
+            return
+        log.info(
+            f"[SEEN] {checks} seen checks: {self.bloom_negatives} answered by the Bloom filter, "
+            f"{self.confirms} confirmed in {self.db_path} ({self.false_positives} false positives)",
+            extra={"seen_checks": checks, "seen_bloom_negatives": self.bloom_negatives,
+                   "seen_confirms": self.confirms, "seen_false_positives": self.false_positives},
+        )
+
+    def close(self):
+        with self.lock:
+            if self._bloom is not None:
+                self._bloom.close()
+                self._db.close()
+                self._bloom = self._db = None
+
+    def rebuild(self, capacity=None):
+        """Recreate the Bloom file from the exact table (e.g. with a larger capacity)."""
+        self.close()
+        capacity = capacity or self.capacity
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.executescript(SCHEMA)
+        keys = [row[0] for row in db.execute("SELECT key FROM seen")]
+        db.close()
+        tmp = f"{self.bloom_path}.tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        bloom = BloomFile(tmp, max(capacity, len(keys)))
+        bloom.add(keys)
+        bloom.close()
+        os.replace(tmp, self.bloom_path)
+        self.capacity = capacity
+        return len(keys)
+
+
+SEEN_FILTER = SeenFilter()
+
+
+class VisitedJobs:
+    """
+    Crawl-time dedupe by job key: `url in visited` / visited.add(url) like the
+    plain set it replaces, plus jobs finished on earlier runs (SEEN_FILTER).
+    """
+
+    def __init__(self, seen=SEEN_FILTER if SKIP_SEEN_JOBS else None, portal=None):
+        self.seen = seen
+        self.portal = portal
+        self.keys = set()
+
+    def __contains__(self, url):
+        key = job_key(url, self.portal)
+        return key in self.keys or (self.seen is not None and key in self.seen)
+
+    def add(self, url):
+        self.keys.add(job_key(url, self.portal))
+
+    def mark_done(self, url, verdict=None):
+        """`url` got a final verdict; later runs skip it."""
+        if self.seen is not None:
+            self.seen.add([job_key(url, self.portal)], verdict)
+
+
+def main(argv):
+    args = argv[1:]
+    if args[:1] == ["stats"]:
+        for k, v in SEEN_FILTER.stats().items():
+            print(f"{k:>16}: {v}")
+        return 0
+    if args[:1] == ["check"] and len(args) > 1:
+        for url in args[1:]:
+            key = job_key(url)
+            print(f"{'seen' if key in SEEN_FILTER else 'new ':4}  {key}  {canonical_url(url)}")
+        return 0
+    if args[:1] == ["rebuild"]:
+        capacity = int(args[1]) if len(args) > 1 else None
+        n = SEEN_FILTER.rebuild(capacity)
+        print(f"rebuilt {SEEN_BLOOM_FILE} with {n} keys")
+        return 0
+    print("usage: python seen_filter.py stats | check <url> [...] | rebuild [capacity]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
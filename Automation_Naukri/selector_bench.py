@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+selector_bench.py
+Microbenchmark: portal_selectors registry vs the XPaths it replaced.
+
+    python selector_bench.py                  # saved pages as they are
+    python selector_bench.py --pad 500        # clone the filler block 500x (long JD / big profile)
+    python selector_bench.py --iterations 2000
+
+Each page in fixtures/pages/ marks the element a lookup should return with
+data-expect="<registry key>"; a page without that marker expects no match.
+Both lookups run inside the page (headless Chrome, one execute_script per
+case), so the timings are query cost only, without WebDriver round trips.
+"""
+
+import argparse
+import os
+import sys
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from portal_selectors import FIND_JS, compiled
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+# The expressions these lookups used before the registry (tried in order).
+LEGACY = {
+    ("naukri", "already_applied"): [
+        "//*[contains(translate(., 'APPLIED', 'applied'),'applied')]",
+    ],
+    ("naukri", "apply_button"): [
+        "//button[contains(., 'Apply') or contains(., 'APPLY')]"
+        " | //a[contains(., 'Apply') or contains(., 'APPLY')]",
+    ],
+    ("naukri", "resume_headline_edit"): [
+        "//span[contains(translate(., 'RESUME HEADLINE', 'resume headline'), 'resume headline')]/following::span[contains(@class,'edit')][1]",
+        "//*[contains(translate(., 'RESUME HEADLINE', 'resume headline'), 'resume headline')]/ancestor::section[1]//span[contains(@class,'edit') or contains(.,'Edit')][1]",
+        "//*[contains(translate(., 'RESUME HEADLINE', 'resume headline'), 'resume headline')]/ancestor::div[1]//span[contains(@class,'edit') or contains(.,'Edit')][1]",
+        "//*[contains(.,'Resume headline') or contains(.,'Resume Headline')]/following::span[contains(@class,'edit') or contains(.,'Edit')][1]",
+    ],
+    ("naukri", "resume_headline_editor"): [
+        "//textarea[contains(@placeholder,'Describe')]",
+        "//textarea[contains(translate(@placeholder, 'HEADLINE', 'headline'),'headline')]",
+        "//textarea[contains(@class,'resume') or contains(@id,'resume')]",
+        "//textarea",
+        "//div[@contenteditable='true']",
+        "//div[contains(@class,'ql-editor')]",
+        "//div[contains(@class,'resume') and @contenteditable='true']",
+    ],
+    ("hirist", "jobseeker_login"): [
+        "//button[contains(.,'Jobseeker Login') or contains(.,'Jobseeker') or //a[contains(.,'Jobseeker Login')]]",
+    ],
+}
+
+# page -> lookups to run on it
+CASES = {
+    "naukri_job_applied.html": [("naukri", "already_applied"), ("naukri", "apply_button")],
+    "naukri_job_open.html": [("naukri", "already_applied"), ("naukri", "apply_button")],
+    "naukri_profile.html": [("naukri", "resume_headline_edit"), ("naukri", "resume_headline_editor")],
+    "hirist_home.html": [("hirist", "jobseeker_login")],
+}
+
+PAD_JS = """
+const filler = document.querySelector("[data-bench-filler]");
+for (let i = 0; filler && i < arguments[0]; i++)
+    filler.parentNode.insertBefore(filler.cloneNode(true), filler.nextSibling);
+document.querySelectorAll("[data-bench-filler] [data-expect]").forEach((el, i) => {
+    if (i) el.removeAttribute("data-expect");   // keep the expected element unique
+});
+return document.getElementsByTagName("*").length;
+"""
+
+BENCH_JS = """
+const legacy = arguments[0], alternatives = arguments[1], key = arguments[2], iterations = arguments[3];
+const findFn = new Function(arguments[4]);
+const legacyFind = () => {
+    for (const xp of legacy) {
+        const el = document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (el) return el;
+    }
+    return null;
+};
+const registryFind = () => findFn(alternatives, false, false);
+const expected = document.querySelector(`[data-expect="${key}"]`);
+const correct = el => el === expected;
+const time = fn => {
+    fn();  // warm-up (regex cache, style resolution)
+    const t0 = performance.now();
+    for (let i = 0; i < iterations; i++) fn();
+    return (performance.now() - t0) / iterations;
+};
+return {
+    legacy_ms: time(legacyFind), registry_ms: time(registryFind),
+    legacy_ok: correct(legacyFind()), registry_ok: correct(registryFind()),
+};
+"""
+
+
+def start_driver():
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    return webdriver.Chrome(options=chrome_options)
+
+
+def run(driver, pad, iterations):
+    rows = []
+    for page, cases in CASES.items():
+        driver.get("file://" + os.path.join(PAGES_DIR, page))
+        nodes = driver.execute_script(PAD_JS, pad)
+        for portal, key in cases:
+            r = driver.execute_script(
+                BENCH_JS, LEGACY[(portal, key)], compiled(portal, key), key, iterations, FIND_JS,
+            )
+            rows.append((page, nodes, f"{portal}.{key}", r))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--pad", type=int, default=0, help="extra copies of the filler block per page")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    driver = start_driver()
+    try:
+        rows = run(driver, args.pad, args.iterations)
+    finally:
+        driver.quit()
+
+    print(f"{'page':<24} {'nodes':>6} {'lookup':<30} {'legacy ms':>10} {'scoped ms':>10} {'x':>6}  legacy/scoped correct")
+    legacy_ok = registry_ok = 0
+    for page, nodes, lookup, r in rows:
+        speedup = r["legacy_ms"] / r["registry_ms"] if r["registry_ms"] else float("inf")
+        legacy_ok += r["legacy_ok"]
+        registry_ok += r["registry_ok"]
+        print(
+            f"{page:<24} {nodes:>6} {lookup:<30} {r['legacy_ms']:>10.4f} {r['registry_ms']:>10.4f} "
+            f"{speedup:>6.1f}  {'yes' if r['legacy_ok'] else 'NO':>3}/{'yes' if r['registry_ok'] else 'NO'}"
+        )
+    print(f"\naccuracy: legacy {legacy_ok}/{len(rows)}, scoped {registry_ok}/{len(rows)}")
+    return 0 if registry_ok == len(rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
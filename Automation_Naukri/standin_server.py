@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+standin_server.py
+Tiny local stand-in for the portal listing pages, fed by recorded payloads.
+
+    python standin_server.py [port]
+
+    http://127.0.0.1:8765/naukri   -> listing page that XHR-loads /jobapi/v3/search
+    http://127.0.0.1:8765/hirist   -> listing page that XHR-loads /jobfeed/jobs
+
+The JSON endpoints return the files in ./fixtures unchanged, and the listing
+pages render one anchor per job, so both the CDP capture path and the DOM
+scraping path can be exercised without touching the real sites.
+"""
+
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+API_ROUTES = {
+    "/jobapi/v3/search": "naukri_search_api.json",
+    "/jobfeed/jobs": "hirist_jobfeed_api.json",
+}
+
+LISTING_PAGE = """<!doctype html>
+<html><head><title>{portal} stand-in</title></head>
+<body>
+<div id="list"></div>
+<script>
+fetch("{api}").then(r => r.json()).then(data => {{
+  const items = data.jobDetails || data.data || [];
+  const list = document.getElementById("list");
+  for (const job of items) {{
+    const card = document.createElement("article");
+    card.className = "jobTuple";
+    card.setAttribute("data-job-id", job.jobId || job.id);
+    const a = document.createElement("a");
+    a.href = job.jdURL || job.jobDetailUrl;
+    a.title = job.title;
+    a.textContent = job.title;
+    card.appendChild(a);
+    list.appendChild(card);
+  }}
+}});
+</script>
+</body></html>
+"""
+
+LISTING_ROUTES = {
+    "/naukri": ("naukri", "/jobapi/v3/search"),
+    "/hirist": ("hirist", "/jobfeed/jobs"),
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path in API_ROUTES:
+            with open(os.path.join(FIXTURES_DIR, API_ROUTES[path]), "rb") as f:
+                self._send(200, "application/json", f.read())
+        elif path in LISTING_ROUTES:
+            portal, api = LISTING_ROUTES[path]
+            self._send(200, "text/html", LISTING_PAGE.format(portal=portal, api=api).encode("utf-8"))
+        else:
+            self._send(404, "application/json", json.dumps({"error": "not found"}).encode("utf-8"))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        print(f"[STANDIN] {self.address_string()} {fmt % args}")
+
+
+def serve(port=8765):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    print(f"[STANDIN] serving fixtures on http://127.0.0.1:{port}/")
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    try:
+        serve(port).serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The scripts are flat modules next to this directory, imported by name.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep test runs from appending to the real run log.
+os.environ.setdefault("LOG_FILE", os.devnull)
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+import apply_quota
+from apply_quota import ApplyQuota, allocate, parse_windows, window_hours, window_index
+
+
+class FixedClock:
+    """Stands in for the `time` module inside apply_quota, frozen at one local hour."""
+
+    def __init__(self, hour):
+        lt = time.localtime()
+        self.now = time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday, hour, 30, 0, 0, 0, -1))
+
+    def time(self):
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@pytest.fixture
+def quota(tmp_path, monkeypatch):
+    def make(hour, daily=12):
+        monkeypatch.setattr(apply_quota, "time", FixedClock(hour))
+        monkeypatch.setattr(apply_quota, "observed_yield", lambda portals: {
+            (p, w): (0, 0) for p in portals for w in range(len(apply_quota.QUOTA_WINDOWS))
+        })
+        return ApplyQuota(str(tmp_path / "quota.sqlite3"), daily=daily)
+    return make
+
+
+def test_parse_windows_sorts_and_starts_at_midnight():
+    assert parse_windows("0,9,13,18") == [0, 9, 13, 18]
+    assert parse_windows("18, 9,0,9") == [0, 9, 18]
+    assert parse_windows("9,13,18") == [0, 9, 13, 18]
+
+
+@pytest.mark.parametrize("spec", ["", "a,b", "24", "-1,9"])
+def test_parse_windows_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_windows(spec)
+
+
+def test_every_hour_falls_in_a_window():
+    windows = [0, 9, 13, 18]
+    assert [window_index(h, windows) for h in (0, 8, 9, 12, 13, 17, 18, 23)] == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert sum(window_hours(windows)) == 24
+
+
+def test_allocate_sums_to_the_daily_cap():
+    windows = [0, 9, 13, 18]
+    cells = {(p, w): (0, 0) for p in ("naukri", "hirist") for w in range(4)}
+    budgets = allocate(97, cells, windows)
+    assert sum(b for b, _ in budgets.values()) == 97
+    # no history: split by window length
+    assert budgets[("naukri", 0)][0] > budgets[("naukri", 1)][0]
+
+
+def test_allocate_favours_higher_yield():
+    windows = [0, 12]
+    cells = {("naukri", 0): (30, 100), ("naukri", 1): (30, 100),
+             ("hirist", 0): (2, 100), ("hirist", 1): (2, 100)}
+    budgets = allocate(100, cells, windows)
+    assert budgets[("naukri", 0)][0] > budgets[("hirist", 0)][0]
+    assert budgets[("naukri", 0)][1] > budgets[("hirist", 0)][1]
+
+
+def test_last_window_shares_whatever_is_left(quota):
+    q = quota(hour=20)
+    slots = [q.reserve("naukri") for _ in range(12)]
+    assert all(slot is not None for slot in slots)
+    assert q.reserve("hirist") is None
+    q.finish(slots[0], applied=False)     # handed back
+    assert q.reserve("hirist") is not None
+    assert q.remaining() == 0
+
+
+def test_earlier_window_caps_each_portal_at_its_budget_so_far(quota):
+    q = quota(hour=10)
+    taken = 0
+    while q.reserve("naukri") is not None:
+        taken += 1
+    assert 0 < taken < 12
+    assert q.reserve("hirist") is not None
+
+
+def test_processes_share_one_daily_cap(quota, tmp_path):
+    q = quota(hour=20, daily=5)
+    other = ApplyQuota(str(tmp_path / "quota.sqlite3"), daily=5)
+    got = [q.reserve("naukri"), other.reserve("naukri"), q.reserve("hirist"),
+           other.reserve("hirist"), q.reserve("naukri"), other.reserve("naukri")]
+    assert sum(slot is not None for slot in got) == 5
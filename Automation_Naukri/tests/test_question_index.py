@@ -0,0 +1,95 @@
+import os
+
+from question_index import QuestionIndex, split_questions, tokenize
+
+HEADED = """# Kubernetes Interview Questions
+
+## Basics
+
+### 1. What is a Pod?
+The smallest deployable unit; one or more containers sharing a network namespace.
+
+### 2. How does a Deployment roll back?
+kubectl rollout undo restores the previous ReplicaSet.
+"""
+
+NUMBERED = """Terraform questions
+
+1. What is Terraform state?
+State maps resources in the configuration to real infrastructure.
+2. How do you lock remote state?
+Use a backend with locking, e.g. S3 with a DynamoDB table.
+"""
+
+LOOSE = """argocd notes
+How to achieve GitOps?
+Keep the desired state in git and let ArgoCD sync it.
+NAME READY STATUS
+What is an ArgoCD Application?
+A CRD pointing at a repo path and a destination cluster.
+"""
+
+
+def write(root, relpath, text):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def build(tmp_path):
+    root = str(tmp_path / "questions")
+    write(root, "Container_Tools/Kubernetes_Interview_Questions.md", HEADED)
+    write(root, "IaC/Terraform_Interview_Questions.md", NUMBERED)
+    write(root, "argocd/1.md", LOOSE)
+    index = QuestionIndex(str(tmp_path / "question_index.json"), root)
+    index.load()
+    return index, root
+
+
+def test_tokenize_applies_aliases_and_stopwords():
+    assert tokenize("How do I roll back a K8s deployment in TF?") == ["roll", "back", "kubernetes", "deployment",
+                                                                     "terraform"]
+
+
+def test_split_questions_in_all_three_layouts():
+    assert [(q, s) for _, q, s, _ in split_questions(HEADED)] == [
+        ("What is a Pod?", "Basics"), ("How does a Deployment roll back?", "Basics")]
+    assert [q for _, q, _, _ in split_questions(NUMBERED)] == [
+        "What is Terraform state?", "How do you lock remote state?"]
+    loose = split_questions(LOOSE)
+    assert [q for _, q, _, _ in loose] == ["How to achieve GitOps?", "What is an ArgoCD Application?"]
+    assert "NAME READY STATUS" in loose[0][3]
+
+
+def test_search_ranks_the_matching_question_first(tmp_path):
+    index, _ = build(tmp_path)
+    assert len(index.docs) == 6
+    hits = index.search("deployment rollback undo", n=3)
+    assert hits[0][1]["title"] == "How does a Deployment roll back?"
+    assert hits[0][1]["tool"] == "Kubernetes"
+    assert index.search("dynamodb locking")[0][1]["title"] == "How do you lock remote state?"
+    assert index.search("gitops")[0][1]["tool"] == "argocd"
+    assert index.search("nothing matches zzzz") == []
+
+
+def test_search_limits_hits_per_tool(tmp_path):
+    index, _ = build(tmp_path)
+    hits = index.search("what is kubernetes terraform argocd", n=10, per_tool=1)
+    tools = [doc["tool"] for _, doc in hits]
+    assert len(tools) == len(set(tools))
+
+
+def test_refresh_reindexes_only_changed_files(tmp_path):
+    index, root = build(tmp_path)
+    reloaded = QuestionIndex(index.path, root)
+    assert reloaded.load() == []
+    assert len(reloaded.docs) == 6
+
+    write(root, "IaC/Terraform_Interview_Questions.md", NUMBERED + "3. What is a Terraform module?\nA reusable unit.\n")
+    os.remove(os.path.join(root, "argocd/1.md"))
+    changed = reloaded.load()
+    assert sorted(changed) == ["IaC/Terraform_Interview_Questions.md", "argocd/1.md"]
+    assert len(reloaded.docs) == 5
+    assert reloaded.search("terraform module")[0][1]["title"] == "What is a Terraform module?"
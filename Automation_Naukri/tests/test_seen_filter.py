@@ -0,0 +1,86 @@
+from seen_filter import BloomFile, SeenFilter, VisitedJobs, canonical_url, job_id_from_url, job_key
+
+
+def test_job_key_ignores_tracking_parameters():
+    base = "https://www.naukri.com/job-listings-devops-engineer-acme-bengaluru-5-to-8-years-120324009876"
+    assert job_key(base) == "naukri:120324009876"
+    assert job_key(base + "?src=jobsearchDesk&sid=1712&xp=3") == job_key(base)
+    assert job_key(base + "/#apply") == job_key(base)
+
+
+def test_job_key_per_portal():
+    assert job_key("https://www.hirist.tech/j/sre-lead-1234567.html?ref=feed") == "hirist:1234567"
+    assert job_key("https://HIRIST.COM/j/sre-lead-1234567") == "hirist:1234567"
+    assert job_key("https://www.naukri.com/job-listings-x-1234567") != job_key("https://www.hirist.tech/j/x-1234567")
+
+
+def test_urls_without_a_job_id_fall_back_to_the_canonical_url():
+    url = "https://WWW.Naukri.com/mnjuser/recommendedjobs/?utm=1#top"
+    assert canonical_url(url) == "https://www.naukri.com/mnjuser/recommendedjobs"
+    assert job_id_from_url(url) == canonical_url(url)
+    assert job_id_from_url("https://www.naukri.com/job-listings-x-12345") == canonical_url(
+        "https://www.naukri.com/job-listings-x-12345")  # too short to be a job id
+
+
+def test_bloom_has_no_false_negatives(tmp_path):
+    bloom = BloomFile(str(tmp_path / "seen.bloom"), capacity=1000)
+    keys = [f"naukri:{i}" for i in range(1000)]
+    added = bloom.add(keys)
+    assert added > 980   # a few new keys already look present (false positives)
+    assert all(key in bloom for key in keys)
+    assert bloom.add(keys[:10]) == 0
+    assert bloom.count == added
+    bloom.close()
+
+
+def test_bloom_false_positive_rate_is_near_target(tmp_path):
+    bloom = BloomFile(str(tmp_path / "seen.bloom"), capacity=2000, fp_rate=0.01)
+    bloom.add(f"naukri:{i}" for i in range(2000))
+    false_positives = sum(f"hirist:{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.03
+    bloom.close()
+
+
+def test_bloom_file_persists(tmp_path):
+    path = str(tmp_path / "seen.bloom")
+    bloom = BloomFile(path, capacity=100)
+    bloom.add(["naukri:1"])
+    bloom.close()
+    reopened = BloomFile(path, capacity=999999)   # existing file keeps its own size
+    assert "naukri:1" in reopened and reopened.count == 1
+    assert reopened.bits == bloom.bits
+    reopened.close()
+
+
+def test_seen_filter_confirms_against_the_exact_table(tmp_path):
+    seen = SeenFilter(str(tmp_path / "seen.bloom"), str(tmp_path / "seen.sqlite3"), capacity=1000)
+    seen.add(["naukri:1", "naukri:2"], verdict="applied")
+    assert "naukri:1" in seen
+    assert "naukri:3" not in seen
+    stats = seen.stats()
+    assert stats["keys"] == 2 and stats["confirms"] >= 1
+    assert stats["bloom_negatives"] + stats["confirms"] == 2
+    seen.close()
+
+
+def test_rebuild_keeps_every_key(tmp_path):
+    seen = SeenFilter(str(tmp_path / "seen.bloom"), str(tmp_path / "seen.sqlite3"), capacity=100)
+    keys = [f"naukri:{i}" for i in range(300)]
+    seen.add(keys)
+    assert seen.rebuild(capacity=1000) == 300
+    assert all(key in seen for key in keys)
+    assert seen.stats()["bloom_capacity"] >= 1000
+    seen.close()
+
+
+def test_visited_jobs_only_remembers_finished_jobs_across_runs(tmp_path):
+    seen = SeenFilter(str(tmp_path / "seen.bloom"), str(tmp_path / "seen.sqlite3"), capacity=1000)
+    url = "https://www.naukri.com/job-listings-sre-120324009876?src=a"
+    run = VisitedJobs(seen=seen)
+    run.add(url)
+    assert url.replace("src=a", "src=b") in run
+    assert url not in VisitedJobs(seen=seen)       # only visited, no verdict
+    run.mark_done(url, "skipped")
+    assert url in VisitedJobs(seen=seen)
+    assert url not in VisitedJobs(seen=None)
+    seen.close()
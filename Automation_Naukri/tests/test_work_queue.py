@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from redis_standin import serve
+from work_queue import MAX_ATTEMPTS, RespClient, SqliteQueue, open_queue
+
+
+@pytest.fixture(scope="module")
+def standin():
+    server = serve(0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def queue(request, tmp_path):
+    if request.param == "sqlite":
+        q = SqliteQueue(str(tmp_path / "work_queue.sqlite3"))
+    else:
+        q = open_queue(request.getfixturevalue("standin"))
+    q.clear()
+    yield q
+    q.clear()
+
+
+def test_enqueue_ignores_known_keys(queue):
+    assert queue.enqueue("apply:naukri", "job-1", {"url": "u1"})
+    assert not queue.enqueue("apply:naukri", "job-1", {"url": "other"})
+
+
+def test_leased_item_is_invisible_until_it_expires(queue):
+    queue.enqueue("apply:naukri", "job-1", {"url": "u1"})
+    first = queue.lease(["apply:naukri"], visibility=0.3)
+    assert first.payload == {"url": "u1"} and first.attempts == 1
+    assert queue.lease(["apply:naukri"]) is None
+    time.sleep(0.4)
+    second = queue.lease(["apply:naukri"], visibility=30)
+    assert second.key == "job-1" and second.attempts == 2
+
+
+def test_stale_lease_cannot_ack_or_nack(queue):
+    queue.enqueue("apply:naukri", "job-1", {})
+    stale = queue.lease(["apply:naukri"], visibility=0.2)
+    time.sleep(0.3)
+    current = queue.lease(["apply:naukri"], visibility=30)
+    assert not queue.ack(stale)
+    assert not queue.nack(stale)
+    assert queue.ack(current)
+    assert queue.lease(["apply:naukri"]) is None
+
+
+def test_ack_only_once(queue):
+    queue.enqueue("crawl:naukri", "search-1", {})
+    lease = queue.lease(["crawl:naukri"])
+    assert queue.ack(lease)
+    assert not queue.ack(lease)
+
+
+def test_nack_redelivers_after_delay(queue):
+    queue.enqueue("crawl:naukri", "search-1", {"query": "sre"})
+    lease = queue.lease(["crawl:naukri"])
+    assert queue.nack(lease, delay=0.3)
+    assert queue.lease(["crawl:naukri"]) is None
+    time.sleep(0.4)
+    again = queue.lease(["crawl:naukri"])
+    assert again.payload == {"query": "sre"} and again.attempts == 2
+
+
+def test_item_is_dead_after_max_attempts(queue):
+    queue.enqueue("crawl:naukri", "search-1", {})
+    for _ in range(MAX_ATTEMPTS):
+        lease = queue.lease(["crawl:naukri"])
+        assert lease is not None
+        assert queue.nack(lease, delay=0)
+    assert queue.lease(["crawl:naukri"]) is None
+    assert queue.stats().get("dead") == 1
+
+
+def test_kinds_are_leased_separately(queue):
+    queue.enqueue("apply:hirist", "job-2", {})
+    assert queue.lease(["apply:naukri"]) is None
+    assert queue.lease(["apply:naukri", "apply:hirist"]).key == "job-2"
+
+
+def test_first_apply_claim_wins(queue):
+    assert queue.claim_apply("job-1", "worker-a")
+    assert not queue.claim_apply("job-1", "worker-b")
+
+
+def test_hash_cas_aborts_when_the_watched_hash_changes(standin):
+    port = int(standin.rsplit(":", 1)[1].split("/")[0])
+    a, b = RespClient("127.0.0.1", port), RespClient("127.0.0.1", port)
+    a.execute("DEL", "cas")
+    a.execute("HSET", "cas", "token", "t1")
+    assert a.hash_cas("cas", "token", "other", ("HSET", "cas", "state", "done")) is None
+
+    # another client rewrites the hash between WATCH and EXEC
+    a.execute("WATCH", "cas")
+    a.execute("MULTI")
+    a.execute("HSET", "cas", "state", "done")
+    b.execute("HSET", "cas", "token", "t2")
+    assert a.execute("EXEC") is None
+    assert b.execute("HGET", "cas", "state") is None
+
+    assert a.hash_cas("cas", "token", "t2", ("HSET", "cas", "state", "done")) == [1]
+    assert b.execute("HGET", "cas", "state") == "done"
@@ -8,6 +8,9 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 
+from form_writer import read_fields, write_fields
+from portal_selectors import find
+
 # =========================
 # Load configuration from .env
 # =========================
@@ -77,67 +80,20 @@ def login(driver):
 # =========================
 def find_resume_headline_edit_button(driver):
     """
-    Try multiple XPaths to find the Resume Headline edit button.
-    Returns the element or None.
+    Find the Resume Headline edit button inside the headline card (see
+    portal_selectors.REGISTRY). Returns the element, scrolled into view, or None.
     """
-    xpaths = [
-        # "Resume headline" text followed by edit icon
-        "//span[contains(translate(., 'RESUME HEADLINE', 'resume headline'), 'resume headline')]/following::span[contains(@class,'edit')][1]",
-
-        # In a section/card
-        "//*[contains(translate(., 'RESUME HEADLINE', 'resume headline'), 'resume headline')]/ancestor::section[1]//span[contains(@class,'edit') or contains(.,'Edit')][1]",
-
-        # In a div container
-        "//*[contains(translate(., 'RESUME HEADLINE', 'resume headline'), 'resume headline')]/ancestor::div[1]//span[contains(@class,'edit') or contains(.,'Edit')][1]",
-
-        # Fallback
-        "//*[contains(.,'Resume headline') or contains(.,'Resume Headline')]/following::span[contains(@class,'edit') or contains(.,'Edit')][1]"
-    ]
-
-    for xp in xpaths:
-        try:
-            elem = driver.find_element(By.XPATH, xp)
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", elem)
-            return elem
-        except Exception:
-            continue
-    return None
+    return find(driver, "naukri", "resume_headline_edit", scroll=True)
 
 
 def find_resume_headline_editor(driver):
     """
     Return (element, mode) where mode is 'textarea' or 'contenteditable'.
     """
-    # Try textarea first
-    textarea_xpaths = [
-        "//textarea[contains(@placeholder,'Describe')]",
-        "//textarea[contains(translate(@placeholder, 'HEADLINE', 'headline'),'headline')]",
-        "//textarea[contains(@class,'resume') or contains(@id,'resume')]",
-        "//textarea"
-    ]
-    for xp in textarea_xpaths:
-        try:
-            elem = driver.find_element(By.XPATH, xp)
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", elem)
-            return elem, "textarea"
-        except Exception:
-            continue
-
-    # Then try contenteditable divs
-    contenteditable_xpaths = [
-        "//div[@contenteditable='true']",
-        "//div[contains(@class,'ql-editor')]",
-        "//div[contains(@class,'resume') and @contenteditable='true']",
-    ]
-    for xp in contenteditable_xpaths:
-        try:
-            elem = driver.find_element(By.XPATH, xp)
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", elem)
-            return elem, "contenteditable"
-        except Exception:
-            continue
-
-    return None, None
+    elem = find(driver, "naukri", "resume_headline_editor", scroll=True)
+    if elem is None:
+        return None, None
+    return elem, "textarea" if elem.tag_name.lower() == "textarea" else "contenteditable"
 
 
 def build_new_headline_text(old_text: str) -> str:
@@ -211,20 +167,14 @@ def refresh_profile_resume_headline(driver):
         return
 
     try:
-        if mode == "textarea":
-            old_text = editor.get_attribute("value") or ""
-        else:
-            old_text = editor.text or ""
+        # textarea or contenteditable: read and write each in one script call
+        old_text = read_fields(driver, [editor])[0] or ""
 
-        print(f"[DEBUG] Old headline: {old_text!r}")
+        print(f"[DEBUG] Old headline ({mode}): {old_text!r}")
         new_text = build_new_headline_text(old_text)
         print(f"[DEBUG] New headline: {new_text!r}")
 
-        if mode == "textarea":
-            editor.clear()
-            editor.send_keys(new_text)
-        else:
-            driver.execute_script("arguments[0].innerText = arguments[1];", editor, new_text)
+        write_fields(driver, [(editor, new_text)])
 
         time.sleep(1)
 
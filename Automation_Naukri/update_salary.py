@@ -9,6 +9,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+from form_writer import read_fields, write_fields
+
 # =========================
 # Load credentials from .env
 # =========================
@@ -109,23 +111,24 @@ def update_salary_plus_one(driver):
         print("[ERROR] Current salary field not found. Cannot update salary.")
         return
 
-    # helper to get input by label text
-    def get_input_by_label(text):
-        xpath = f"//label[contains(normalize-space(.),'{text}')]/following::input[1]"
-        return driver.find_element(By.XPATH, xpath)
+    def input_by_label(text):
+        return f"//label[contains(normalize-space(.),'{text}')]/following::input[1]"
 
-    try:
-        current_input = get_input_by_label("Current salary")
-        fixed_input = get_input_by_label("Fixed salary")
-        variable_input = get_input_by_label("Variable salary")
-    except Exception as e:
-        print(f"[ERROR] Could not locate salary input fields: {e}")
+    targets = {
+        "current": input_by_label("Current salary"),
+        "fixed": input_by_label("Fixed salary"),
+        "variable": input_by_label("Variable salary"),
+    }
+
+    # 3) Read existing values (one script call for all three inputs)
+    raw = dict(zip(targets, read_fields(driver, targets.values())))
+    if any(v is None for v in raw.values()):
+        missing = [k for k, v in raw.items() if v is None]
+        print(f"[ERROR] Could not locate salary input fields: {missing}")
         return
 
-    # 3) Read existing values
-    current = parse_salary(current_input.get_attribute("value"))
-    fixed = parse_salary(fixed_input.get_attribute("value"))
-    variable = parse_salary(variable_input.get_attribute("value"))
+    before = {k: parse_salary(v) for k, v in raw.items()}
+    current, fixed, variable = before["current"], before["fixed"], before["variable"]
 
     print(f"[DEBUG] Existing salary: current={current}, fixed={fixed}, variable={variable}")
 
@@ -140,16 +143,12 @@ def update_salary_plus_one(driver):
 
     print(f"[DEBUG] New salary (+₹1): current={current}, fixed={fixed}, variable={variable}")
 
-    # 5) Write new values
-    def set_field(elem, value: int):
-        elem.click()
-        elem.clear()
-        elem.send_keys(str(value))
-
+    # 5) Write only the values that changed, in one script call
+    after = {"current": current, "fixed": fixed, "variable": variable}
+    changes = [(targets[k], after[k]) for k in targets if after[k] != before[k]]
     try:
-        set_field(current_input, current)
-        set_field(fixed_input, fixed)
-        set_field(variable_input, variable)
+        write_fields(driver, changes)
+        print(f"[DEBUG] Wrote {len(changes)} salary field(s).")
     except Exception as e:
         print(f"[ERROR] Failed writing salary fields: {e}")
         return
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+work_queue.py
+Shared crawl/apply work queue with leases, for running workers on several
+machines (see queue_worker.py).
+
+    WORK_QUEUE_URL=sqlite:///work_queue.sqlite3     # default: one machine, many processes
+    WORK_QUEUE_URL=redis://host:6379/0              # any Redis-compatible server
+
+    python work_queue.py stats
+    python work_queue.py selftest [sqlite|redis]    # redis: against redis_standin.py
+
+Producers enqueue(kind, key, payload); an item with a key that was ever
+enqueued before is ignored, so a job URL enters the queue once. Workers
+lease() an item for a visibility timeout and then ack() it (done) or nack()
+it (visible again after a delay; dead after MAX_ATTEMPTS). A lease that is
+not acked in time - the worker died or hung - becomes visible to other
+workers again. Acks and nacks carry the lease token, so a worker whose lease
+already expired can't complete an item someone else now holds.
+
+Leases alone give at-least-once delivery. Applying must happen at most once,
+so before clicking Apply a worker takes claim_apply(key): a permanent,
+first-writer-wins claim. If a worker dies mid-apply, the redelivered item
+finds the claim taken and is acked without applying again (we can't tell
+whether the click went through, so we never risk a second one).
+
+Ack and nack are atomic check-and-set steps in both backends: one
+UPDATE ... WHERE token = ? in SQLite, WATCH/MULTI/EXEC on the item hash in
+Redis (see RedisQueue for the one multi-command step, lease). The Redis
+backend talks plain RESP, so no client library is needed.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+# .env first: the project imports and CONFIG below read os.getenv at import time
+load_dotenv()
+
+from run_log import get_logger
+
+log = get_logger("work_queue")
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+WORK_QUEUE_URL = os.getenv("WORK_QUEUE_URL", "sqlite:///work_queue.sqlite3")
+LEASE_SECONDS = 300          # visibility timeout of a lease
+RETRY_DELAY_SECONDS = 60     # how long a nacked item stays invisible
+MAX_ATTEMPTS = 4             # leases before an item is declared dead
+
+
+class Lease:
+    def __init__(self, key, kind, payload, token, attempts):
+        self.key = key
+        self.kind = kind
+        self.payload = payload
+        self.token = token
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"Lease({self.kind} {self.key} attempt {self.attempts})"
+
+
+# -----------------------------
+# SQLite backend
+# -----------------------------
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key         TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    state       TEXT NOT NULL DEFAULT 'ready',   -- ready | done | dead
+    visible_at  REAL NOT NULL,
+    token       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_visible ON items(kind, state, visible_at);
+
+CREATE TABLE IF NOT EXISTS apply_claims (
+    key         TEXT PRIMARY KEY,
+    owner       TEXT NOT NULL,
+    claimed_at  REAL NOT NULL
+);
+"""
+
+
+class SqliteQueue:
+    """Lease state lives in `items`: a leased item is a 'ready' item whose visible_at is in the future."""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SQLITE_SCHEMA)
+        return conn
+
+    def enqueue(self, kind, key, payload, delay=0):
+        now = time.time()
+        cur = self._conn().execute(
+            "INSERT OR IGNORE INTO items (key, kind, payload, visible_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (key, kind, json.dumps(payload), now + delay, now),
+        )
+        return cur.rowcount == 1
+
+    def lease(self, kinds, visibility=LEASE_SECONDS):
+        now = time.time()
+        token = uuid.uuid4().hex
+        marks = ",".join("?" * len(kinds))
+        # one UPDATE ... RETURNING: the pick and the lease are a single atomic statement
+        row = self._conn().execute(
+            f"""UPDATE items SET visible_at = ?, token = ?, attempts = attempts + 1, updated_at = ?
+                WHERE key = (SELECT key FROM items
+                             WHERE state = 'ready' AND kind IN ({marks}) AND visible_at <= ?
+                             ORDER BY visible_at LIMIT 1)
+                RETURNING key, kind, payload, attempts""",
+            (now + visibility, token, now, *kinds, now),
+        ).fetchone()
+        if row is None:
+            return None
+        return Lease(row[0], row[1], json.loads(row[2]), token, row[3])
+
+    def ack(self, lease):
+        cur = self._conn().execute(
+            "UPDATE items SET state = 'done', token = NULL, updated_at = ? WHERE key = ? AND token = ?",
+            (time.time(), lease.key, lease.token),
+        )
+        return cur.rowcount == 1
+
+    def nack(self, lease, delay=RETRY_DELAY_SECONDS):
+        now = time.time()
+        cur = self._conn().execute(
+            """UPDATE items SET token = NULL, updated_at = ?, visible_at = ?,
+                   state = CASE WHEN attempts >= ? THEN 'dead' ELSE 'ready' END
+               WHERE key = ? AND token = ?""",
+            (now, now + delay, MAX_ATTEMPTS, lease.key, lease.token),
+        )
+        return cur.rowcount == 1
+
+    def claim_apply(self, key, owner):
+        cur = self._conn().execute(
+            "INSERT OR IGNORE INTO apply_claims (key, owner, claimed_at) VALUES (?, ?, ?)",
+            (key, owner, time.time()),
+        )
+        return cur.rowcount == 1
+
+    def recover(self):
+        """Nothing to do: a lease is one statement, and expiry is just visible_at passing."""
+        return 0
+
+    def stats(self):
+        now = time.time()
+        counts = dict(self._conn().execute(
+            """SELECT CASE WHEN state = 'ready' AND token IS NOT NULL AND visible_at > ? THEN 'leased'
+                           ELSE state END, COUNT(*)
+               FROM items GROUP BY 1""", (now,),
+        ).fetchall())
+        counts["claims"] = self._conn().execute("SELECT COUNT(*) FROM apply_claims").fetchone()[0]
+        return counts
+
+    def clear(self):
+        self._conn().executescript("DELETE FROM items; DELETE FROM apply_claims;")
+
+
+# -----------------------------
+# Redis backend
+# -----------------------------
+class RespError(Exception):
+    pass
+
+
+class RespClient:
+    """Minimal RESP2 client: one socket, commands in, decoded replies out."""
+
+    def __init__(self, host, port, db=0, password=None, timeout=10):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.sock = None
+
+    def _connect(self):
+        self.sock = socket.create_connection(self.address, self.timeout)
+        self.file = self.sock.makefile("rb")
+        if self.password:
+            self._roundtrip(("AUTH", self.password))
+        if self.db:
+            self._roundtrip(("SELECT", self.db))
+
+    def _roundtrip(self, args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self.sock.sendall(b"".join(parts))
+        return self._read()
+
+    def _read(self):
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            return None if size < 0 else self.file.read(size + 2)[:-2].decode()
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [self._read() for _ in range(size)]
+        raise RespError(f"unexpected reply {line!r}")
+
+    def execute(self, *args):
+        with self.lock:
+            if self.sock is None:
+                self._connect()
+            try:
+                return self._roundtrip(args)
+            except (ConnectionError, OSError):
+                self.sock = None  # reconnect on the next command
+                raise
+
+    def hash_cas(self, key, field, expected, *commands):
+        """
+        Run `commands` in one MULTI/EXEC only if HGET key field == expected,
+        with `key` WATCHed so nobody can change it in between. Returns the
+        EXEC replies, or None if the check failed or `key` was modified.
+        """
+        with self.lock:
+            if self.sock is None:
+                self._connect()
+            try:
+                self._roundtrip(("WATCH", key))
+                if self._roundtrip(("HGET", key, field)) != expected:
+                    self._roundtrip(("UNWATCH",))
+                    return None
+                self._roundtrip(("MULTI",))
+                for command in commands:
+                    self._roundtrip(command)
+                return self._roundtrip(("EXEC",))
+            except (ConnectionError, OSError):
+                self.sock = None
+                raise
+
+
+class RedisQueue:
+    """
+    Keys (prefix jobq:):
+        keys              set of every key ever enqueued (dedupe)
+        item:<key>        hash kind / payload / state / token / attempts
+        pending:<kind>    sorted set key -> visible_at (ready and leased items)
+        claim:<key>       apply claim (SET NX)
+
+    lease() is ZPOPMIN + ZADD: the popped item is invisible to everyone else
+    from the moment it is popped. A worker dying between the two commands
+    leaves an item in no sorted set; recover() (run by every worker at
+    start) puts such items back. ack() and nack() check the lease token and
+    update the item in one WATCH/MULTI/EXEC, so a lease that is re-leased
+    meanwhile (which rewrites the token) makes a stale worker's ack fail.
+    """
+
+    PREFIX = "jobq:"
+
+    def __init__(self, client):
+        self.r = client
+
+    def _k(self, *parts):
+        return self.PREFIX + ":".join(parts)
+
+    def enqueue(self, kind, key, payload, delay=0):
+        if not self.r.execute("SADD", self._k("keys"), key):
+            return False
+        self.r.execute(
+            "HSET", self._k("item", key), "kind", kind, "payload", json.dumps(payload),
+            "state", "ready", "attempts", 0, "token", "",
+        )
+        self.r.execute("ZADD", self._k("pending", kind), time.time() + delay, key)
+        return True
+
+    def lease(self, kinds, visibility=LEASE_SECONDS):
+        now = time.time()
+        for kind in kinds:
+            popped = self.r.execute("ZPOPMIN", self._k("pending", kind))
+            if not popped:
+                continue
+            key, visible_at = popped[0], float(popped[1])
+            if visible_at > now:
+                # earliest item is still leased / delayed: put it back untouched
+                self.r.execute("ZADD", self._k("pending", kind), visible_at, key)
+                continue
+            token = uuid.uuid4().hex
+            self.r.execute("ZADD", self._k("pending", kind), now + visibility, key)
+            self.r.execute("HSET", self._k("item", key), "token", token)
+            attempts = self.r.execute("HINCRBY", self._k("item", key), "attempts", 1)
+            payload = json.loads(self.r.execute("HGET", self._k("item", key), "payload"))
+            return Lease(key, kind, payload, token, attempts)
+        return None
+
+    def _if_held(self, lease, *commands):
+        """Run `commands` atomically if `lease` still holds its item."""
+        item = self._k("item", lease.key)
+        return self.r.hash_cas(item, "token", lease.token, *commands) is not None
+
+    def ack(self, lease):
+        return self._if_held(
+            lease,
+            ("ZREM", self._k("pending", lease.kind), lease.key),
+            ("HSET", self._k("item", lease.key), "state", "done", "token", ""),
+        )
+
+    def nack(self, lease, delay=RETRY_DELAY_SECONDS):
+        if lease.attempts >= MAX_ATTEMPTS:
+            return self._if_held(
+                lease,
+                ("ZREM", self._k("pending", lease.kind), lease.key),
+                ("HSET", self._k("item", lease.key), "state", "dead", "token", ""),
+            )
+        return self._if_held(
+            lease,
+            ("HSET", self._k("item", lease.key), "token", ""),
+            ("ZADD", self._k("pending", lease.kind), time.time() + delay, lease.key),
+        )
+
+    def claim_apply(self, key, owner):
+        return self.r.execute("SET", self._k("claim", key), owner, "NX") == "OK"
+
+    def recover(self):
+        """Re-add ready items that are in no pending set (lost between ZPOPMIN and ZADD)."""
+        restored = 0
+        for key in self.r.execute("SMEMBERS", self._k("keys")):
+            item = self.r.execute("HGETALL", self._k("item", key))
+            fields = dict(zip(item[::2], item[1::2]))
+            if fields.get("state") != "ready":
+                continue
+            if self.r.execute("ZSCORE", self._k("pending", fields["kind"]), key) is None:
+                restored += self.r.execute("ZADD", self._k("pending", fields["kind"]), "NX", time.time(), key)
+        if restored:
+            log.warning(f"[QUEUE] recovered {restored} orphaned items")
+        return restored
+
+    def stats(self):
+        counts = {}
+        now = time.time()
+        for key in self.r.execute("SMEMBERS", self._k("keys")):
+            item = self.r.execute("HGETALL", self._k("item", key))
+            fields = dict(zip(item[::2], item[1::2]))
+            state = fields.get("state", "?")
+            if state == "ready" and fields.get("token"):
+                score = self.r.execute("ZSCORE", self._k("pending", fields["kind"]), key)
+                if score is not None and float(score) > now:
+                    state = "leased"
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    def clear(self):
+        for key in self.r.execute("SMEMBERS", self._k("keys")):
+            kind = self.r.execute("HGET", self._k("item", key), "kind")
+            self.r.execute("DEL", self._k("item", key), self._k("claim", key), self._k("pending", kind or "-"))
+        self.r.execute("DEL", self._k("keys"))
+
+
+def open_queue(url=WORK_QUEUE_URL):
+    """SqliteQueue or RedisQueue for sqlite:///path or redis://[:password@]host:port/db."""
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SqliteQueue(url[len("sqlite:///"):])  # sqlite:///rel.db or sqlite:////abs/path.db
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip("/") or 0)
+        return RedisQueue(RespClient(parsed.hostname or "127.0.0.1", parsed.port or 6379, db, parsed.password))
+    raise ValueError(f"unsupported WORK_QUEUE_URL {url!r} (use sqlite:///path or redis://host:port/db)")
+
+
+# -----------------------------
+# Self-check against a throwaway backend
+# -----------------------------
+def selftest(queue):
+    """Exercise lease / expiry / stale ack / nack / dead / claim semantics."""
+    queue.clear()
+    checks = []
+
+    def check(name, ok):
+        checks.append(ok)
+        print(f"{'PASS' if ok else 'FAIL'}  {name}")
+
+    check("enqueue new key", queue.enqueue("apply:naukri", "job-1", {"url": "u1"}))
+    check("enqueue duplicate key is ignored", not queue.enqueue("apply:naukri", "job-1", {"url": "u1"}))
+    first = queue.lease(["apply:naukri"], visibility=0.5)
+    check("lease returns the item", first is not None and first.payload == {"url": "u1"})
+    check("leased item is invisible to others", queue.lease(["apply:naukri"]) is None)
+    time.sleep(0.6)
+    second = queue.lease(["apply:naukri"], visibility=30)
+    check("expired lease is redelivered", second is not None and second.attempts == 2)
+    check("stale ack from the dead worker is rejected", not queue.ack(first))
+    check("first apply claim wins", queue.claim_apply("job-1", "worker-a"))
+    check("second apply claim loses", not queue.claim_apply("job-1", "worker-b"))
+    check("current holder acks", queue.ack(second))
+    check("done item is not leased again", queue.lease(["apply:naukri"]) is None)
+
+    queue.enqueue("crawl:naukri", "search-1", {"query": "sre"})
+    lease = None
+    for _ in range(MAX_ATTEMPTS):
+        lease = queue.lease(["crawl:naukri"])
+        queue.nack(lease, delay=0)
+    check(f"item is dead after {MAX_ATTEMPTS} nacks", queue.lease(["crawl:naukri"]) is None)
+    check("kinds are leased separately", queue.enqueue("apply:hirist", "job-2", {}) and
+          queue.lease(["apply:naukri"]) is None and queue.lease(["apply:hirist"]) is not None)
+    print(f"stats: {queue.stats()}")
+    queue.clear()
+    return all(checks)
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else "stats"
+    if command == "stats":
+        print(open_queue().stats())
+        return 0
+    if command == "selftest":
+        backend = argv[2] if len(argv) > 2 else "sqlite"
+        if backend == "redis":
+            from redis_standin import serve
+            server = serve(0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            queue = open_queue(f"redis://127.0.0.1:{server.server_address[1]}/0")
+        else:
+            import tempfile
+            queue = SqliteQueue(os.path.join(tempfile.mkdtemp(), "work_queue.sqlite3"))
+        return 0 if selftest(queue) else 1
+    print("usage: python work_queue.py stats | selftest [sqlite|redis]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))